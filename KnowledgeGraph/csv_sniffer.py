@@ -0,0 +1,217 @@
+"""只读取文件开头的一段样本，判断 CSV 的编码、分隔符和表头，并按文件指纹缓存结果"""
+import codecs
+import csv
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+try:
+    import chardet
+except ImportError:  # chardet 只用于 UTF-8 和 GB18030 都无法解码时的兜底猜测
+    chardet = None
+
+SAMPLE_SIZE = 64 * 1024
+SCAN_BLOCK_SIZE = 1024 * 1024  # 样本全是 ASCII 时向后查找非 ASCII 内容的块大小
+SCAN_LIMIT = 8 * 1024 * 1024  # 向后查找的上限，超出后仍全是 ASCII 时使用 UTF8_OR_GB18030
+UTF8_OR_GB18030 = "utf-8-or-gb18030"
+DELIMITERS = ",\t;|"
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+_CACHE_SIZE = 64
+
+_cache = OrderedDict()  # 文件指纹 -> CsvFormat
+_cache_lock = threading.Lock()
+
+
+class CsvFormat:
+    """
+    CSV 文件的格式判断结果
+    encoding: pandas/open 可用的编码名
+    delimiter: 分隔符
+    columns: 表头各列名（已去除首尾空白）
+    """
+    __slots__ = ("encoding", "delimiter", "columns")
+
+    def __init__(self, encoding, delimiter, columns):
+        self.encoding = encoding
+        self.delimiter = delimiter
+        self.columns = columns
+
+    def __repr__(self):
+        return f"CsvFormat({self.encoding!r}, {self.delimiter!r}, {self.columns!r})"
+
+
+class _Utf8OrGb18030Decoder(codecs.IncrementalDecoder):
+    """
+    先按 UTF-8 解码，遇到第一处非 UTF-8 字节后其余内容改按 GB18030 解码。
+    用于开头很长一段都是 ASCII 的文件：分块读取到后文的 GBK 中文时不会中途报错
+    """
+
+    def __init__(self, errors="strict"):
+        super().__init__(errors)
+        self.reset()
+
+    def decode(self, input, final=False):
+        try:
+            return self._decoder.decode(input, final)
+        except UnicodeDecodeError as e:
+            if self._fallen_back:
+                raise
+            # 出错处之前紧挨着的非 ASCII 字节可能是恰好构成合法 UTF-8 的 GBK 字符，从最后一个 ASCII 字节之后切换
+            data, split = e.object, e.start
+            while split > 0 and data[split - 1] >= 0x80:
+                split -= 1
+            self._decoder = codecs.getincrementaldecoder("gb18030")(self.errors)
+            self._fallen_back = True
+            return data[:split].decode("utf-8", self.errors) + self._decoder.decode(data[split:], final)
+
+    def reset(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")(self.errors)
+        self._fallen_back = False
+
+    def getstate(self):
+        buffer, flag = self._decoder.getstate()
+        return buffer, flag << 1 | self._fallen_back
+
+    def setstate(self, state):
+        buffer, flag = state
+        self._fallen_back = bool(flag & 1)
+        self._decoder = codecs.getincrementaldecoder("gb18030" if self._fallen_back else "utf-8")(self.errors)
+        self._decoder.setstate((buffer, flag >> 1))
+
+
+def _search_codec(name):
+    if name.replace("_", "-") != UTF8_OR_GB18030:
+        return None
+
+    def decode(data, errors="strict"):
+        return _Utf8OrGb18030Decoder(errors).decode(data, final=True), len(data)
+
+    return codecs.CodecInfo(
+        name=UTF8_OR_GB18030,
+        encode=codecs.utf_8_encode,
+        decode=decode,
+        incrementalencoder=codecs.getincrementalencoder("utf-8"),
+        incrementaldecoder=_Utf8OrGb18030Decoder,
+    )
+
+
+codecs.register(_search_codec)
+
+
+def _fingerprint(filepath):
+    stat = os.stat(filepath)
+    return os.path.realpath(filepath), stat.st_size, stat.st_mtime_ns
+
+
+def _decodes(sample, encoding, final):
+    """样本能否按该编码严格解码；final 为 False 时允许末尾有被截断的多字节字符"""
+    try:
+        codecs.getincrementaldecoder(encoding)().decode(sample, final=final)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def _detect_encoding(sample, final):
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+    # GB18030 是 GBK/GB2312 的超集；UTF-8 的校验更严格，先试
+    for encoding in ("utf-8", "gb18030"):
+        if _decodes(sample, encoding, final):
+            return encoding
+    if chardet is not None:
+        guess = chardet.detect(sample).get("encoding")
+        if guess:
+            return guess
+    return "latin-1"
+
+
+def _detect_later_encoding(f, block_size=SCAN_BLOCK_SIZE, limit=SCAN_LIMIT):
+    """
+    样本全是 ASCII 时还无法区分 UTF-8 和 GBK：从文件当前位置逐块向后找到第一段含非 ASCII 字节的内容，
+    据此判断编码（此前的块都是 ASCII，该块从字符边界开始）。最多读取 limit 字节，
+    超出后仍全是 ASCII 时返回 UTF8_OR_GB18030，由解码时遇到的第一处非 UTF-8 字节决定
+    :return: 编码名；其余内容也全是 ASCII 时返回 None
+    """
+    scanned = 0
+    while scanned < limit:
+        size = min(block_size, limit - scanned)
+        block = f.read(size)
+        if not block:
+            return None
+        if not block.isascii():
+            return _detect_encoding(block, len(block) < size)
+        scanned += len(block)
+    return UTF8_OR_GB18030 if f.read(1) else None
+
+
+def _detect_delimiter(lines):
+    try:
+        return csv.Sniffer().sniff("\n".join(lines), delimiters=DELIMITERS).delimiter
+    except csv.Error:
+        # 样本太少或各行不一致时，取表头中出现最多的候选分隔符
+        counts = {delimiter: lines[0].count(delimiter) for delimiter in DELIMITERS} if lines else {}
+        best = max(counts, key=counts.get, default=",")
+        return best if counts.get(best) else ","
+
+
+def sniff_csv(filepath, sample_size=SAMPLE_SIZE):
+    """
+    判断 CSV 文件的格式：只读取开头 sample_size 字节（样本全是 ASCII 时最多再向后扫描 SCAN_LIMIT 字节），
+    结果按 (路径, 大小, 修改时间) 缓存
+    :return: CsvFormat
+    """
+    key = _fingerprint(filepath)
+    with _cache_lock:
+        fmt = _cache.get(key)
+        if fmt is not None:
+            _cache.move_to_end(key)
+            return fmt
+
+    with open(filepath, "rb") as f:
+        sample = f.read(sample_size)
+        final = len(sample) < sample_size
+        encoding = _detect_encoding(sample, final)
+        if not final and sample.isascii():
+            # 否则分块读取时要到读到后文的 GBK 中文才出错，此前的块可能已经导入
+            encoding = _detect_later_encoding(f) or encoding
+
+    text = codecs.getincrementaldecoder(encoding)(errors="replace").decode(sample, final=final)
+    lines = text.splitlines()
+    if not final and len(lines) > 1:
+        lines.pop()  # 最后一行可能被截断
+    lines = [line for line in lines[:50] if line.strip()]
+    delimiter = _detect_delimiter(lines)
+    columns = [column.strip() for column in next(csv.reader(lines[:1], delimiter=delimiter), [])]
+
+    fmt = CsvFormat(encoding, delimiter, columns)
+    with _cache_lock:
+        _cache[key] = fmt
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return fmt
+
+
+def read_csv(filepath, encoding=None, **kwargs):
+    """
+    按嗅探出的格式用 pandas C 引擎一次解析 CSV
+    :param encoding: 指定时覆盖嗅探出的编码
+    :param kwargs: 其余参数原样传给 pandas.read_csv（如 dtype、chunksize）
+    """
+    fmt = sniff_csv(filepath)
+    kwargs.setdefault("sep", fmt.delimiter)
+    try:
+        return pd.read_csv(filepath, encoding=encoding or fmt.encoding, **kwargs)
+    except UnicodeDecodeError:
+        # 判为 UTF-8 的文件后文仍可能混有 GBK 中文；这种情况按 GB18030 重新解析一次
+        if encoding or fmt.encoding != "utf-8" or kwargs.get("chunksize") or kwargs.get("iterator"):
+            raise
+        fmt.encoding = "gb18030"
+        return pd.read_csv(filepath, encoding=fmt.encoding, **kwargs)
@@ -1,47 +1,27 @@
+import itertools
 import json
-import chardet
 import pandas as pd
 
+from csv_sniffer import read_csv, sniff_csv
+from excel_to_csv import CHUNK_SIZE, iter_excel_chunks
+
 class DataImporter:
     def __init__(self, graph_data_manager):
         self.graph_data_manager = graph_data_manager
 
     def detect_encoding(self, file_path):
-        """检测文件编码"""
-        with open(file_path, "rb") as f:
-            result = chardet.detect(f.read())
-            encoding = result.get("encoding", "utf-8")
-            return encoding
+        """检测文件编码（只读取文件开头的一段样本，结果按文件缓存）"""
+        return sniff_csv(file_path).encoding
 
-    def read_csv_with_fallback(self, file_path, primary_encoding):
+    def read_csv_with_fallback(self, file_path, primary_encoding=None, chunksize=None):
         """
-        尝试使用 primary_encoding 解码和常见分隔符，如果失败则尝试其它编码和分隔符
-        优先使用指定编码，若失败则尝试常用编码集和分隔符集
+        按嗅探出的编码和分隔符用 C 引擎解析一次 CSV，格式错误的行跳过
+        :param primary_encoding: 指定时覆盖嗅探出的编码
+        :param chunksize: 指定时返回按块读取的迭代器
         """
-        encodings_to_try = [primary_encoding, "GB18030", "GBK", "UTF-8", "latin-1"]
-        delimiters_to_try = [',', '\t', ';']
-
-        # 尝试各种编码和分隔符
-        for enc in encodings_to_try:
-            for sep in delimiters_to_try:
-                try:
-                    print(f"Trying to read CSV with encoding: {enc} and delimiter: {repr(sep)}")
-                    # 使用engine='python'和on_bad_lines='skip'（需要pandas>=1.3）
-                    # 如果pandas版本较低可尝试error_bad_lines=False
-                    df = pd.read_csv(file_path, encoding=enc, sep=sep, engine='python', on_bad_lines='skip')
-                    print(f"Successfully read CSV with encoding: {enc} and delimiter: {repr(sep)}")
-                    return df
-                except UnicodeDecodeError as e:
-                    print(f"Failed with encoding {enc} sep {repr(sep)} (UnicodeDecodeError): {e}")
-                except pd.errors.ParserError as pe:
-                    print(f"Parser error with encoding {enc} sep {repr(sep)}: {pe}")
-                except Exception as ex:
-                    print(f"Unexpected error with encoding {enc} sep {repr(sep)}: {ex}")
-
-        # 如果全部失败，最后尝试使用latin-1和python engine跳过行
-        print("All common encodings and delimiters failed, trying latin-1 with python engine and skipping bad lines")
-        df = pd.read_csv(file_path, encoding='latin-1', sep=',', engine='python', on_bad_lines='skip')
-        return df
+        fmt = sniff_csv(file_path)
+        print(f"Reading CSV with encoding: {primary_encoding or fmt.encoding} and delimiter: {repr(fmt.delimiter)}")
+        return read_csv(file_path, primary_encoding, on_bad_lines='skip', chunksize=chunksize)
 
     def import_data_from_json(self, json_filepath):
         with open(json_filepath, 'r', encoding='utf-8') as f:
@@ -61,13 +41,35 @@ class DataImporter:
                 relation_type=edge.get("relation_type", "RELATED_TO")
             )
 
-    def import_data_from_csv(self, csv_filepath, node_file=True):
-        encoding = self.detect_encoding(csv_filepath)
-        print(f"Detected file encoding: {encoding}")
+    def import_data_from_csv(self, csv_filepath, node_file=True, chunk_size=CHUNK_SIZE):
+        # 编码和分隔符由文件开头的样本一次判断；按块读取，内存占用与文件大小无关
+        chunks = self.read_csv_with_fallback(csv_filepath, chunksize=chunk_size)
+        self.import_chunks(chunks, node_file=node_file)
+
+    def import_data_from_excel(self, excel_filepath, sheet_name='Sheet1', node_file=True, chunk_size=CHUNK_SIZE):
+        # .xlsx 以只读模式逐行读取并分块导入
+        self.import_chunks(iter_excel_chunks(excel_filepath, sheet_name, chunk_size), node_file=node_file)
 
-        # 尝试用检测到的编码，如果失败则用备用编码和分隔符
-        df = self.read_csv_with_fallback(csv_filepath, encoding)
+    def import_chunks(self, chunks, node_file=True):
+        """
+        逐块导入 DataFrame：每块写入图中并打印进度，全部导入后只保存一次
+        :param chunks: DataFrame 的可迭代对象
+        """
+        imported = 0
+        for index, df in enumerate(chunks):
+            if index == 0:
+                self._check_columns(df, node_file)
+            if node_file:
+                self.graph_data_manager.add_nodes_from(self._node_rows(df), save=False)
+            else:
+                self.graph_data_manager.add_relationships_from(self._relationship_rows(df), save=False)
+            imported += len(df)
+            print(f"Imported chunk {index + 1}: {imported} rows so far")
+        self.graph_data_manager.save_graph_to_json()
+        return imported
 
+    @staticmethod
+    def _check_columns(df, node_file):
         # 检查必须列是否存在
         if node_file:
             required_columns = ["name", "type", "attributes"]
@@ -80,51 +82,25 @@ class DataImporter:
                 if col not in df.columns:
                     print(f"Warning: {col} column not found in relationship file. Please check file format.")
 
-        if node_file:
-            # 节点文件应有 name, type, attributes 列
-            for _, row in df.iterrows():
-                attributes = {}
-                if "attributes" in df.columns and pd.notna(row.get("attributes")):
-                    try:
-                        attributes = json.loads(row["attributes"])
-                    except json.JSONDecodeError:
-                        attributes = {}
-                self.graph_data_manager.add_node(
-                    name=row["name"],
-                    node_type=row.get("type", "Undefined"),
-                    attributes=attributes
-                )
-        else:
-            # 关系文件应有 source, target, relation_type 列
-            for _, row in df.iterrows():
-                self.graph_data_manager.add_relationship(
-                    source_name=row["source"],
-                    target_name=row["target"],
-                    relation_type=row.get("relation_type", "RELATED_TO")
-                )
+    @staticmethod
+    def _node_rows(df):
+        # 节点文件应有 name, type, attributes 列
+        types = df["type"] if "type" in df.columns else itertools.repeat("Undefined")
+        raw_attributes = df["attributes"] if "attributes" in df.columns else itertools.repeat(None)
+        for name, node_type, raw in zip(df["name"], types, raw_attributes):
+            attributes = {}
+            if raw is not None and pd.notna(raw):
+                try:
+                    attributes = json.loads(raw)
+                except (json.JSONDecodeError, TypeError):
+                    attributes = {}
+            yield name, node_type, attributes
 
-    def import_data_from_excel(self, excel_filepath, sheet_name='Sheet1', node_file=True):
-        df = pd.read_excel(excel_filepath, sheet_name=sheet_name)
-        if node_file:
-            for _, row in df.iterrows():
-                attributes = {}
-                if "attributes" in df.columns and pd.notna(row.get("attributes")):
-                    try:
-                        attributes = json.loads(row["attributes"])
-                    except json.JSONDecodeError:
-                        attributes = {}
-                self.graph_data_manager.add_node(
-                    name=row["name"],
-                    node_type=row.get("type", "Undefined"),
-                    attributes=attributes
-                )
-        else:
-            for _, row in df.iterrows():
-                self.graph_data_manager.add_relationship(
-                    source_name=row["source"],
-                    target_name=row["target"],
-                    relation_type=row.get("relation_type", "RELATED_TO")
-                )
+    @staticmethod
+    def _relationship_rows(df):
+        # 关系文件应有 source, target, relation_type 列
+        relation_types = df["relation_type"] if "relation_type" in df.columns else itertools.repeat("RELATED_TO")
+        return zip(df["source"], df["target"], relation_types)
 
     def import_data(self, file_path, file_type, node_file=True):
         if file_type == 'json':
@@ -1,8 +1,55 @@
+import csv
+import itertools
+
 import pandas as pd
+from openpyxl import load_workbook
+
+CHUNK_SIZE = 50000  # 分块读取时每块的行数
+
+
+def iter_excel_rows(excel_path, sheet_name='Sheet1'):
+    """
+    以 openpyxl 只读模式逐行读取 .xlsx 工作表，内存占用与文件大小无关
+    :return: 生成器，第一行为表头，之后每行为单元格值的元组（跳过整行为空的行）
+    """
+    workbook = load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        for row in workbook[sheet_name].iter_rows(values_only=True):
+            if any(value is not None for value in row):
+                yield row
+    finally:
+        workbook.close()
+
+
+def iter_excel_chunks(excel_path, sheet_name='Sheet1', chunk_size=CHUNK_SIZE):
+    """
+    分块读取工作表，每块为一个 DataFrame（列名取自表头，行长度按表头截断或补齐）
+    .xls 旧格式 openpyxl 无法读取，退回到 pandas 整表读取后再分块
+    """
+    if excel_path.lower().endswith('.xls'):
+        df = pd.read_excel(excel_path, sheet_name=sheet_name)
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size]
+        return
+
+    rows = iter_excel_rows(excel_path, sheet_name)
+    header = next(rows, None)
+    if header is None:
+        return
+    columns = ["" if value is None else str(value).strip() for value in header]
+    width = len(columns)
+    while True:
+        batch = list(itertools.islice(rows, chunk_size))
+        if not batch:
+            break
+        batch = [row[:width] + (None,) * (width - len(row)) for row in batch]
+        yield pd.DataFrame(batch, columns=columns)
+
 
 def excel_to_csv(excel_path, csv_path=None, sheet_name='Sheet1'):
     """
     将Excel文件转换为CSV文件
+    .xlsx 逐行读取并逐行写出，不会把整张表读入内存
     :param excel_path: Excel文件路径
     :param csv_path: 输出的CSV文件路径，如不指定则与excel文件同名，仅扩展名变为.csv
     :param sheet_name: 要读取的工作表名称，默认为'Sheet1'
@@ -17,16 +64,35 @@ def excel_to_csv(excel_path, csv_path=None, sheet_name='Sheet1'):
             # 没有标准扩展名时，直接加.csv
             csv_path = excel_path + '.csv'
 
-    # 读取Excel文件
+    # .xls 旧格式只能整表读取
+    if excel_path.lower().endswith('.xls'):
+        try:
+            df = pd.read_excel(excel_path, sheet_name=sheet_name)
+        except Exception as e:
+            print(f"Error reading Excel file: {e}")
+            return
+        try:
+            df.to_csv(csv_path, index=False, encoding='utf-8')
+            print(f"Successfully converted {excel_path} to {csv_path}")
+        except Exception as e:
+            print(f"Error writing CSV file: {e}")
+        return
+
+    # 导出为CSV文件，使用utf-8编码和逗号分隔
     try:
-        df = pd.read_excel(excel_path, sheet_name=sheet_name)
+        rows = iter_excel_rows(excel_path, sheet_name)
+        header = next(rows, None)
     except Exception as e:
         print(f"Error reading Excel file: {e}")
         return
 
-    # 导出为CSV文件，使用utf-8编码和逗号分隔
     try:
-        df.to_csv(csv_path, index=False, encoding='utf-8')
+        with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            if header is not None:
+                writer.writerow(["" if value is None else value for value in header])
+                # 空单元格写为空串，与 DataFrame.to_csv 的输出一致
+                writer.writerows(["" if value is None else value for value in row] for row in rows)
         print(f"Successfully converted {excel_path} to {csv_path}")
     except Exception as e:
         print(f"Error writing CSV file: {e}")
@@ -10,6 +10,7 @@ class GraphDataManager:
         """
         self._storage_path = storage_path
         self._graph = nx.Graph()  # 或 nx.DiGraph()，取决于图的类型（有向或无向）
+        self._nodes_by_type = {}  # 类型 -> {节点名: None}，按类型筛选时直接取对应的桶
 
         # 如果存储路径存在，加载现有数据
         if os.path.exists(self._storage_path):
@@ -33,11 +34,31 @@ class GraphDataManager:
         :param attributes: 节点属性
         """
         print(f"[GraphDataManager] Adding node: {name}, type: {node_type}, attributes: {attributes}")
+        self._unindex_node(name)
         self._graph.add_node(name, type=node_type, attributes=attributes or {})
+        self._index_node(name)
         self.save_graph_to_json()
         print("[GraphDataManager] Node added successfully.")
         print("[GraphDataManager] Current nodes:", self.get_all_nodes())
 
+    def add_nodes_from(self, nodes, save=True):
+        """
+        批量添加节点
+        :param nodes: (name, node_type, attributes) 元组的可迭代对象
+        :param save: 是否立即保存；分块导入时由调用方在全部导入后保存一次
+        :return: 添加的节点数
+        """
+        count = 0
+        for name, node_type, attributes in nodes:
+            self._unindex_node(name)
+            self._graph.add_node(name, type=node_type, attributes=attributes or {})
+            self._index_node(name)
+            count += 1
+        if save:
+            self.save_graph_to_json()
+        print(f"[GraphDataManager] {count} nodes added.")
+        return count
+
     def get_all_nodes(self):
         """
         获取所有节点
@@ -52,7 +73,9 @@ class GraphDataManager:
         if name in self._graph:
             print(f"[GraphDataManager] Updating node: {name}")
             if node_type:
+                self._unindex_node(name)
                 self._graph.nodes[name]["type"] = node_type
+                self._index_node(name)
             if attributes:
                 self._graph.nodes[name]["attributes"] = attributes
             self.save_graph_to_json()
@@ -66,12 +89,37 @@ class GraphDataManager:
         """
         if name in self._graph:
             print(f"[GraphDataManager] Deleting node: {name}")
+            self._unindex_node(name)
             self._graph.remove_node(name)
             self.save_graph_to_json()
             print("[GraphDataManager] Node deleted successfully.")
         else:
             print(f"[GraphDataManager] Node {name} does not exist. Cannot delete.")
 
+    def get_nodes_by_type(self, node_type):
+        """
+        获取指定类型的所有节点，只访问该类型的节点
+        :param node_type: 节点类型
+        """
+        return [{"name": node, "type": node_type, "attributes": self._graph.nodes[node]["attributes"]}
+                for node in self._nodes_by_type.get(node_type, ())]
+
+    def _index_node(self, name):
+        """将节点登记到类型索引"""
+        node_type = self._graph.nodes[name]["type"]
+        self._nodes_by_type.setdefault(node_type, {})[name] = None
+
+    def _unindex_node(self, name):
+        """从类型索引中移除节点"""
+        if name not in self._graph:
+            return
+        node_type = self._graph.nodes[name]["type"]
+        bucket = self._nodes_by_type.get(node_type)
+        if bucket is not None:
+            bucket.pop(name, None)
+            if not bucket:
+                del self._nodes_by_type[node_type]
+
     # ------------------- 关系操作 -------------------
     def add_relationship(self, source_name, target_name, relation_type):
         """
@@ -86,6 +134,25 @@ class GraphDataManager:
             print(f"[GraphDataManager] Cannot add relationship. One of the nodes ({source_name}, {target_name}) does not exist.")
         print("[GraphDataManager] Current edges:", self.get_all_relationships())
 
+    def add_relationships_from(self, relationships, save=True):
+        """
+        批量添加关系，端点不存在的关系被跳过
+        :param relationships: (source, target, relation_type) 元组的可迭代对象
+        :param save: 是否立即保存；分块导入时由调用方在全部导入后保存一次
+        :return: 添加的关系数
+        """
+        added = skipped = 0
+        for source_name, target_name, relation_type in relationships:
+            if source_name in self._graph and target_name in self._graph:
+                self._graph.add_edge(source_name, target_name, relation_type=relation_type)
+                added += 1
+            else:
+                skipped += 1
+        if save:
+            self.save_graph_to_json()
+        print(f"[GraphDataManager] {added} relationships added, {skipped} skipped (missing nodes).")
+        return added
+
     def get_all_relationships(self):
         """
         获取所有关系
@@ -136,11 +203,13 @@ class GraphDataManager:
 
         # 清空当前图，然后加载数据
         self._graph.clear()
+        self._nodes_by_type = {}
 
         # 加载节点
         for node in graph_data.get("nodes", []):
             self._graph.add_node(node["name"], type=node.get("type", "Undefined"),
                                  attributes=node.get("attributes", {}))
+            self._index_node(node["name"])
 
         # 加载边（关系）
         for edge in graph_data.get("edges", []):
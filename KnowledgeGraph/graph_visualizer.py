@@ -61,11 +61,14 @@ class GraphVisualizer:
         :param max_nodes: 限制返回的最大节点数
         :return: JSON 格式的筛选后的图谱数据，格式为 {"nodes": [...], "edges": [...]}
         """
-        nodes = self.data_manager.get_all_nodes()
         relationships = self.data_manager.get_all_relationships()
 
-        # 筛选节点
-        filtered_nodes = [node for node in nodes if not node_type or node["type"] == node_type]
+        # 筛选节点：有类型索引时直接取该类型的节点
+        if node_type and hasattr(self.data_manager, "get_nodes_by_type"):
+            filtered_nodes = self.data_manager.get_nodes_by_type(node_type)
+        else:
+            nodes = self.data_manager.get_all_nodes()
+            filtered_nodes = [node for node in nodes if not node_type or node["type"] == node_type]
 
         # 如果设置了最大节点数，则截取
         if max_nodes:
@@ -0,0 +1,185 @@
+# core/arrow_io.py
+"""
+列式导出和读取：节点表和关系表分别写成 Parquet 或 Arrow IPC（Feather v2）文件，
+pandas、DuckDB 等可以直接读取。导入时逐个 RecordBatch 把列转为 Python 列表，
+交给与 CSV 相同的批量导入路径，不经过 DataFrame。
+
+节点表的列为 name、type、attributes、resources，关系表的列为 source、target、
+relation_type、resources。type 和 relation_type 是字典编码列；attributes 存为 JSON 对象字符串，
+resources 存为 JSON 数组字符串（没有资源时为 null）。Arrow IPC 文件不压缩，
+读取时经内存映射零拷贝加载。
+
+pyarrow 是可选依赖，只在调用这些函数时导入。
+"""
+import json
+import os
+
+from .graph_io import atomic_write
+
+FORMATS = {".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow"}
+BATCH_SIZE = 65536  # 每个 RecordBatch（Parquet 行组）的行数
+
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Parquet/Arrow 导入导出需要安装 pyarrow") from None
+    return pyarrow
+
+
+def table_format(path):
+    """按扩展名判断表格式：返回 "parquet"、"arrow" 或 None"""
+    return FORMATS.get(os.path.splitext(path)[1].lower())
+
+
+def split_table_paths(path):
+    """由用户选择的路径 <名称>.<扩展名> 得到 (<名称>_nodes.<扩展名>, <名称>_edges.<扩展名>)"""
+    base, extension = os.path.splitext(path)
+    return base + "_nodes" + extension, base + "_edges" + extension
+
+
+def _node_batches(pa, graph, schema):
+    # 先收集全部类型：Arrow IPC 文件要求所有批次共用同一个字典
+    vocabulary = {node_type: i for i, node_type in enumerate(
+        dict.fromkeys(node_type for _, node_type in graph.nodes(data="type", default="")))}
+    dictionary = pa.array(list(vocabulary), pa.string())
+    encode = _ENCODER.encode
+
+    def batch():
+        return pa.record_batch([pa.array(names, pa.string()),
+                                pa.DictionaryArray.from_arrays(pa.array(types, pa.int32()), dictionary),
+                                pa.array(attributes, pa.string()), pa.array(resources, pa.string())],
+                               schema=schema)
+
+    names, types, attributes, resources = [], [], [], []
+    for name, data in graph.nodes(data=True):
+        names.append(name)
+        types.append(vocabulary[data.get("type", "")])
+        attributes.append(encode(data.get("attributes") or {}))
+        node_resources = data.get("resources")
+        resources.append(encode(node_resources) if node_resources else None)
+        if len(names) == BATCH_SIZE:
+            yield batch()
+            names, types, attributes, resources = [], [], [], []
+    if names:
+        yield batch()
+
+
+def _edge_batches(pa, graph, schema):
+    vocabulary = {relation_type: i for i, relation_type in enumerate(
+        dict.fromkeys(relation_type for _, _, relation_type in graph.edges(data="relation_type", default="")))}
+    dictionary = pa.array(list(vocabulary), pa.string())
+    encode = _ENCODER.encode
+
+    def batch():
+        return pa.record_batch([pa.array(sources, pa.string()), pa.array(targets, pa.string()),
+                                pa.DictionaryArray.from_arrays(pa.array(relation_types, pa.int32()), dictionary),
+                                pa.array(resources, pa.string())],
+                               schema=schema)
+
+    sources, targets, relation_types, resources = [], [], [], []
+    for source, neighbours in graph.adjacency():
+        for target, data in neighbours.items():
+            sources.append(source)
+            targets.append(target)
+            relation_types.append(vocabulary[data.get("relation_type", "")])
+            edge_resources = data.get("resources")
+            resources.append(encode(edge_resources) if edge_resources else None)
+            if len(sources) == BATCH_SIZE:
+                yield batch()
+                sources, targets, relation_types, resources = [], [], [], []
+    if sources:
+        yield batch()
+
+
+def _write_batches(path, schema, batches, fmt):
+    pa = _pyarrow()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+    def write(raw):
+        if fmt == "parquet":
+            writer = pq.ParquetWriter(raw, schema)
+        else:
+            writer = pa.ipc.new_file(raw, schema)
+        try:
+            for batch in batches:
+                writer.write_batch(batch)
+        finally:
+            writer.close()  # 不关闭 raw，由 atomic_write 关闭
+
+    atomic_write(path, write, binary=True)
+
+
+def write_tables(graph, nodes_path, edges_path, fmt=None):
+    """
+    把图逐批导出为节点表和关系表（各自经临时文件写入）
+    :param graph: networkx 有向图，节点属性含 type、attributes，边属性含 relation_type
+    :param fmt: "parquet" 或 "arrow"，默认按扩展名（.parquet/.arrow/.feather）判断
+    """
+    fmt = fmt or table_format(nodes_path)
+    if fmt not in ("parquet", "arrow"):
+        raise ValueError(f"无法根据扩展名判断表格式: {nodes_path}")
+    pa = _pyarrow()
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    node_schema = pa.schema([("name", pa.string()), ("type", dictionary),
+                             ("attributes", pa.string()), ("resources", pa.string())])
+    edge_schema = pa.schema([("source", pa.string()), ("target", pa.string()),
+                             ("relation_type", dictionary), ("resources", pa.string())])
+    _write_batches(nodes_path, node_schema, _node_batches(pa, graph, node_schema), fmt)
+    _write_batches(edges_path, edge_schema, _edge_batches(pa, graph, edge_schema), fmt)
+
+
+def read_table(path, fmt=None):
+    """
+    读取一个节点表或关系表为 pyarrow.Table（经内存映射读取；Arrow IPC 文件的列直接引用映射的内存）
+    :param fmt: "parquet" 或 "arrow"，默认按扩展名判断
+    """
+    fmt = fmt or table_format(path)
+    pa = _pyarrow()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        return pq.read_table(path, memory_map=True)
+    if fmt == "arrow":
+        with pa.memory_map(path) as source:
+            return pa.ipc.open_file(source).read_all()
+    raise ValueError(f"无法根据扩展名判断表格式: {path}")
+
+
+def _column_values(pa, column):
+    # 字典编码列的字典每批只转换一次，再按下标取值，不为每行重复构造字符串
+    if pa.types.is_dictionary(column.type):
+        dictionary = column.dictionary.to_pylist()
+        return [None if i is None else dictionary[i] for i in column.indices.to_pylist()]
+    return column.to_pylist()
+
+
+def read_table_columns(path, fmt=None):
+    """
+    逐个 RecordBatch 读取一个节点表或关系表，返回 {列名: 值列表}（null 为 None），供 parse_*_columns 解析
+    Parquet 按行组迭代，Arrow IPC 文件经内存映射逐批读取，都不构造完整的 Table 或 DataFrame
+    :param fmt: "parquet" 或 "arrow"，默认按扩展名判断
+    """
+    fmt = fmt or table_format(path)
+    pa = _pyarrow()
+
+    def collect(names, batches):
+        columns = {name: [] for name in names}
+        lists = list(columns.values())
+        for batch in batches:
+            for values, column in zip(lists, batch.columns):
+                values.extend(_column_values(pa, column))
+        return columns
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        return collect(parquet_file.schema_arrow.names, parquet_file.iter_batches(batch_size=BATCH_SIZE))
+    if fmt == "arrow":
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            return collect(reader.schema.names, (reader.get_batch(i) for i in range(reader.num_record_batches)))
+    raise ValueError(f"无法根据扩展名判断表格式: {path}")
@@ -0,0 +1,88 @@
+# core/autosave.py
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+
+class AutosaveService(QObject):
+    """
+    后台防抖自动保存服务
+
+    图数据每次提交修改后标记为脏并递增版本号；在最后一次修改之后静默 delay_ms 毫秒，
+    才在 UI 线程上取一份不可变视图，交给工作线程序列化并以“临时文件 + 重命名”的方式写入，
+    连续的编辑因此只会触发一次写盘，UI 线程也不会被文件写入阻塞。
+    """
+    saved = pyqtSignal(int)  # 保存完成，参数为写入的版本号
+    save_failed = pyqtSignal(str)  # 保存失败，参数为错误信息
+
+    def __init__(self, graph_manager, delay_ms: int = 2000, parent=None):
+        super().__init__(parent)
+        self.graph_manager = graph_manager
+        self.delay_ms = delay_ms
+        self.dirty = False
+        self.version = 0  # 每次变更递增
+        self.saved_version = 0  # 最近一次成功写入时的 version
+        self._future = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autosave")
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._save_in_background)
+
+        graph_manager.autosave = self
+        graph_manager.add_change_listener(self.mark_dirty)
+
+    def mark_dirty(self):
+        """标记有未保存的修改，并重新开始防抖计时（合并连续编辑）"""
+        self.dirty = True
+        self.version += 1
+        self._timer.start(self.delay_ms)
+
+    def _save_in_background(self):
+        if not self.dirty:
+            return
+        if self._future is not None and not self._future.done():
+            # 上一次写入尚未完成，稍后再试
+            self._timer.start(self.delay_ms)
+            return
+
+        snapshot = self.graph_manager.snapshot_view()
+        version = self.version
+        self.dirty = False
+        self._future = self._executor.submit(self.graph_manager.write_checkpoint, snapshot)
+        self._future.add_done_callback(lambda future: self._on_saved(future, version))
+
+    def _on_saved(self, future, version):
+        """在工作线程中回调；信号会排队发送到接收者所在的线程"""
+        error = future.exception()
+        if error is not None:
+            print(f"自动保存失败: {error}")
+            self.dirty = True
+            self.save_failed.emit(str(error))
+            return
+        self.saved_version = max(self.saved_version, version)
+        self.saved.emit(version)
+
+    def flush(self, force: bool = False):
+        """
+        同步完成所有待写入的保存（退出程序前调用）
+        :param force: 即使没有记录到修改也写入一次完整检查点
+        """
+        self._timer.stop()
+        if self._future is not None:
+            try:
+                self._future.result()
+            except Exception:
+                pass  # 失败已在回调中标记为脏，下面会重新同步写入
+        if self.dirty or force:
+            self.graph_manager.checkpoint()
+            self.dirty = False
+            self.saved_version = self.version
+
+    def shutdown(self):
+        """刷新并停止工作线程，之后图管理器恢复同步保存"""
+        self.flush()
+        self._executor.shutdown(wait=True)
+        self.graph_manager.remove_change_listener(self.mark_dirty)
+        if self.graph_manager.autosave is self:
+            self.graph_manager.autosave = None
@@ -0,0 +1,228 @@
+# core/binary_store.py
+"""
+紧凑二进制图检查点（.kgb）：名称、类型和关系类型驻留为字符串表，边存为整数下标数组，
+属性和资源放在可延迟解码的独立段中。
+
+这是可选的检查点格式，默认不启用：构造 GraphDataManager(binary_store=True) 时才会在 JSON 旁边
+读写 .kgb 文件，此时检查点只写二进制文件，JSON 需要通过 save_graph_to_json 导出。
+节点名必须是字符串（应用中的节点名都是字符串；其他类型的名称写入时报错，而不是转成字符串后以不同的键读回）。
+"""
+import json
+import struct
+import sys
+from array import array
+
+from .graph_io import atomic_write
+
+MAGIC = b"TCMKGB01"
+# journal_seq, 字符串数, 节点数, 边数
+_HEADER = struct.Struct("<QIII")
+_SECTION_LEN = struct.Struct("<Q")
+
+
+class BinaryStoreError(Exception):
+    """二进制图文件格式错误"""
+    pass
+
+
+def _to_le_bytes(values, typecode):
+    arr = array(typecode, values)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _from_le_bytes(buffer, typecode):
+    arr = array(typecode)
+    arr.frombytes(buffer)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+class _Interner:
+    """字符串驻留表：相同的名称/类型/关系类型只存一份，其余位置存整数下标"""
+
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+
+    def __call__(self, value):
+        value = "" if value is None else str(value)
+        index = self.ids.get(value)
+        if index is None:
+            if "\0" in value:
+                raise BinaryStoreError(f"字符串中不能包含 NUL 字符: {value!r}")
+            index = self.ids[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+
+def _encode_payloads(payloads):
+    """
+    把每个元素的附加数据编码为一个 JSON 数组段，并记录每个元素在段内的字节区间
+    空附加数据不写入段中，其区间为 (0, 0)
+    """
+    spans = []
+    parts = []
+    position = 1  # 跳过开头的 "["
+    for payload in payloads:
+        if not payload:
+            spans.extend((0, 0))
+            continue
+        encoded = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        if parts:
+            position += 1  # 分隔用的逗号
+        spans.extend((position, position + len(encoded)))
+        position += len(encoded)
+        parts.append(encoded)
+    return _to_le_bytes(spans, "Q"), b"[" + b",".join(parts) + b"]"
+
+
+def write_binary_graph(path, nodes, edges, journal_seq=0):
+    """
+    把图写入紧凑二进制文件（临时文件 + 重命名）
+    :param nodes: 可迭代的 (name, data)
+    :param edges: 可迭代的 (source, target, data)
+    :param journal_seq: 该文件覆盖到的变更日志序号
+    """
+    intern = _Interner()
+    node_index = {}
+    name_ids, type_ids, node_payloads = [], [], []
+    for name, data in nodes:
+        if not isinstance(name, str):
+            raise BinaryStoreError(f"二进制检查点只支持字符串节点名: {name!r}（{type(name).__name__}）")
+        node_index[name] = len(name_ids)
+        name_ids.append(intern(name))
+        type_ids.append(intern(data.get("type", "")))
+        payload = {}
+        if data.get("attributes"):
+            payload["attributes"] = data["attributes"]
+        if data.get("resources"):
+            payload["resources"] = data["resources"]
+        node_payloads.append(payload)
+
+    sources, targets, relation_ids, edge_payloads = [], [], [], []
+    for u, v, data in edges:
+        sources.append(node_index[u])
+        targets.append(node_index[v])
+        relation_ids.append(intern(data.get("relation_type", "")))
+        edge_payloads.append({"resources": data["resources"]} if data.get("resources") else {})
+
+    node_spans, node_blob = _encode_payloads(node_payloads)
+    edge_spans, edge_blob = _encode_payloads(edge_payloads)
+    sections = [
+        "\0".join(intern.strings).encode("utf-8"),
+        _to_le_bytes(name_ids, "I"),
+        _to_le_bytes(type_ids, "I"),
+        _to_le_bytes(sources, "I"),
+        _to_le_bytes(targets, "I"),
+        _to_le_bytes(relation_ids, "I"),
+        node_spans,
+        node_blob,
+        edge_spans,
+        edge_blob,
+    ]
+
+    def write(f):
+        f.write(MAGIC)
+        f.write(_HEADER.pack(journal_seq, len(intern.strings), len(name_ids), len(sources)))
+        for section in sections:
+            f.write(_SECTION_LEN.pack(len(section)))
+            f.write(section)
+
+    atomic_write(path, write, binary=True)
+
+
+class BinaryGraphReader:
+    """
+    二进制图文件读取器
+    名称、类型和边数组在打开时一次性解码；属性和资源位于独立的段中，
+    可以按元素延迟解码（node_payload / edge_payload），也可以整段一次性解码。
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            buffer = f.read()
+        if buffer[:len(MAGIC)] != MAGIC:
+            raise BinaryStoreError(f"不是有效的二进制图文件: {path}")
+        view = memoryview(buffer)
+        offset = len(MAGIC)
+        self.journal_seq, string_count, self.node_count, self.edge_count = _HEADER.unpack_from(view, offset)
+        offset += _HEADER.size
+
+        sections = []
+        for _ in range(10):
+            (length,) = _SECTION_LEN.unpack_from(view, offset)
+            offset += _SECTION_LEN.size
+            sections.append(view[offset:offset + length])
+            offset += length
+
+        self.strings = str(sections[0], "utf-8").split("\0") if string_count else []
+        self._name_ids = _from_le_bytes(sections[1], "I")
+        self._type_ids = _from_le_bytes(sections[2], "I")
+        self.sources = _from_le_bytes(sections[3], "I")
+        self.targets = _from_le_bytes(sections[4], "I")
+        self._relation_ids = _from_le_bytes(sections[5], "I")
+        self._node_spans = _from_le_bytes(sections[6], "Q")
+        self._node_blob = sections[7]
+        self._edge_spans = _from_le_bytes(sections[8], "Q")
+        self._edge_blob = sections[9]
+
+        strings = self.strings
+        self.node_names = [strings[i] for i in self._name_ids]
+        self.node_types = [strings[i] for i in self._type_ids]
+        self.relation_types = [strings[i] for i in self._relation_ids]
+
+    @staticmethod
+    def _payload(spans, blob, index):
+        start, end = spans[2 * index], spans[2 * index + 1]
+        if start == end:
+            return {}
+        return json.loads(bytes(blob[start:end]))
+
+    @staticmethod
+    def _all_payloads(spans, blob, count):
+        """整段一次性解码，返回与元素一一对应的附加数据列表"""
+        if len(blob) <= 2:  # 空数组 "[]"
+            return [{}] * count
+        decoded = iter(json.loads(bytes(blob)))
+        bounds = iter(spans)
+        return [next(decoded) if start != end else {} for start, end in zip(bounds, bounds)]
+
+    def node_payload(self, index):
+        """延迟解码单个节点的属性和资源"""
+        return self._payload(self._node_spans, self._node_blob, index)
+
+    def edge_payload(self, index):
+        """延迟解码单条边的资源"""
+        return self._payload(self._edge_spans, self._edge_blob, index)
+
+    def iter_nodes(self, with_payload=True):
+        """返回 (name, data)；with_payload=False 时跳过属性段的解码"""
+        if not with_payload:
+            for name, node_type in zip(self.node_names, self.node_types):
+                yield name, {"type": node_type}
+            return
+        payloads = self._all_payloads(self._node_spans, self._node_blob, self.node_count)
+        for name, node_type, payload in zip(self.node_names, self.node_types, payloads):
+            data = {"type": node_type, "attributes": payload.get("attributes", {})}
+            if "resources" in payload:
+                data["resources"] = payload["resources"]
+            yield name, data
+
+    def iter_edges(self, with_payload=True):
+        """返回 (source, target, data)；with_payload=False 时跳过资源段的解码"""
+        names = self.node_names
+        endpoints = zip(self.sources, self.targets, self.relation_types)
+        if not with_payload:
+            for u, v, relation_type in endpoints:
+                yield names[u], names[v], {"relation_type": relation_type}
+            return
+        payloads = self._all_payloads(self._edge_spans, self._edge_blob, self.edge_count)
+        for (u, v, relation_type), payload in zip(endpoints, payloads):
+            # 空资源列表不写入属性字典，读取方统一使用 data.get("resources", [])
+            if payload:
+                yield names[u], names[v], {"relation_type": relation_type, "resources": payload["resources"]}
+            else:
+                yield names[u], names[v], {"relation_type": relation_type}
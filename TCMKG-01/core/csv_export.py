@@ -0,0 +1,130 @@
+# core/csv_export.py
+"""
+流式 CSV 导出：节点和关系分别写成 nodes.csv 和 edges.csv（或打包成一个 .zip），
+逐行从图的迭代器写出，不构造中间列表。
+
+节点表的列为 name、type、resources，以及每个属性键一列 "attributes.<键>"；
+关系表的列为 source、target、relation_type、resources。单元格编码规则（见 encode_cell）
+保证导出的文件可以被 DataImporter 原样导回：普通字符串原样写出，数字、布尔值、
+null、列表和字典写成 JSON，空单元格表示节点没有该属性。
+"""
+import csv
+import io
+import json
+import zipfile
+
+from .graph_io import atomic_write
+
+ATTRIBUTE_PREFIX = "attributes."
+NODE_HEADER = ("name", "type", "resources")
+EDGE_HEADER = ("source", "target", "relation_type", "resources")
+NODES_MEMBER = "nodes.csv"
+EDGES_MEMBER = "edges.csv"
+ENCODING = "utf-8-sig"  # 带 BOM，Excel 打开中文不乱码；导入时的编码嗅探会识别 BOM
+
+# 以这些字符开头的文本按 JSON 解析，同样开头的字符串值导出时要写成带引号的 JSON 字符串
+_JSON_START = frozenset('{["-0123456789')
+_JSON_WORDS = frozenset(("true", "false", "null"))
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+_DECODER = json.JSONDecoder()
+
+
+def _looks_like_json(text):
+    return text == "" or text[0] in _JSON_START or text in _JSON_WORDS
+
+
+def encode_cell(value):
+    """把属性值编码为单元格文本：不会被误认为 JSON 的字符串原样写出，其余写成 JSON"""
+    if isinstance(value, str) and not _looks_like_json(value):
+        return value
+    return _ENCODER.encode(value)
+
+
+def decode_cell(text):
+    """encode_cell 的逆操作（调用方应先跳过空单元格），非法的 JSON 抛出 json.JSONDecodeError"""
+    if _looks_like_json(text):
+        # 直接调用 raw_decode，省去 json.loads 每次调用的额外开销
+        value, end = _DECODER.raw_decode(text)
+        if end != len(text) and text[end:].strip():
+            raise json.JSONDecodeError("Extra data", text, end)
+        return value
+    return text
+
+
+def attribute_keys(graph):
+    """遍历一次节点，按首次出现的顺序收集全部属性键"""
+    keys = {}
+    for _, attributes in graph.nodes(data="attributes"):
+        if attributes:
+            keys.update(dict.fromkeys(attributes))
+    return list(keys)
+
+
+def _node_rows(graph, keys):
+    encode = encode_cell
+    for name, data in graph.nodes(data=True):
+        attributes = data.get("attributes") or {}
+        resources = data.get("resources")
+        row = [name, data.get("type", ""), _ENCODER.encode(resources) if resources else ""]
+        for key in keys:
+            value = attributes.get(key, attributes)  # 以字典本身作为“缺失”的哨兵
+            row.append("" if value is attributes else encode(value))
+        yield row
+
+
+def _edge_rows(graph):
+    for source, target, data in graph.edges(data=True):
+        resources = data.get("resources")
+        yield source, target, data.get("relation_type", ""), _ENCODER.encode(resources) if resources else ""
+
+
+def write_nodes_csv(f, graph, keys=None):
+    """
+    把节点逐行写入已打开的文本文件
+    :param keys: 属性列的顺序，默认遍历一次节点收集
+    """
+    if keys is None:
+        keys = attribute_keys(graph)
+    writer = csv.writer(f)
+    writer.writerow(NODE_HEADER + tuple(ATTRIBUTE_PREFIX + str(key) for key in keys))
+    writer.writerows(_node_rows(graph, keys))
+
+
+def write_edges_csv(f, graph):
+    """把关系逐行写入已打开的文本文件"""
+    writer = csv.writer(f)
+    writer.writerow(EDGE_HEADER)
+    writer.writerows(_edge_rows(graph))
+
+
+def split_csv_paths(path):
+    """由用户选择的路径 <名称>.csv 得到 (<名称>_nodes.csv, <名称>_edges.csv)"""
+    base = path[:-4] if path.lower().endswith(".csv") else path
+    return base + "_nodes.csv", base + "_edges.csv"
+
+
+def write_csv(graph, nodes_path, edges_path, keys=None):
+    """
+    把图导出为节点表和关系表两个 CSV 文件（各自经临时文件写入）
+    :param keys: 属性列的顺序，默认遍历一次节点收集
+    """
+    atomic_write(nodes_path, lambda f: write_nodes_csv(f, graph, keys), encoding=ENCODING)
+    atomic_write(edges_path, lambda f: write_edges_csv(f, graph), encoding=ENCODING)
+
+
+def write_csv_zip(graph, path, keys=None):
+    """
+    把节点表和关系表写进一个 zip（成员 nodes.csv、edges.csv），成员内容边压缩边写入
+    :param keys: 属性列的顺序，默认遍历一次节点收集
+    """
+    def write(raw):
+        with zipfile.ZipFile(raw, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for member, write_member in ((NODES_MEMBER, lambda f: write_nodes_csv(f, graph, keys)),
+                                         (EDGES_MEMBER, lambda f: write_edges_csv(f, graph))):
+                with archive.open(member, "w", force_zip64=True) as stream:
+                    text = io.TextIOWrapper(stream, encoding=ENCODING, newline="")
+                    write_member(text)
+                    text.flush()
+                    text.detach()  # 由 with 关闭成员，写出其数据描述符
+
+    atomic_write(path, write, binary=True)
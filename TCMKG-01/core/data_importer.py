@@ -1,43 +1,400 @@
 import pandas as pd
+import itertools
 import json
+import os
+
+from .csv_export import ATTRIBUTE_PREFIX, decode_cell
+from .csv_sniffer import read_csv, sniff_csv
+from .import_fingerprints import row_fingerprints
+
+NODE_COLUMNS = ("name", "type")
+RELATIONSHIP_COLUMNS = ("source", "target", "relation_type")
+CHUNK_SIZE = 50000  # 分块导入时每块的行数
+
+
+def _require_columns(columns, required, filepath):
+    """一次性校验必需的列，缺失时给出全部缺失的列名"""
+    missing = [column for column in required if column not in columns]
+    if missing:
+        raise ValueError(f"{filepath} 缺少列: {', '.join(missing)}")
+
+
+def _is_blank(value):
+    """空单元格：空串、None（列式表的 null）或 NaN"""
+    return value is None or value == "" or (isinstance(value, float) and value != value)
+
+
+def _decode_json_values(values, name, empty, types, expected):
+    """
+    批量解析 JSON 列（attributes、resources）：拼成一个 JSON 数组只调用一次解析器
+    单元格中逗号分隔的多个值（如 {"x":1},{"y":2}）也能拼出合法的数组，但会使后面各行错位，
+    因此整体结果的个数或类型不符时改为逐行解析，定位出错的行
+    :param empty: 空单元格按该文本解析
+    :param types: 每个单元格允许的取值类型
+    :param expected: 类型不符时错误信息中的描述
+    """
+    texts = [empty if _is_blank(value) else str(value).strip() or empty for value in values]
+    try:
+        decoded = json.loads("[" + ",".join(texts) + "]")
+    except json.JSONDecodeError:
+        decoded = None
+    if decoded is not None and len(decoded) == len(texts) and all(isinstance(value, types) for value in decoded):
+        return decoded
+
+    decoded = []
+    for row_number, text in enumerate(texts, start=2):
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"第 {row_number} 行的 {name} 不是合法的 JSON: {e}") from None
+        if not isinstance(value, types):
+            raise ValueError(f"第 {row_number} 行的 {name} 应为{expected}: {text}")
+        decoded.append(value)
+    return decoded
+
+
+def _decode_attributes(values):
+    return _decode_json_values(values, "attributes", "{}", dict, " JSON 对象")
+
+
+def _decode_resources(values):
+    return _decode_json_values(values, "resources", "null", (list, type(None)), " JSON 数组或 null")
+
+
+def _attribute_columns(data):
+    """展开后的属性列（"attributes.<键>"），见 csv_export"""
+    return [column for column in data.columns if str(column).startswith(ATTRIBUTE_PREFIX)]
+
+
+def _frame_columns(data):
+    return {column: data[column].tolist() for column in data.columns}
+
+
+def parse_node_columns(columns, source="table"):
+    """
+    整列校验和解析节点表，不涉及图（可在工作进程中调用）
+    属性可以整体放在 attributes 列（JSON 对象），也可以按键展开为 "attributes.<键>" 列，两者同时存在时合并；
+    展开的属性列是字符串时按 csv_export 的单元格规则解码，是其他类型（列式表中带类型的列）时直接取值
+    :param columns: 列名 -> 值列表，含 name、type 列（可选 attributes、resources 和展开的属性列）
+    :return: (名称列表, 类型列表, 属性字典列表)，有 resources 列时再加上资源列表的列表
+    """
+    _require_columns(columns, NODE_COLUMNS, source)
+    names = columns["name"]
+    if "attributes" in columns:
+        attributes = _decode_attributes(columns["attributes"])
+    else:
+        attributes = [{} for _ in range(len(names))]
+    for column, values in columns.items():
+        if not str(column).startswith(ATTRIBUTE_PREFIX):
+            continue
+        key = column[len(ATTRIBUTE_PREFIX):]
+        for row_number, (row, value) in enumerate(zip(attributes, values), start=2):
+            if _is_blank(value):
+                continue
+            if not isinstance(value, str):
+                row[key] = value
+                continue
+            try:
+                row[key] = decode_cell(value)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"第 {row_number} 行的 {column} 不是合法的 JSON: {e}") from None
+    parsed = names, columns["type"], attributes
+    if "resources" in columns:
+        parsed += (_decode_resources(columns["resources"]),)
+    return parsed
+
+
+def parse_relationship_columns(columns, source="table"):
+    """
+    整列校验关系表，不涉及图（可在工作进程中调用）
+    :param columns: 列名 -> 值列表，含 source、target、relation_type 列（可选 resources 列）
+    :return: (源节点列表, 目标节点列表, 关系类型列表)，有 resources 列时再加上资源列表的列表
+    """
+    _require_columns(columns, RELATIONSHIP_COLUMNS, source)
+    parsed = columns["source"], columns["target"], columns["relation_type"]
+    if "resources" in columns:
+        parsed += (_decode_resources(columns["resources"]),)
+    return parsed
+
+
+def parse_node_frame(data, source="DataFrame"):
+    """parse_node_columns 的 DataFrame 版本"""
+    return parse_node_columns(_frame_columns(data), source)
+
+
+def parse_relationship_frame(data, source="DataFrame"):
+    """parse_relationship_columns 的 DataFrame 版本"""
+    return parse_relationship_columns(_frame_columns(data), source)
+
+
+def _row_matches(graph, kind, parsed, position):
+    """已解析的第 position 行与图中的当前数据一致，即重新导入该行不会改变图"""
+    resources = parsed[3][position] if len(parsed) > 3 else None
+    if kind == "nodes":
+        data = graph.nodes.get(parsed[0][position])
+        if data is None or data.get("type") != parsed[1][position] or \
+                data.get("attributes", {}) != parsed[2][position]:
+            return False
+    else:
+        data = graph.adj.get(parsed[0][position], {}).get(parsed[1][position])
+        if data is None or data.get("relation_type") != parsed[2][position]:
+            return False
+    # 没有资源的行导入时保留已有的资源
+    return not resources or data.get("resources") == resources
+
+
+def iter_csv_chunks(filepath, encoding=None, chunk_size=CHUNK_SIZE):
+    """
+    分块读取 CSV，内存占用只与块大小有关
+    :param encoding: 文件编码，默认按嗅探结果
+    :return: 生成 (DataFrame, 已读取字节数, 文件总字节数)
+    """
+    fmt = sniff_csv(filepath)
+    total = os.path.getsize(filepath)
+    with open(filepath, "rb") as f:
+        with pd.read_csv(f, encoding=encoding or fmt.encoding, sep=fmt.delimiter, dtype=str,
+                         keep_default_na=False, chunksize=chunk_size) as reader:
+            for frame in reader:
+                yield frame, f.tell(), total
+
+
+def iter_excel_chunks(filepath, sheet_name=None, chunk_size=CHUNK_SIZE):
+    """
+    以 openpyxl 只读模式逐行读取 .xlsx 工作表并分块，单元格统一转为字符串（空单元格为空串）
+    :param sheet_name: 工作表名称，默认为活动工作表
+    :return: 生成 (DataFrame, 已读取行数, 工作表声明的总行数（可能为 None）)
+    """
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportError("分块读取 .xlsx 需要安装 openpyxl") from None
+
+    workbook = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.active
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = ["" if value is None else str(value).strip() for value in header]
+        width = len(columns)
+        total = sheet.max_row - 1 if sheet.max_row else None
+        done = 0
+        while True:
+            batch = list(itertools.islice(rows, chunk_size))
+            if not batch:
+                break
+            done += len(batch)
+            # 只读模式下末尾常有整行为空的行；行长度与表头不一致时按表头截断或补齐
+            batch = [row[:width] + (None,) * (width - len(row))
+                     for row in batch if any(value is not None for value in row)]
+            if batch:
+                yield pd.DataFrame(batch, columns=columns).fillna("").astype(str), done, total
+    finally:
+        workbook.close()
+
 
 class DataImporter:
     def __init__(self, graph_data_manager):
         self.graph_data_manager = graph_data_manager
 
-    def import_nodes_from_csv(self, filepath, encoding="GBK"):
-        """从 CSV 导入节点数据（移除标准化处理）"""
+    @staticmethod
+    def csv_kind(filepath):
+        """
+        根据表头判断 CSV 是节点表还是关系表（只嗅探文件开头，不解析整个文件）
+        :return: "nodes"、"relationships" 或 None
+        """
+        columns = set(sniff_csv(filepath).columns)
+        if columns.issuperset(NODE_COLUMNS):
+            return "nodes"
+        if columns.issuperset(RELATIONSHIP_COLUMNS):
+            return "relationships"
+        return None
+
+    def import_nodes_from_csv(self, filepath, encoding=None):
+        """从 CSV 导入节点数据（移除标准化处理），编码和分隔符默认按嗅探结果"""
         try:
-            data = pd.read_csv(filepath, encoding=encoding)
-            for _, row in data.iterrows():
-                self.graph_data_manager.add_node(
-                    row["name"],
-                    row["type"],
-                    json.loads(row["attributes"]) if "attributes" in row else {}
-                )
+            data = read_csv(filepath, encoding, dtype=str, keep_default_na=False)
+            return self.import_nodes_from_frame(data, filepath)
         except Exception as e:
             raise ImportError(f"CSV导入失败: {str(e)}")
 
-    def import_relationships_from_csv(self, filepath, encoding="GBK"):
-        """从 CSV 导入关系数据"""
+    def import_nodes_from_frame(self, data, source="DataFrame"):
+        """
+        批量导入节点：整列校验和解析，再一次性交给 add_nodes_from（单个提交）
+        :param data: 含 name、type 列（可选 attributes 列）的 DataFrame
+        :return: 导入的节点数
+        """
+        return self.import_node_rows(*parse_node_frame(data, source))
+
+    def import_node_rows(self, names, types, attributes, resources=None):
+        """按列导入已解析的节点"""
+        if resources is None:
+            return self.graph_data_manager.add_nodes_from(zip(names, types, attributes))
+        return self.graph_data_manager.add_nodes_from(zip(names, types, attributes, resources))
+
+    def import_relationships_from_csv(self, filepath, encoding=None):
+        """从 CSV 导入关系数据，编码和分隔符默认按嗅探结果"""
         try:
-            data = pd.read_csv(filepath, encoding=encoding)
+            data = read_csv(filepath, encoding, dtype=str, keep_default_na=False)
         except Exception as e:
             print(f"导入关系数据失败: {str(e)}")
             return
 
-        for _, row in data.iterrows():
-            source = row["source"]
-            target = row["target"]
-            relation_type = row["relation_type"]
+        return self.import_relationships_from_frame(data, filepath)
 
-            # 确保 source 和 target 节点都存在
-            if not self.graph_data_manager.has_node(source):
-                print(f"源节点 '{source}' 不存在，跳过此关系")
-                continue
-            if not self.graph_data_manager.has_node(target):
-                print(f"目标节点 '{target}' 不存在，跳过此关系")
-                continue
+    def import_relationships_from_frame(self, data, source="DataFrame"):
+        """
+        批量导入关系：整列校验后交给 import_relationship_rows
+        :param data: 含 source、target、relation_type 列的 DataFrame
+        :return: 导入的关系数
+        """
+        return self.import_relationship_rows(*parse_relationship_frame(data, source))
+
+    def import_relationship_rows(self, sources, targets, relation_types, resources=None):
+        """
+        按列导入已解析的关系：用集合运算一次性找出端点不存在的关系并跳过，其余交给 add_relationships_from
+        :return: 导入的关系数
+        """
+        has_node = self.graph_data_manager.has_node
+        missing = {name for name in set(sources).union(targets) if not has_node(name)}
+        if resources is None:
+            rows = zip(sources, targets, relation_types)
+        else:
+            rows = zip(sources, targets, relation_types, resources)
+        if missing:
+            for name in [name for name in dict.fromkeys(sources) if name in missing][:20]:
+                print(f"源节点 '{name}' 不存在，跳过相关关系")
+            for name in [name for name in dict.fromkeys(targets) if name in missing][:20]:
+                print(f"目标节点 '{name}' 不存在，跳过相关关系")
+            rows = [row for row in rows if row[0] not in missing and row[1] not in missing]
+            print(f"共跳过 {len(sources) - len(rows)} 条关系")
+
+        return self.graph_data_manager.add_relationships_from(rows)
+
+    def reimport_csv(self, filepath, index, encoding=None):
+        """
+        增量重新导入 CSV：与指纹索引中该文件上次导入时的行指纹比较，在一个事务中只应用
+        新增、修改和删除的行；没有记录时所有行按新增处理。指纹未变、但图中的数据已被撤销或
+        手动编辑过的行也会重新应用。索引只在内存中更新，由调用方保存
+        :param index: FingerprintIndex
+        :return: 应用的行数（新增 + 修改 + 删除）
+        """
+        return self.plan_reimport(filepath, index, encoding)[1]()
 
-            # 添加关系到图数据
-            self.graph_data_manager.add_relationship(source, target, relation_type)
+    def plan_reimport(self, filepath, index, encoding=None):
+        """
+        reimport_csv 的读取和比较阶段：读取 CSV、与指纹索引比较并解析变化的行，不修改图
+        （导入任务在工作线程中执行这一阶段，写入留给 UI 线程）
+        :return: (要应用的行数, 应用函数)；应用函数在一个事务中写入变化、更新索引，返回应用的行数
+        """
+        manager = self.graph_data_manager
+        if index.is_unchanged(filepath, manager.version):
+            print(f"增量导入 {os.path.basename(filepath)}: 文件和图都未变化，跳过")
+            return 0, lambda: 0
+
+        data = read_csv(filepath, encoding, dtype=str, keep_default_na=False)
+        columns = set(data.columns)
+        if columns.issuperset(NODE_COLUMNS):
+            kind = "nodes"
+            keys = data["name"].tolist()
+            fingerprints = row_fingerprints(data, [c for c in ("name", "type", "attributes", "resources")
+                                                   if c in columns] + _attribute_columns(data))
+        elif columns.issuperset(RELATIONSHIP_COLUMNS):
+            kind = "relationships"
+            keys = list(zip(data["source"].tolist(), data["target"].tolist()))
+            fingerprints = row_fingerprints(data, [c for c in RELATIONSHIP_COLUMNS + ("resources",)
+                                                   if c in columns])
+        else:
+            raise ValueError(f"{filepath} 既不是节点表也不是关系表")
+
+        # 先解析全部行，格式错误在修改图之前抛出
+        if kind == "nodes":
+            parsed = parse_node_frame(data, filepath)
+        else:
+            parsed = parse_relationship_frame(data, filepath)
+
+        previous = index.get(filepath, kind)
+        known = previous or {}
+        graph = manager.graph
+        # 键 -> (指纹, 行号)；重复的键以最后一行为准，与批量导入的效果一致
+        latest = dict(zip(keys, zip(fingerprints, range(len(keys)))))
+        changed = {position for key, (fingerprint, position) in latest.items() if known.get(key) != fingerprint}
+        inserted = sum(1 for position in changed if keys[position] not in known)
+        # 指纹未变的行也要与图的当前数据比较：导入之后被撤销或手动编辑过的行需要恢复
+        restored = {position for _, position in latest.values()
+                    if position not in changed and not _row_matches(graph, kind, parsed, position)}
+        changed = sorted(changed | restored)
+        # 文件中已删除的行只删除图中仍然存在的
+        exists = graph.has_node if kind == "nodes" else (lambda key: graph.has_edge(*key))
+        deleted = [key for key in known if key not in latest and exists(key)]
+        print(f"增量导入 {os.path.basename(filepath)}: 新增 {inserted}，"
+              f"修改 {len(changed) - inserted - len(restored)}，恢复 {len(restored)}，删除 {len(deleted)}，"
+              f"未变 {len(latest) - len(changed)}")
+        if not changed and not deleted and previous is not None:
+            index.put(filepath, kind, {key: fingerprint for key, (fingerprint, _) in latest.items()})
+            index.mark_synced(filepath, manager.version)
+            return 0, lambda: 0
+
+        parsed = tuple([column[position] for position in changed] for column in parsed)
+
+        def apply():
+            with manager.transaction():
+                if kind == "nodes":
+                    for name in deleted:
+                        manager.delete_node(name)
+                    self.import_node_rows(*parsed)
+                else:
+                    for source, target in deleted:
+                        manager.delete_relationship(source, target)
+                    self.import_relationship_rows(*parsed)
+
+            recorded = {key: fingerprint for key, (fingerprint, _) in latest.items()}
+            skipped = 0
+            if kind == "relationships":
+                # 端点不存在而被跳过的关系不记录指纹，下次重新导入时再尝试
+                for position in changed:
+                    if not manager.has_edge(*keys[position]):
+                        recorded.pop(keys[position], None)
+                        skipped += 1
+            index.put(filepath, kind, recorded, complete=not skipped)
+            if not skipped:
+                index.mark_synced(filepath, manager.version)  # 在事务中调用时由提交方在提交后重新记录
+            return len(changed) + len(deleted)
+
+        return len(changed) + len(deleted), apply
+
+    def import_chunks(self, chunks, node_file=True, progress_callback=None):
+        """
+        逐块导入：每块作为一次独立提交写入图中，块之间只追加变更日志，结束时写一次检查点
+        中途出错时已提交的块保留（各自可撤销），未读取的部分不再处理
+        :param chunks: iter_csv_chunks / iter_excel_chunks 生成的 (DataFrame, 已读取量, 总量)
+        :param progress_callback: 每块提交后调用 progress_callback(已读取量, 总量, 已导入条数)
+        :return: 导入的条数
+        """
+        import_frame = self.import_nodes_from_frame if node_file else self.import_relationships_from_frame
+        imported = 0
+        with self.graph_data_manager.defer_checkpoints():
+            for frame, done, total in chunks:
+                imported += import_frame(frame) or 0
+                if progress_callback:
+                    progress_callback(done, total, imported)
+        return imported
+
+    def import_csv_chunked(self, filepath, node_file=True, encoding=None, chunk_size=CHUNK_SIZE,
+                           progress_callback=None):
+        """分块导入 CSV（适合超大的节点表或关系表），进度以字节计"""
+        try:
+            return self.import_chunks(iter_csv_chunks(filepath, encoding, chunk_size), node_file,
+                                      progress_callback)
+        except Exception as e:
+            raise ImportError(f"CSV导入失败: {str(e)}")
+
+    def import_excel_chunked(self, filepath, node_file=True, sheet_name=None, chunk_size=CHUNK_SIZE,
+                             progress_callback=None):
+        """分块导入 .xlsx（openpyxl 只读模式），进度以行计"""
+        try:
+            return self.import_chunks(iter_excel_chunks(filepath, sheet_name, chunk_size), node_file,
+                                      progress_callback)
+        except Exception as e:
+            raise ImportError(f"Excel导入失败: {str(e)}")
@@ -1,146 +1,842 @@
 import networkx as nx
 import json
+import os
+import copy
+import threading
 from collections import deque
 import contextlib
 
+from .binary_store import BinaryGraphReader, BinaryStoreError, write_binary_graph
+from . import graph_events
+from .graph_events import GraphEvent
+from .graph_index import GraphIndex
+from .graph_io import atomic_write, gc_paused, iter_json_graph, write_json_stream
+from .graph_journal import GraphJournal
+from .jsonld_export import JSONLD_CONTEXT, iter_jsonld_nodes, save_jsonld
+
+
+class _GraphDelta:
+    """一次修改的增量记录：只保存受影响的节点和边在修改前的状态"""
+    __slots__ = ("nodes", "edges", "renames")
+
+    def __init__(self):
+        self.nodes = {}  # 节点名 -> 修改前数据的副本（None 表示修改前不存在）
+        self.edges = {}  # (source, target) -> 修改前数据的副本（None 表示修改前不存在）
+        self.renames = {}  # 本次修改中的节点重命名 新名称 -> 原名称，用于生成重命名事件
+
+    def __bool__(self):
+        return bool(self.nodes or self.edges)
+
+    def add_rename(self, old_name, new_name):
+        """记录一次重命名；同一次修改中的连续重命名 a -> b -> c 合并为 a -> c"""
+        original = self.renames.pop(old_name, old_name)
+        if original != new_name:
+            self.renames[new_name] = original
+
+
+class _Vocabulary:
+    """
+    取值重复度很高的字符串（节点类型、关系类型）的驻留表
+    同一个取值在整张图中只保留一个字符串对象，并分配稳定的整数编号
+    """
+    __slots__ = ("ids", "values")
+
+    def __init__(self):
+        self.ids = {}  # 取值 -> 编号
+        self.values = []  # 编号 -> 取值（驻留后的唯一对象）
+
+    def __call__(self, value):
+        """返回 value 的驻留对象，首次出现时登记"""
+        index = self.ids.get(value)
+        if index is None:
+            index = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return self.values[index]
+
+    def id_of(self, value):
+        return self.ids.get(value)
+
+    def __len__(self):
+        return len(self.values)
+
+
+class _GraphViews:
+    """get_all_nodes / get_all_relationships 的物化视图，对应图的某个版本"""
+    __slots__ = ("version", "nodes", "edges", "node_list", "edge_list")
+
+    def __init__(self, version, nodes, edges):
+        self.version = version
+        self.nodes = nodes  # 节点名 -> 节点字典
+        self.edges = edges  # (source, target) -> 关系字典
+        self.node_list = None  # 按需从 nodes 生成的列表，修改后置空
+        self.edge_list = None
+
+
+def _node_dicts(nodes):
+    """把 (name, data) 转换为导出格式的节点字典（生成器）"""
+    for node, data in nodes:
+        yield {
+            "name": node,
+            "type": data["type"],
+            "attributes": data.get("attributes", {}),
+            "resources": data.get("resources", [])
+        }
+
+
+def _edge_dicts(edges):
+    """把 (source, target, data) 转换为导出格式的关系字典（生成器）"""
+    for u, v, data in edges:
+        yield {
+            "source": u,
+            "target": v,
+            "relation_type": data["relation_type"],
+            "resources": data.get("resources", [])
+        }
+
+
+# merge_graph 的冲突策略：导入的节点或边已存在时如何处理
+MERGE_OVERWRITE = "overwrite"  # 用导入的数据整体替换
+MERGE_KEEP = "keep"  # 保留现有数据
+MERGE_ATTRIBUTES = "merge-attributes"  # 类型取导入值，attributes 按键合并（导入值优先），resources 取并集
+MERGE_POLICIES = (MERGE_OVERWRITE, MERGE_KEEP, MERGE_ATTRIBUTES)
+
+
+def _resolve_conflict(current, incoming, policy):
+    """
+    按合并策略得到已存在的节点或边应写入的数据，返回 None 表示保留现有数据
+    不修改 current 及其中的容器（撤销记录和后台保存的快照可能仍引用它们）
+    """
+    if policy == MERGE_KEEP:
+        return None
+    if policy == MERGE_OVERWRITE:
+        return incoming
+    merged = dict(current)
+    merged.update((key, value) for key, value in incoming.items() if key not in ("attributes", "resources"))
+    if "attributes" in incoming:
+        attributes = dict(current.get("attributes") or {})
+        attributes.update(incoming["attributes"] or {})
+        merged["attributes"] = attributes
+    resources = list(current.get("resources") or ())
+    for resource in incoming.get("resources") or ():
+        if resource not in resources:
+            resources.append(resource)
+    if resources:
+        merged["resources"] = resources
+    return merged
+
+
 class GraphDataManager:
-    def __init__(self, json_path='generated_graph.json'):
+    # JSON-LD 上下文，定义见 jsonld_export
+    JSONLD_CONTEXT = JSONLD_CONTEXT
+
+    # 单次提交涉及的节点和边超过该数量时（如批量导入）按整体变更处理：没有后台保存时直接写检查点
+    # 而不是逐条记日志，读缓存留待下次读取时重建，订阅者收到 GRAPH_RESET 做完整刷新
+    LARGE_CHANGE_THRESHOLD = 10000
+
+    def __init__(self, json_path='generated_graph.json', use_journal=True, checkpoint_interval=1000,
+                 binary_store=False, autoload=True, json_indent=None):
+        """
+        :param json_path: 图数据 JSON 文件（检查点）路径
+        :param use_journal: 是否启用追加式变更日志；关闭时每次修改都完整重写 JSON
+        :param checkpoint_interval: 日志累计多少条记录后自动写一次检查点
+        :param binary_store: 是否以 JSON 旁边的紧凑二进制文件（.kgb）作为检查点，
+                             JSON 仍可通过 save_graph_to_json 导出
+        :param autoload: 是否在构造时立即加载；为 False 时由调用方稍后调用 load_graph_from_json
+                         （例如在界面显示后带进度回调加载）
+        :param json_indent: JSON 检查点的缩进；默认 None 为紧凑格式
+        """
         self.graph = nx.DiGraph()
         self.undo_stack = deque(maxlen=50)
         self.redo_stack = deque(maxlen=50)
         self.json_path = json_path
+        self.binary_path = os.path.splitext(json_path)[0] + '.kgb' if binary_store else None
         self._current_version = 0
-        self.load_graph_from_json()
+        self.checkpoint_interval = checkpoint_interval
+        self.json_indent = json_indent
+        self.journal = GraphJournal(json_path + '.journal') if use_journal else None
+        self._transaction = None  # 进行中的事务所累积的 delta
+        self._checkpoints_deferred = False  # defer_checkpoints() 期间为 True
+        self._deferred_dirty = False  # 推迟期间是否有提交尚未写入检查点
+        self._views = None  # 读视图缓存（_GraphViews）
+        self._index = None  # 二级索引（GraphIndex）
+        self._change_listeners = []
+        self._event_subscribers = []
+        self._held_deltas = None  # hold_notifications() 期间暂存的提交
+        self.autosave = None  # 挂接的 AutosaveService
+        self._save_lock = threading.Lock()
+        self._persisted_version = 0
+        self.node_types = _Vocabulary()
+        self.relation_types = _Vocabulary()
+        if autoload:
+            self.load_graph_from_json()
+
+    def add_change_listener(self, callback):
+        """注册图数据变更回调（每次提交的修改或事务调用一次）"""
+        if callback not in self._change_listeners:
+            self._change_listeners.append(callback)
+
+    def remove_change_listener(self, callback):
+        if callback in self._change_listeners:
+            self._change_listeners.remove(callback)
+
+    def subscribe(self, callback):
+        """
+        订阅细粒度变更事件：每次提交后按顺序对每个 GraphEvent 调用 callback(event)，
+        最后一个事件为 BATCH_COMMITTED；顺序保证先删边、再删节点，先加节点、再加边
+        """
+        if callback not in self._event_subscribers:
+            self._event_subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._event_subscribers:
+            self._event_subscribers.remove(callback)
+
+    @property
+    def version(self):
+        """图数据版本号，每次修改后递增"""
+        return self._current_version
+
+    def hold_notifications(self):
+        """
+        暂存之后提交的变更通知，直到 release_notifications()
+        用于在工作线程中修改图：回调和事件订阅者（界面、自动保存计时器）只能在 UI 线程上调用
+        """
+        if self._held_deltas is None:
+            self._held_deltas = []
+
+    def release_notifications(self):
+        """发出暂存期间的通知：只有一次提交时按其 delta 发出事件，多次提交合并为一次整体刷新"""
+        held, self._held_deltas = self._held_deltas, None
+        if held:
+            self._notify_changed(held[0] if len(held) == 1 else None)
+
+    def _notify_changed(self, delta=None):
+        if self._held_deltas is not None:
+            self._held_deltas.append(delta)
+            return
+        for callback in list(self._change_listeners):
+            try:
+                callback()
+            except Exception as e:
+                print(f"变更回调执行失败: {e}")
+        if self._event_subscribers:
+            if delta is None or self._is_large_change(delta):
+                events = [GraphEvent(graph_events.GRAPH_RESET)]
+            else:
+                events = self._delta_events(delta)
+                events.append(GraphEvent(graph_events.BATCH_COMMITTED, data=len(events)))
+            self._emit(events)
+
+    def _emit(self, events):
+        for callback in list(self._event_subscribers):
+            for event in events:
+                try:
+                    callback(event)
+                except Exception as e:
+                    print(f"变更事件处理失败: {e}")
+
+    def _delta_events(self, delta):
+        """比较 delta 中记录的修改前状态与图的当前状态，生成变更事件"""
+        graph = self.graph
+        # 只有新名称仍在、原名称已不在的重命名才作为重命名事件，其余按普通增删处理
+        renames = {new: old for new, old in delta.renames.items()
+                   if graph.has_node(new) and not graph.has_node(old)}
+        renamed_from = set(renames.values())
+        events = []
+        for (source, target), before in delta.edges.items():
+            if before is not None and not graph.has_edge(source, target):
+                events.append(GraphEvent(graph_events.EDGE_REMOVED, (source, target), before))
+        for name, before in delta.nodes.items():
+            if before is not None and not graph.has_node(name) and name not in renamed_from:
+                events.append(GraphEvent(graph_events.NODE_REMOVED, name, before))
+        for new, old in renames.items():
+            events.append(GraphEvent(graph_events.NODE_RENAMED, new, graph.nodes[new], old_key=old))
+        for name, before in delta.nodes.items():
+            if name in renames or not graph.has_node(name):
+                continue
+            if before is None:
+                events.append(GraphEvent(graph_events.NODE_ADDED, name, graph.nodes[name]))
+            elif before != graph.nodes[name]:
+                events.append(GraphEvent(graph_events.NODE_UPDATED, name, graph.nodes[name]))
+        for (source, target), before in delta.edges.items():
+            if not graph.has_edge(source, target):
+                continue
+            if before is None:
+                events.append(GraphEvent(graph_events.EDGE_ADDED, (source, target), graph[source][target]))
+            elif before != graph[source][target]:
+                events.append(GraphEvent(graph_events.EDGE_UPDATED, (source, target), graph[source][target]))
+        return events
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        批量修改上下文，用法: with graph_manager.transaction(): ...
+        事务内的所有修改合并为一个撤销步骤，持久化和变更通知推迟到提交时各执行一次；
+        块内抛出异常时回滚全部修改并继续抛出。支持嵌套，只有最外层负责提交。
+        """
+        if self._transaction is not None:
+            yield self
+            return
 
-    def _create_snapshot(self):
-        """创建当前图数据的快照"""
+        self._transaction = _GraphDelta()
+        try:
+            yield self
+        except BaseException:
+            delta, self._transaction = self._transaction, None
+            self._apply_delta(delta)
+            print("事务已回滚")
+            raise
+        delta, self._transaction = self._transaction, None
+        self._commit_change(delta)
+
+    @contextlib.contextmanager
+    def defer_checkpoints(self):
+        """
+        推迟检查点：块内每次提交仍然各自生效（撤销栈、事件、变更日志），但不重写完整的图文件，
+        退出时统一写一次检查点。用于分块导入等连续的大批量提交，避免每块都重写一遍整个图。
+        """
+        if self._checkpoints_deferred:
+            yield self
+            return
+
+        self._checkpoints_deferred = True
+        try:
+            yield self
+        finally:
+            self._checkpoints_deferred = False
+            if self._deferred_dirty:
+                self._deferred_dirty = False
+                if self.journal is None:
+                    self._save_snapshot(self._live_view())
+                else:
+                    self.write_checkpoint(self._live_view())
+
+    def _begin_change(self):
+        """返回本次修改应写入的 delta（事务中返回事务的 delta）"""
+        if self._transaction is not None:
+            return self._transaction
+        return _GraphDelta()
+
+    def _touch_node(self, delta, name):
+        """在修改节点之前记录其原始状态（同一次修改中只记录第一次）"""
+        if name not in delta.nodes:
+            if self.graph.has_node(name):
+                delta.nodes[name] = copy.deepcopy(dict(self.graph.nodes[name]))
+            else:
+                delta.nodes[name] = None
+
+    def _touch_edge(self, delta, source, target):
+        """在修改边之前记录其原始状态"""
+        if (source, target) not in delta.edges:
+            if self.graph.has_edge(source, target):
+                delta.edges[(source, target)] = copy.deepcopy(dict(self.graph[source][target]))
+            else:
+                delta.edges[(source, target)] = None
+
+    def _touch_incident_edges(self, delta, name):
+        """记录节点所有入边和出边的原始状态（删除节点前调用）"""
+        for u in self.graph.predecessors(name):
+            self._touch_edge(delta, u, name)
+        for v in self.graph.successors(name):
+            self._touch_edge(delta, name, v)
+
+    def _apply_delta(self, delta):
+        """把 delta 中记录的状态写回图中，返回可以撤销本次应用的反向 delta"""
+        inverse = _GraphDelta()
+        inverse.renames = {old: new for new, old in delta.renames.items()}
+        for name in delta.nodes:
+            self._touch_node(inverse, name)
+        for source, target in delta.edges:
+            self._touch_edge(inverse, source, target)
+        for name, data in delta.nodes.items():
+            if data is None and self.graph.has_node(name):
+                self._touch_incident_edges(inverse, name)
+
+        for (source, target), data in delta.edges.items():
+            if data is None and self.graph.has_edge(source, target):
+                self.graph.remove_edge(source, target)
+        for name, data in delta.nodes.items():
+            if data is None and self.graph.has_node(name):
+                self.graph.remove_node(name)
+        for name, data in delta.nodes.items():
+            if data is not None:
+                if self.graph.has_node(name):
+                    self.graph.nodes[name].clear()
+                self.graph.add_node(name, **copy.deepcopy(data))
+        for (source, target), data in delta.edges.items():
+            if data is not None:
+                if self.graph.has_edge(source, target):
+                    self.graph[source][target].clear()
+                self.graph.add_edge(source, target, **copy.deepcopy(data))
+        return inverse
+
+    def _delta_records(self, delta):
+        """根据 delta 涉及的节点和边的当前状态生成日志记录"""
+        records = []
+        for name in delta.nodes:
+            if self.graph.has_node(name):
+                records.append(self._node_record(name))
+        for source, target in delta.edges:
+            if self.graph.has_edge(source, target):
+                records.append(self._edge_record(source, target))
+        for source, target in delta.edges:
+            if not self.graph.has_edge(source, target):
+                records.append({"op": "del_edge", "source": source, "target": target})
+        for name in delta.nodes:
+            if not self.graph.has_node(name):
+                records.append({"op": "del_node", "name": name})
+        return records
+
+    def _commit_change(self, delta, records=None):
+        """提交一次修改：压入撤销栈、清空重做栈、持久化并通知（事务中推迟到提交时）"""
+        if delta is self._transaction or not delta:
+            return
         self._current_version += 1
-        return {
-            "nodes": list(self.graph.nodes(data=True)),
-            "edges": list(self.graph.edges(data=True)),
-            "version": self._current_version
-        }
+        self._patch_read_caches(delta)
+        self.undo_stack.append(delta)
+        self.redo_stack.clear()
+        self._persist(delta, records)
+        self._notify_changed(delta)
 
-    def _apply_snapshot(self, snapshot):
-        """应用快照恢复图数据"""
+    def _is_large_change(self, delta):
+        return len(delta.nodes) + len(delta.edges) > self.LARGE_CHANGE_THRESHOLD
+
+    def _binary_is_current(self):
+        """二进制检查点存在且不比 JSON 旧（JSON 被外部修改过时以 JSON 为准）"""
+        if self.binary_path is None or not os.path.exists(self.binary_path):
+            return False
+        if not os.path.exists(self.json_path):
+            return True
+        return os.path.getmtime(self.binary_path) >= os.path.getmtime(self.json_path)
+
+    def load_graph_from_binary(self):
+        """从二进制检查点加载图数据，返回其覆盖到的日志序号"""
+        reader = BinaryGraphReader(self.binary_path)
         self.graph.clear()
-        for node, data in snapshot["nodes"]:
-            self.graph.add_node(node, **data)
-        for u, v, data in snapshot["edges"]:
-            self.graph.add_edge(u, v, **data)
+        for value in reader.node_types:
+            self.node_types(value)
+        for value in reader.relation_types:
+            self.relation_types(value)
+        with gc_paused():
+            self.graph.add_nodes_from(reader.iter_nodes())
+            self.graph.add_edges_from(reader.iter_edges())
+        return reader.journal_seq
 
-    def load_graph_from_json(self):
-        """从 JSON 文件加载图数据"""
-        try:
-            with open(self.json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self.graph.clear()
-                for node in data["nodes"]:
-                    self.graph.add_node(
-                        node["name"],
-                        type=node["type"],
-                        attributes=node.get("attributes", {}),
-                        resources=node.get("resources", [])
-                    )
-                for edge in data["edges"]:
-                    self.graph.add_edge(
-                        edge["source"],
-                        edge["target"],
-                        relation_type=edge["relation_type"],
-                        resources = edge.get("resources", [])
-                    )
-        except (FileNotFoundError, json.JSONDecodeError):
-            pass
+    def load_graph_from_json(self, progress_callback=None):
+        """
+        从 JSON 文件（或更新的二进制检查点）加载图数据，并重放检查点之后的变更日志
+        JSON 按元素流式解析并逐个加入图中，峰值内存接近最终图的大小
+        :param progress_callback: 读取 JSON 时调用 callback(已读字节数, 文件总字节数)
+        """
+        self._current_version += 1  # 使已有的读视图失效
+        checkpoint_seq = None
+        if self._binary_is_current():
+            try:
+                checkpoint_seq = self.load_graph_from_binary()
+            except (OSError, BinaryStoreError, ValueError) as e:
+                print(f"二进制检查点读取失败，改为读取 JSON: {e}")
+        if checkpoint_seq is None:
+            try:
+                checkpoint_seq = self._load_json_stream(progress_callback)
+            except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
+                if not isinstance(e, FileNotFoundError):
+                    print(f"JSON 图数据读取失败: {e}")
+                checkpoint_seq = 0
 
-    def save_graph_to_json(self):
-        """将当前图数据保存到 JSON 文件"""
-        data = {
-            "nodes": [
-                {
-                    "name": node,
-                    "type": data["type"],
-                    "attributes": data.get("attributes", {}),
-                    "resources": data.get("resources", [])
-                } for node, data in self.graph.nodes(data=True)
-            ],
-            "edges": [
-                {
-                    "source": u,
-                    "target": v,
-                    "relation_type": data["relation_type"],
-                    "resources": data.get("resources", [])
-                } for u, v, data in self.graph.edges(data=True)
-            ]
+        self._replay_journal(checkpoint_seq)
+        self._emit([GraphEvent(graph_events.GRAPH_RESET)])
+
+    def _load_json_stream(self, progress_callback=None):
+        """流式解析 JSON 图文件并填充 self.graph，返回其中记录的日志序号"""
+        graph = self.graph
+        graph.clear()
+        checkpoint_seq = 0
+        with gc_paused():
+            for key, item in iter_json_graph(self.json_path, progress_callback):
+                if key == "nodes":
+                    graph.add_node(item["name"], **self._node_data(
+                        item["type"], item.get("attributes", {}), item.get("resources")))
+                elif key == "edges":
+                    graph.add_edge(item["source"], item["target"], **self._edge_data(
+                        item["relation_type"], item.get("resources")))
+                elif key == "journal_seq":
+                    checkpoint_seq = item
+        return checkpoint_seq
+
+    def _replay_journal(self, checkpoint_seq):
+        if self.journal is not None:
+            replayed = 0
+            for record in self.journal.replay(checkpoint_seq):
+                self._apply_journal_record(record)
+                replayed += 1
+            if replayed:
+                print(f"已从变更日志恢复 {replayed} 条修改")
+
+    def _apply_journal_record(self, record):
+        """把一条日志记录应用到图上（记录均为幂等的状态设置）"""
+        op = record.get("op")
+        if op == "node":
+            name = record["name"]
+            data = self._intern_data(record["data"])
+            if self.graph.has_node(name):
+                self.graph.nodes[name].clear()
+                self.graph.nodes[name].update(data)
+            else:
+                self.graph.add_node(name, **data)
+        elif op == "del_node":
+            if self.graph.has_node(record["name"]):
+                self.graph.remove_node(record["name"])
+        elif op == "edge":
+            source, target = record["source"], record["target"]
+            if self.graph.has_edge(source, target):
+                self.graph[source][target].clear()
+            self.graph.add_edge(source, target, **self._intern_data(record["data"]))
+        elif op == "del_edge":
+            if self.graph.has_edge(record["source"], record["target"]):
+                self.graph.remove_edge(record["source"], record["target"])
+        elif op == "clear":
+            self.graph.clear()
+        else:
+            print(f"未知的日志记录类型: {op}")
+
+    def _node_record(self, name):
+        return {"op": "node", "name": name, "data": dict(self.graph.nodes[name])}
+
+    def _edge_record(self, source, target):
+        return {"op": "edge", "source": source, "target": target,
+                "data": dict(self.graph[source][target])}
+
+    def _node_data(self, node_type, attributes, resources=None):
+        """构造节点属性字典：类型字符串驻留，空资源列表不单独存储"""
+        data = {"type": self.node_types(node_type), "attributes": attributes}
+        if resources:
+            data["resources"] = resources
+        return data
+
+    def _edge_data(self, relation_type, resources=None):
+        """构造边属性字典：关系类型字符串驻留，空资源列表不单独存储"""
+        data = {"relation_type": self.relation_types(relation_type)}
+        if resources:
+            data["resources"] = resources
+        return data
+
+    def _intern_data(self, data):
+        """对日志或撤销记录中恢复出的属性字典做同样的驻留"""
+        if "type" in data:
+            data["type"] = self.node_types(data["type"])
+        if "relation_type" in data:
+            data["relation_type"] = self.relation_types(data["relation_type"])
+        return data
+
+    def _persist(self, delta, records=None):
+        """
+        持久化一次修改：启用日志时只追加记录，否则完整重写 JSON
+        :param records: 日志记录，默认由 delta 生成
+        """
+        deferred = self._checkpoints_deferred
+        if self.journal is not None and records is None and self._is_large_change(delta) \
+                and self.autosave is None and not deferred:
+            # 大批量修改逐条记日志之后也要立刻压缩，直接写检查点更快。
+            # 挂接了自动保存或推迟检查点时检查点不会马上写，仍要记日志，否则崩溃时会丢失这次修改
+            self.write_checkpoint(self._live_view())
+            return
+        if self.journal is not None:
+            self.journal.append_many(records if records is not None else self._delta_records(delta))
+        if self.autosave is not None:
+            # 检查点由自动保存服务在后台合并写入
+            return
+        if deferred:
+            self._deferred_dirty = True
+            return
+        # 修改已经递增过版本号，这里直接写入，不再像外部调用的保存那样递增（以免读视图失效）
+        if self.journal is None:
+            self._save_snapshot(self._live_view())
+        elif self.checkpoint_interval and self.journal.pending >= self.checkpoint_interval:
+            self.write_checkpoint(self._live_view())
+
+    def request_save(self, changed=True):
+        """
+        请求保存：插件等直接修改 self.graph 之后应调用本方法，而不是 save_graph_to_json
+        挂接了自动保存服务时交给后台合并写入，否则立即保存。
+        后台保存的快照只浅复制属性字典（见 snapshot_view），直接修改时要整体替换 attributes、
+        resources 等取值，不能原地修改其中的字典或列表
+        :param changed: 调用方是否直接修改过图；为 False 时（如用户手动保存）只保存，不通知订阅者刷新
+        """
+        if self.autosave is not None:
+            self._current_version += 1
+            self.autosave.mark_dirty()
+        else:
+            self.save_graph_to_json()
+        if changed:
+            # 无法得知调用方具体改了什么，通知订阅者完整刷新
+            self._emit([GraphEvent(graph_events.GRAPH_RESET)])
+
+    def checkpoint(self):
+        """写入完整检查点（JSON 或二进制）并清空变更日志"""
+        self._current_version += 1
+        self.write_checkpoint(self._live_view())
+
+    def snapshot_view(self):
+        """
+        在调用线程上复制一份不可变的图视图，供后台线程序列化
+        只浅复制每个元素的属性字典，属性值本身由修改操作整体替换而不是原地修改
+        （直接修改图的调用方同样要遵守，见 request_save）
+        """
+        return {
+            "version": self._current_version,
+            "journal_mark": self.journal.mark() if self.journal is not None else None,
+            "nodes": tuple((node, dict(data)) for node, data in self.graph.nodes(data=True)),
+            "edges": tuple((u, v, dict(data)) for u, v, data in self.graph.edges(data=True)),
         }
-        with open(self.json_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
 
-    def graph_to_jsonld(self):
-        """将当前图数据转换为 JSON-LD 格式数据"""
-        # 定义 JSON-LD 上下文，可根据实际需要调整 URI
-        context = {
-            "name": "http://schema.org/name",
-            "type": "http://schema.org/additionalType",
-            "attributes": "http://schema.org/additionalProperty",
-            "relatedTo": {
-                "@id": "http://schema.org/relatedLink",
-                "@container": "@list"
-            }
+    def _live_view(self):
+        """
+        与 snapshot_view 结构相同，但直接引用图的节点和边视图而不复制
+        只能用于在当前线程同步完成的写入
+        """
+        return {
+            "version": self._current_version,
+            "journal_mark": self.journal.mark() if self.journal is not None else None,
+            "nodes": self.graph.nodes(data=True),
+            "edges": self.graph.edges(data=True),
         }
-        # 构造一个节点映射，先把每个节点构造成基本数据
-        nodes_ld = {}
-        for node, data in self.graph.nodes(data=True):
-            nodes_ld[node] = {
-                "@id": node,
-                "name": node,
-                "type": data.get("type", ""),
-                "attributes": data.get("attributes", {})
-                # "relatedTo" 将在下面添加
-            }
 
-        # 遍历每条边，为源节点添加关联信息
-        for source, target, data in self.graph.edges(data=True):
-            # 创建关系对象，包含目标节点 id 和关系类型信息
-            relation = {
-                "@id": target,
-                "relation_type": data.get("relation_type", "")
-            }
-            # 如果源节点已有 relatedTo 属性，则追加
-            if "relatedTo" in nodes_ld[source]:
-                nodes_ld[source]["relatedTo"].append(relation)
+    def write_checkpoint(self, snapshot, fmt=None):
+        """
+        把 snapshot_view() 得到的视图写入检查点并压缩变更日志（可在工作线程调用）
+        若已有更新版本写入，则跳过这个过期的视图
+        :param fmt: "json" 或 "binary"，默认取当前的检查点格式；
+                    只有写入检查点格式时才会压缩变更日志
+        :return: 是否实际写入
+        """
+        primary = "binary" if self.binary_path is not None else "json"
+        fmt = fmt or primary
+        mark = snapshot["journal_mark"]
+        with self._save_lock:
+            if fmt == primary and snapshot["version"] < self._persisted_version:
+                return False
+
+            if fmt == "binary":
+                write_binary_graph(self.binary_path, snapshot["nodes"], snapshot["edges"],
+                                   journal_seq=mark[0] if mark is not None else 0)
             else:
-                nodes_ld[source]["relatedTo"] = [relation]
+                self._write_json_checkpoint(snapshot)
+
+            if fmt == primary:
+                if mark is not None:
+                    self.journal.discard_through(mark)
+                self._persisted_version = snapshot["version"]
+            return True
+
+    def _write_json_checkpoint(self, snapshot):
+        """把视图流式写成 JSON 检查点"""
+        fields = [
+            ("nodes", _node_dicts(snapshot["nodes"])),
+            ("edges", _edge_dicts(snapshot["edges"])),
+        ]
+        mark = snapshot["journal_mark"]
+        if mark is not None:
+            fields.append(("journal_seq", mark[0]))
+
+        atomic_write(self.json_path, lambda f: write_json_stream(f, fields, indent=self.json_indent))
+
+    def export_json(self, filepath, indent=4):
+        """
+        把当前图数据流式导出为 JSON 文件（节点和关系逐个序列化，不构造完整的数据字典）
+        :param indent: 缩进；None 为紧凑格式
+        """
+        fields = [
+            ("nodes", _node_dicts(self.graph.nodes(data=True))),
+            ("edges", _edge_dicts(self.graph.edges(data=True))),
+        ]
+        with open(filepath, 'w', encoding='utf-8') as f:
+            write_json_stream(f, fields, indent=indent)
+
+    def save_graph_to_json(self):
+        """将当前图数据保存到 JSON 文件（同时写入检查点）"""
+        # 调用方可能直接修改过 self.graph，视为产生了新版本
+        self._current_version += 1
+        self._save_snapshot(self._live_view())
+
+    def _save_snapshot(self, snapshot):
+        if self.binary_path is not None:
+            # 先导出 JSON 再写二进制检查点，保证二进制文件不比 JSON 旧
+            self.write_checkpoint(snapshot, fmt="json")
+        self.write_checkpoint(snapshot)
 
-        # 组合所有节点为 @graph 的数组
-        jsonld_data = {
-            "@context": context,
-            "@graph": list(nodes_ld.values())
+    def graph_to_jsonld(self):
+        """将当前图数据转换为 JSON-LD 格式数据（构造完整文档；写文件请用 save_graph_to_jsonld）"""
+        return {
+            "@context": self.JSONLD_CONTEXT,
+            "@graph": list(iter_jsonld_nodes(self.graph))
         }
-        return jsonld_data
 
-    def save_graph_to_jsonld(self, filepath=None):
-        """将当前图数据保存为 JSON-LD 格式文件"""
+    def save_graph_to_jsonld(self, filepath=None, indent=4, ndjson=None):
+        """
+        将当前图数据流式保存为 JSON-LD 格式文件
+        :param ndjson: 是否每行输出一个节点文档（NDJSON-LD），默认按扩展名判断
+        """
         if filepath is None:
             filepath = "graph_data.jsonld"
-        jsonld_data = self.graph_to_jsonld()
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(jsonld_data, f, ensure_ascii=False, indent=4)
+        save_jsonld(self.graph, filepath, indent=indent, ndjson=ndjson)
 
     def add_node(self, name, node_type, attributes):
         """添加或更新节点"""
-        snapshot = self._create_snapshot()
-        self.undo_stack.append(snapshot)
+        delta = self._begin_change()
+        self._touch_node(delta, name)
         
         if self.graph.has_node(name):
-            self.graph.nodes[name]['type'] = node_type
+            self.graph.nodes[name]['type'] = self.node_types(node_type)
             self.graph.nodes[name]['attributes'] = attributes
             print(f"更新节点: {name}")
         else:
-            self.graph.add_node(name, type=node_type, attributes=attributes)
+            self.graph.add_node(name, **self._node_data(node_type, attributes))
             print(f"添加节点: {name}")
             
-        self.redo_stack.clear()
-        self.save_graph_to_json()
+        self._commit_change(delta)
+
+    def add_nodes_from(self, nodes):
+        """
+        批量添加或更新节点：一次性记录撤销状态，再用 graph.add_nodes_from 整体插入
+        与逐个调用 add_node 效果相同，但只产生一次提交（一个撤销步骤、一次持久化）
+        :param nodes: (name, node_type, attributes) 或 (name, node_type, attributes, resources) 元组的可迭代对象；
+                      resources 为空时保留已有节点的资源
+        :return: 处理的节点数（重复的名称只计一次）
+        """
+        graph = self.graph
+        node_data = self._node_data
+        items = [(name, node_data(*fields)) for name, *fields in nodes]
+        if not items:
+            return 0
+
+        delta = self._begin_change()
+        touched = delta.nodes
+        names = dict.fromkeys(name for name, _ in items)
+        for name in names:
+            if name not in touched:
+                touched[name] = copy.deepcopy(dict(graph.nodes[name])) if name in graph else None
+
+        with gc_paused():
+            graph.add_nodes_from(items)
+        print(f"批量添加节点: {len(names)} 个")
+        self._commit_change(delta)
+        return len(names)
+
+    def add_relationships_from(self, relationships):
+        """
+        批量添加关系：端点不存在的关系被跳过，其余用 graph.add_edges_from 整体插入
+        :param relationships: (source, target, relation_type) 或 (source, target, relation_type, resources)
+                              元组的可迭代对象；resources 为空时保留已有关系的资源
+        :return: 添加的关系数
+        """
+        graph = self.graph
+        nodes = set(graph)
+        interned = {}  # 关系类型 -> 驻留后的字符串，避免每条关系都查一次词表
+        items = []
+        skipped = 0
+        for source, target, relation_type, *resources in relationships:
+            if source in nodes and target in nodes:
+                canonical = interned.get(relation_type)
+                if canonical is None:
+                    canonical = interned[relation_type] = self.relation_types(relation_type)
+                data = {"relation_type": canonical}
+                if resources and resources[0]:
+                    data["resources"] = resources[0]
+                items.append((source, target, data))
+            else:
+                skipped += 1
+        if skipped:
+            print(f"{skipped} 条关系的端点不存在，已跳过")
+        if not items:
+            return 0
+
+        delta = self._begin_change()
+        touched = delta.edges
+        adjacency = dict(graph.adjacency())
+        for source, target, _ in items:
+            if (source, target) not in touched:
+                before = adjacency[source].get(target)
+                touched[(source, target)] = copy.deepcopy(dict(before)) if before is not None else None
+
+        with gc_paused():
+            graph.add_edges_from(items)
+        print(f"批量添加关系: {len(items)} 条")
+        self._commit_change(delta)
+        return len(items)
+
+    def merge_graph(self, data, policy=MERGE_OVERWRITE):
+        """
+        把另一份图数据批量合并进当前图（单个提交：一个撤销步骤、一次持久化）
+        先写入全部节点再写入全部边，边可以引用文件中后出现的节点；节点和边的 resources 一并保留
+        :param data: 与 JSON 图文件结构相同的 {"nodes": [...], "edges": [...]}
+        :param policy: 节点或边已存在时的处理方式，见 MERGE_POLICIES
+        :return: (写入的节点数, 写入的关系数)
+        """
+        if policy not in MERGE_POLICIES:
+            raise ValueError(f"未知的合并策略: {policy}")
+        graph = self.graph
+        graph_nodes = graph.nodes
+
+        node_items = {}
+        for node in data.get("nodes", ()):
+            name = node["name"]
+            incoming = self._node_data(node["type"], node.get("attributes", {}), node.get("resources"))
+            current = node_items.get(name)
+            if current is None and name in graph:
+                current = graph_nodes[name]
+            if current is not None:
+                incoming = _resolve_conflict(current, incoming, policy)
+                if incoming is None:
+                    continue
+            node_items[name] = incoming
+
+        nodes = set(graph).union(node_items)
+        adjacency = dict(graph.adjacency())
+        edge_items = {}
+        skipped = 0
+        for edge in data.get("edges", ()):
+            source, target = edge["source"], edge["target"]
+            if source not in nodes or target not in nodes:
+                skipped += 1
+                continue
+            key = (source, target)
+            incoming = self._edge_data(edge["relation_type"], edge.get("resources"))
+            current = edge_items.get(key)
+            if current is None and source in adjacency:
+                current = adjacency[source].get(target)
+            if current is not None:
+                incoming = _resolve_conflict(current, incoming, policy)
+                if incoming is None:
+                    continue
+            edge_items[key] = incoming
+        if skipped:
+            print(f"{skipped} 条关系的端点不存在，已跳过")
+        if not node_items and not edge_items:
+            return 0, 0
+
+        # 合并只整体替换属性字典、不原地修改其中的 attributes/resources，修改前状态浅复制即可
+        delta = self._begin_change()
+        for name in node_items:
+            if name not in delta.nodes:
+                delta.nodes[name] = dict(graph_nodes[name]) if name in graph else None
+        for source, target in edge_items:
+            if (source, target) not in delta.edges:
+                before = adjacency[source].get(target) if source in adjacency else None
+                delta.edges[(source, target)] = dict(before) if before is not None else None
+
+        with gc_paused():
+            # add_nodes_from / add_edges_from 只会更新已有的属性字典，先清空使其整体替换为合并结果
+            for name in node_items:
+                if name in graph:
+                    graph_nodes[name].clear()
+            for source, target in edge_items:
+                if source in adjacency and target in adjacency[source]:
+                    adjacency[source][target].clear()
+            graph.add_nodes_from(node_items.items())
+            graph.add_edges_from((source, target, item) for (source, target), item in edge_items.items())
+        print(f"合并图数据: 节点 {len(node_items)} 个，关系 {len(edge_items)} 条（策略: {policy}）")
+        self._commit_change(delta)
+        return len(node_items), len(edge_items)
 
     def delete_node(self, name):
         """删除指定节点及其所有连接"""
@@ -148,16 +844,14 @@ class GraphDataManager:
             print(f"节点 '{name}' 不存在，无法删除")
             return False
             
-        snapshot = self._create_snapshot()
-        self.undo_stack.append(snapshot)
-        
-        # 删除节点会自动删除所有相关的边
-        connected_edges = list(self.graph.in_edges(name)) + list(self.graph.out_edges(name))
-        print(f"删除节点 '{name}' 及其 {len(connected_edges)} 条连接")
+        delta = self._begin_change()
+        self._touch_node(delta, name)
+        # 删除节点会自动删除所有相关的边，撤销时需要一并恢复
+        self._touch_incident_edges(delta, name)
+        print(f"删除节点 '{name}' 及其 {len(delta.edges)} 条连接")
         
         self.graph.remove_node(name)
-        self.redo_stack.clear()
-        self.save_graph_to_json()
+        self._commit_change(delta)
         return True
 
     def add_relationship(self, source, target, relation_type):
@@ -169,14 +863,13 @@ class GraphDataManager:
             print(f"目标节点 '{target}' 不存在")
             return False
             
-        snapshot = self._create_snapshot()
-        self.undo_stack.append(snapshot)
+        delta = self._begin_change()
+        self._touch_edge(delta, source, target)
         
-        self.graph.add_edge(source, target, relation_type=relation_type)
+        self.graph.add_edge(source, target, relation_type=self.relation_types(relation_type))
         print(f"添加关系: {source} -> {target} ({relation_type})")
         
-        self.redo_stack.clear()
-        self.save_graph_to_json()
+        self._commit_change(delta)
         return True
 
     def delete_relationship(self, source, target):
@@ -185,15 +878,14 @@ class GraphDataManager:
             print(f"关系 '{source}' -> '{target}' 不存在，无法删除")
             return False
             
-        snapshot = self._create_snapshot()
-        self.undo_stack.append(snapshot)
+        delta = self._begin_change()
+        self._touch_edge(delta, source, target)
         
         relation_type = self.graph[source][target].get('relation_type', '')
         self.graph.remove_edge(source, target)
         print(f"删除关系: {source} -> {target} ({relation_type})")
         
-        self.redo_stack.clear()
-        self.save_graph_to_json()
+        self._commit_change(delta)
         return True
 
     def edit_node(self, name, new_type, new_attributes):
@@ -202,15 +894,14 @@ class GraphDataManager:
             print(f"节点 '{name}' 不存在，无法编辑")
             return False
             
-        snapshot = self._create_snapshot()
-        self.undo_stack.append(snapshot)
+        delta = self._begin_change()
+        self._touch_node(delta, name)
         
-        self.graph.nodes[name]['type'] = new_type
+        self.graph.nodes[name]['type'] = self.node_types(new_type)
         self.graph.nodes[name]['attributes'] = new_attributes
         print(f"编辑节点: {name}")
         
-        self.redo_stack.clear()
-        self.save_graph_to_json()
+        self._commit_change(delta)
         return True
 
     def edit_relationship(self, source, target, new_relation_type):
@@ -219,52 +910,121 @@ class GraphDataManager:
             print(f"关系 '{source}' -> '{target}' 不存在，无法编辑")
             return False
             
-        snapshot = self._create_snapshot()
-        self.undo_stack.append(snapshot)
+        delta = self._begin_change()
+        self._touch_edge(delta, source, target)
         
-        self.graph.edges[source, target]['relation_type'] = new_relation_type
+        self.graph.edges[source, target]['relation_type'] = self.relation_types(new_relation_type)
         print(f"编辑关系: {source} -> {target} ({new_relation_type})")
         
-        self.redo_stack.clear()
-        self.save_graph_to_json()
+        self._commit_change(delta)
         return True
 
     def batch_edit_relationships(self, updates):
         """批量编辑关系"""
-        snapshot = self._create_snapshot()
-        self.undo_stack.append(snapshot)
+        delta = self._begin_change()
 
         for (source, target), new_data in updates.items():
             if self.graph.has_edge(source, target):
-                self.graph[source][target].update(new_data)
+                self._touch_edge(delta, source, target)
+                self.graph[source][target].update(self._intern_data(dict(new_data)))
                 print(f"批量编辑关系: {source} -> {target}")
             else:
                 print(f"关系 {source} -> {target} 不存在")
 
-        self.redo_stack.clear()
-        self.save_graph_to_json()
+        self._commit_change(delta)
+
+    def _get_views(self):
+        """返回与当前版本一致的读视图，过期时整体重建"""
+        views = self._views
+        if views is None or views.version != self._current_version:
+            nodes = {node["name"]: node for node in _node_dicts(self.graph.nodes(data=True))}
+            edges = {(edge["source"], edge["target"]): edge
+                     for edge in _edge_dicts(self.graph.edges(data=True))}
+            views = self._views = _GraphViews(self._current_version, nodes, edges)
+        return views
+
+    def _patch_read_caches(self, delta):
+        """
+        提交修改后按 delta 涉及的节点和边增量更新读视图和二级索引（在版本号递增之后调用）
+        缓存不是紧邻的上一版本时（例如调用方直接修改过 self.graph）不做修补，下次读取时重建
+        """
+        if self._is_large_change(delta):
+            return  # 逐项修补不比重建快
+        index = self._index
+        if index is not None and index.version == self._current_version - 1:
+            index.patch(self.graph, delta.nodes, delta.edges, self._current_version)
+
+        views = self._views
+        if views is None or views.version != self._current_version - 1:
+            return
+        for name in delta.nodes:
+            if self.graph.has_node(name):
+                views.nodes[name] = next(_node_dicts([(name, self.graph.nodes[name])]))
+            else:
+                views.nodes.pop(name, None)
+        for source, target in delta.edges:
+            if self.graph.has_edge(source, target):
+                views.edges[(source, target)] = next(
+                    _edge_dicts([(source, target, self.graph[source][target])]))
+            else:
+                views.edges.pop((source, target), None)
+        views.version = self._current_version
+        views.node_list = None
+        views.edge_list = None
+
+    @property
+    def index(self):
+        """与当前版本一致的二级索引（只读），过期时整体重建"""
+        if self._index is None or self._index.version != self._current_version:
+            self._index = GraphIndex.build(self.graph, self._current_version)
+        return self._index
+
+    def get_node_names_by_type(self, node_type):
+        """按类型查询节点名（走类型索引）"""
+        return list(self.index.nodes_by_type.get(node_type, ()))
+
+    def get_nodes_by_type(self, node_type):
+        """按类型查询节点数据"""
+        nodes = self._get_views().nodes
+        return [nodes[name] for name in self.index.nodes_by_type.get(node_type, ())]
+
+    def get_relationships_by_type(self, relation_type):
+        """按关系类型查询关系数据（走关系类型索引）"""
+        edges = self._get_views().edges
+        return [edges[key] for key in self.index.edges_by_relation.get(relation_type, ())]
+
+    def get_nodes_with_attribute(self, key):
+        """查询具有指定属性键的节点名（走属性键索引）"""
+        return list(self.index.nodes_by_attribute.get(key, ()))
+
+    def get_type_statistics(self):
+        """返回 {节点类型: {"count": 节点数, "degree": 度数之和}}"""
+        index = self.index
+        return {
+            node_type: {"count": len(names), "degree": index.type_degree.get(node_type, 0)}
+            for node_type, names in index.nodes_by_type.items()
+        }
+
+    def get_relation_type_counts(self):
+        """返回 {关系类型: 关系数}"""
+        return {relation_type: len(keys) for relation_type, keys in self.index.edges_by_relation.items()}
 
     def get_all_nodes(self):
-        """返回所有节点数据"""
-        return [
-            {
-                "name": node,
-                "type": data["type"],
-                "attributes": data.get("attributes", {}),
-                "resources": data.get("resources", [])
-            } for node, data in self.graph.nodes(data=True)
-        ]
+        """
+        返回所有节点数据
+        结果按图的版本缓存，两次修改之间的重复调用直接返回同一个列表，调用方不应修改它
+        """
+        views = self._get_views()
+        if views.node_list is None:
+            views.node_list = list(views.nodes.values())
+        return views.node_list
 
     def get_all_relationships(self):
-        """返回所有关系数据"""
-        return [
-            {
-                "source": u,
-                "target": v,
-                "relation_type": data["relation_type"],
-                "resources": data.get("resources", [])
-            } for u, v, data in self.graph.edges(data=True)
-        ]
+        """返回所有关系数据（与 get_all_nodes 相同，按版本缓存）"""
+        views = self._get_views()
+        if views.edge_list is None:
+            views.edge_list = list(views.edges.values())
+        return views.edge_list
 
     def get_graph_data(self):
         """返回完整的图数据"""
@@ -276,12 +1036,13 @@ class GraphDataManager:
     def undo(self):
         """撤销上一步操作"""
         if len(self.undo_stack) > 0:
-            current_snapshot = self._create_snapshot()
-            self.redo_stack.append(current_snapshot)
-            
-            snapshot = self.undo_stack.pop()
-            self._apply_snapshot(snapshot)
-            self.save_graph_to_json()
+            delta = self.undo_stack.pop()
+            inverse = self._apply_delta(delta)
+            self.redo_stack.append(inverse)
+            self._current_version += 1
+            self._patch_read_caches(inverse)
+            self._persist(inverse)
+            self._notify_changed(inverse)
             print("撤销操作成功")
             return True
         else:
@@ -291,12 +1052,13 @@ class GraphDataManager:
     def redo(self):
         """重做撤销的操作"""
         if len(self.redo_stack) > 0:
-            current_snapshot = self._create_snapshot()
-            self.undo_stack.append(current_snapshot)
-            
-            snapshot = self.redo_stack.pop()
-            self._apply_snapshot(snapshot)
-            self.save_graph_to_json()
+            delta = self.redo_stack.pop()
+            inverse = self._apply_delta(delta)
+            self.undo_stack.append(inverse)
+            self._current_version += 1
+            self._patch_read_caches(inverse)
+            self._persist(inverse)
+            self._notify_changed(inverse)
             print("重做操作成功")
             return True
         else:
@@ -309,36 +1071,80 @@ class GraphDataManager:
             return self.standardizer.standardize(input_name)
         return input_name
 
-    def batch_update_nodes(self, old_name, new_name):
-        """批量更新节点名称（用于自动标准化）"""
-        if not self.graph.has_node(old_name):
+    def rename_node(self, old_name, new_name, merge=False):
+        """
+        重命名节点，只改写该节点及其入边、出边，代价与节点度数成正比
+        整个重命名是一次修改：一个撤销步骤、一次持久化、一个重命名事件。
+        :param merge: 新名称已存在时是否把旧节点合并进去（旧节点的数据和边覆盖同名项），
+                      为 False 时不做修改并返回 False
+        """
+        graph = self.graph
+        if not graph.has_node(old_name):
+            print(f"节点 '{old_name}' 不存在，无法重命名")
             return False
-            
-        data = self.graph.nodes[old_name]
-        self.graph.add_node(new_name, **data)
-        
-        # 更新所有指向old_name的边
-        for predecessor in list(self.graph.predecessors(old_name)):
-            edge_data = self.graph[predecessor][old_name]
-            self.graph.add_edge(predecessor, new_name, **edge_data)
-            
-        # 更新所有从old_name出发的边
-        for successor in list(self.graph.successors(old_name)):
-            edge_data = self.graph[old_name][successor]
-            self.graph.add_edge(new_name, successor, **edge_data)
-            
-        # 删除旧节点
-        self.graph.remove_node(old_name)
-        self.save_graph_to_json()
+        if old_name == new_name:
+            return True
+        target_exists = graph.has_node(new_name)
+        if target_exists and not merge:
+            print(f"节点 '{new_name}' 已存在，无法重命名")
+            return False
+
+        def relabel(name):
+            return new_name if name == old_name else name
+
+        in_edges = list(graph.pred[old_name].items())
+        out_edges = list(graph.succ[old_name].items())
+
+        delta = self._begin_change()
+        self._touch_node(delta, old_name)
+        self._touch_node(delta, new_name)
+        for predecessor, _ in in_edges:
+            self._touch_edge(delta, predecessor, old_name)
+            self._touch_edge(delta, relabel(predecessor), new_name)
+        for successor, _ in out_edges:
+            self._touch_edge(delta, old_name, successor)
+            self._touch_edge(delta, new_name, relabel(successor))
+        if not target_exists:
+            delta.add_rename(old_name, new_name)
+
+        graph.add_node(new_name, **graph.nodes[old_name])
+        for predecessor, edge_data in in_edges:
+            graph.add_edge(relabel(predecessor), new_name, **edge_data)
+        for successor, edge_data in out_edges:
+            graph.add_edge(new_name, relabel(successor), **edge_data)
+        graph.remove_node(old_name)
+        print(f"重命名节点: {old_name} -> {new_name}")
+
+        self._commit_change(delta)
         return True
 
+    def rename_nodes(self, mapping, merge=False):
+        """
+        批量重命名节点，全部重命名在一个事务中完成
+        :param mapping: 原名称 -> 新名称
+        :return: 实际重命名的节点数
+        """
+        renamed = 0
+        with self.transaction():
+            for old_name, new_name in mapping.items():
+                if old_name != new_name and self.rename_node(old_name, new_name, merge=merge):
+                    renamed += 1
+        return renamed
+
+    def batch_update_nodes(self, old_name, new_name):
+        """批量更新节点名称（用于自动标准化），新名称已存在时合并到该节点"""
+        return self.rename_node(old_name, new_name, merge=True)
+
     def auto_standardize(self):
         """自动标准化所有节点名称"""
         if hasattr(self, 'standardizer'):
-            for node in list(self.graph.nodes()):
+            mapping = {}
+            for node in self.graph.nodes():
                 standardized = self.standardizer.standardize(node)
                 if standardized and standardized != node:
-                    self.batch_update_nodes(node, standardized)
+                    mapping[node] = standardized
+            return self.rename_nodes(mapping, merge=True)
+        return 0
 
     def has_node(self, node_name):
         """检查节点是否存在"""
@@ -371,10 +1177,12 @@ class GraphDataManager:
 
     def clear_graph(self):
         """清空整个图"""
-        snapshot = self._create_snapshot()
-        self.undo_stack.append(snapshot)
+        delta = self._begin_change()
+        for name in self.graph.nodes:
+            self._touch_node(delta, name)
+        for u, v in self.graph.edges:
+            self._touch_edge(delta, u, v)
         
         self.graph.clear()
-        self.redo_stack.clear()
-        self.save_graph_to_json()
+        self._commit_change(delta, records=[{"op": "clear"}])
         print("图已清空")
\ No newline at end of file
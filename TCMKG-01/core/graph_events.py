@@ -0,0 +1,33 @@
+# core/graph_events.py
+"""GraphDataManager 发出的细粒度变更事件"""
+
+NODE_ADDED = "node_added"
+NODE_REMOVED = "node_removed"
+NODE_UPDATED = "node_updated"
+NODE_RENAMED = "node_renamed"
+EDGE_ADDED = "edge_added"
+EDGE_REMOVED = "edge_removed"
+EDGE_UPDATED = "edge_updated"
+BATCH_COMMITTED = "batch_committed"  # 一次提交（单个修改、事务、撤销或重做）的事件已全部发出
+GRAPH_RESET = "graph_reset"  # 图被整体重新加载或被直接修改，订阅者需要完整刷新
+
+
+class GraphEvent:
+    """
+    一条变更事件
+    key: 节点名，或边的 (source, target)
+    data: 节点/边当前的属性字典（只读）；删除事件中为删除前的属性
+    old_key: 重命名事件中的原节点名
+    """
+    __slots__ = ("kind", "key", "data", "old_key")
+
+    def __init__(self, kind, key=None, data=None, old_key=None):
+        self.kind = kind
+        self.key = key
+        self.data = data
+        self.old_key = old_key
+
+    def __repr__(self):
+        if self.kind == NODE_RENAMED:
+            return f"GraphEvent({self.kind}, {self.old_key!r} -> {self.key!r})"
+        return f"GraphEvent({self.kind}, {self.key!r})"
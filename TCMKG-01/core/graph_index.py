@@ -0,0 +1,93 @@
+# core/graph_index.py
+from collections import defaultdict
+
+
+class GraphIndex:
+    """
+    图的二级索引：类型 -> 节点、关系类型 -> 边、属性键 -> 节点，以及按类型汇总的度数
+    各索引的值是按插入顺序排列的 dict（当作有序集合使用），按类型筛选只需访问对应的桶。
+
+    索引对应图的某个版本（version）。GraphDataManager 在每次提交后用 delta 涉及的
+    节点和边增量更新索引；版本不连续时（图被直接修改过）整体重建。
+    """
+
+    def __init__(self, version=0):
+        self.version = version
+        self.nodes_by_type = defaultdict(dict)  # 类型 -> {节点名: None}
+        self.edges_by_relation = defaultdict(dict)  # 关系类型 -> {(source, target): None}
+        self.nodes_by_attribute = defaultdict(dict)  # 属性键 -> {节点名: None}
+        self.type_degree = defaultdict(int)  # 类型 -> 该类型所有节点的度数之和
+        self._node_info = {}  # 节点名 -> (类型, 度数, 属性键元组)，用于撤销该节点在索引中的贡献
+        self._edge_relation = {}  # (source, target) -> 关系类型
+
+    @classmethod
+    def build(cls, graph, version=0):
+        """从图完整构建索引"""
+        index = cls(version)
+        for name, data in graph.nodes(data=True):
+            index._add_node(name, data, graph.degree(name))
+        for source, target, data in graph.edges(data=True):
+            index._add_edge(source, target, data)
+        return index
+
+    def _add_node(self, name, data, degree):
+        node_type = data.get("type", "")
+        attributes = data.get("attributes")
+        keys = tuple(attributes) if isinstance(attributes, dict) else ()
+        self.nodes_by_type[node_type][name] = None
+        for key in keys:
+            self.nodes_by_attribute[key][name] = None
+        self.type_degree[node_type] += degree
+        self._node_info[name] = (node_type, degree, keys)
+
+    def _remove_node(self, name):
+        info = self._node_info.pop(name, None)
+        if info is None:
+            return
+        node_type, degree, keys = info
+        self._discard(self.nodes_by_type, node_type, name)
+        for key in keys:
+            self._discard(self.nodes_by_attribute, key, name)
+        self.type_degree[node_type] -= degree
+        if not self.type_degree[node_type] and node_type not in self.nodes_by_type:
+            del self.type_degree[node_type]
+
+    def _add_edge(self, source, target, data):
+        relation_type = data.get("relation_type", "")
+        self.edges_by_relation[relation_type][(source, target)] = None
+        self._edge_relation[(source, target)] = relation_type
+
+    def _remove_edge(self, source, target):
+        relation_type = self._edge_relation.pop((source, target), None)
+        if relation_type is not None:
+            self._discard(self.edges_by_relation, relation_type, (source, target))
+
+    @staticmethod
+    def _discard(buckets, key, member):
+        bucket = buckets.get(key)
+        if bucket is not None:
+            bucket.pop(member, None)
+            if not bucket:
+                del buckets[key]
+
+    def patch(self, graph, node_names, edge_keys, version):
+        """
+        按本次修改涉及的节点和边更新索引
+        :param node_names: 修改过的节点名
+        :param edge_keys: 修改过的边 (source, target)
+        """
+        for source, target in edge_keys:
+            self._remove_edge(source, target)
+            if graph.has_edge(source, target):
+                self._add_edge(source, target, graph[source][target])
+
+        # 边的增删会改变端点的度数，因此端点也要重新计入
+        affected = set(node_names)
+        for source, target in edge_keys:
+            affected.add(source)
+            affected.add(target)
+        for name in affected:
+            self._remove_node(name)
+            if graph.has_node(name):
+                self._add_node(name, graph.nodes[name], graph.degree(name))
+        self.version = version
@@ -0,0 +1,215 @@
+# core/graph_io.py
+import codecs
+import contextlib
+import gc
+import itertools
+import json
+import os
+import re
+import shutil
+import tempfile
+
+
+@contextlib.contextmanager
+def gc_paused():
+    """批量创建大量容器对象（加载整张图）期间暂停循环垃圾回收，避免反复全量扫描"""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def atomic_write(path, write_func, encoding='utf-8', binary=False):
+    """
+    通过“临时文件 + 重命名”写文件，目标文件要么是旧内容，要么是完整的新内容
+    :param path: 目标文件路径
+    :param write_func: 接收已打开的文件对象并写入内容的函数
+    :param binary: 以二进制模式打开临时文件
+    """
+    path = os.path.abspath(path)
+    directory, basename = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=basename + '.', suffix='.tmp')
+    try:
+        if binary:
+            f = os.fdopen(fd, 'wb')
+        else:
+            f = os.fdopen(fd, 'w', encoding=encoding, newline='')
+        with f:
+            write_func(f)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class _JsonStream:
+    """
+    按块读取 UTF-8 JSON 文本的游标，配合 JSONDecoder.raw_decode 逐个解码值
+    缓冲区只保留尚未消费的部分，因此内存占用与单个元素大小相当，而与文件大小无关
+    """
+
+    def __init__(self, f, chunk_size, progress_callback=None, total_bytes=0):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.progress_callback = progress_callback
+        self.total_bytes = total_bytes
+        self.bytes_read = 0
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        """再读入一块数据，到达文件末尾时返回 False"""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        self.bytes_read += len(chunk)
+        if not chunk:
+            self.eof = True
+            self.buffer = self.buffer[self.pos:] + self.text_decoder.decode(b'', final=True)
+        else:
+            self.buffer = self.buffer[self.pos:] + self.text_decoder.decode(chunk)
+        self.pos = 0
+        if self.progress_callback is not None and chunk:
+            self.progress_callback(self.bytes_read, self.total_bytes)
+        return True
+
+    def _error(self, message):
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def peek(self):
+        """跳过空白并返回下一个字符（文件结束时返回空串）"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise self._error(f"期望 {char!r}")
+        self.pos += 1
+
+    def value(self):
+        """解码下一个完整的 JSON 值"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # 数字等值可能恰好在块边界处被截断，必须看到其后的字符才能确认完整
+            if end < len(self.buffer) or self.eof:
+                self.pos = end
+                return value
+            self._fill()
+
+    def items(self):
+        """逐个解码数组元素（当前位置须为 "["）"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            char = self.peek()
+            self.pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise self._error("数组元素之间缺少逗号")
+
+
+def iter_json_graph(path, progress_callback=None, chunk_size=1 << 20):
+    """
+    流式读取图 JSON 文件，不把整个文件解析成一个大字典
+    依次产生 (key, value)：key 为 "nodes" 或 "edges" 时 value 是数组中的单个元素，
+    其它顶层字段（如 journal_seq）则产生整个值
+    :param progress_callback: 每读入一块调用 callback(已读字节数, 文件总字节数)
+    :param chunk_size: 每次读取的字节数
+    """
+    total_bytes = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        stream = _JsonStream(f, chunk_size, progress_callback, total_bytes)
+        if stream.peek() == '\ufeff':  # 跳过 BOM
+            stream.pos += 1
+        stream.expect('{')
+        if stream.peek() == '}':
+            return
+        while True:
+            key = stream.value()
+            if not isinstance(key, str):
+                raise stream._error("对象的键必须是字符串")
+            stream.expect(':')
+            if key in ("nodes", "edges") and stream.peek() == '[':
+                for item in stream.items():
+                    yield key, item
+            else:
+                yield key, stream.value()
+            char = stream.peek()
+            stream.pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                raise stream._error("对象成员之间缺少逗号")
+
+
+def write_json_stream(f, fields, indent=None, batch_size=1024):
+    """
+    流式写出一个 JSON 对象，数组字段按批序列化，不在内存中构造完整文档
+    :param f: 以文本模式打开的文件
+    :param fields: 可迭代的 (key, value)；value 为迭代器/生成器时作为数组分批写出，
+                   其它值整体序列化
+    :param indent: None 为紧凑格式（生产保存）；为整数时输出与 json.dump(indent=...) 相同的排版
+    :param batch_size: 每批序列化并写入的元素个数
+    """
+    if indent is None:
+        encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+        key_sep, newline, pad = ':', '', ''
+    else:
+        encoder = json.JSONEncoder(ensure_ascii=False, indent=indent).encode
+        key_sep, newline, pad = ': ', '\n', ' ' * indent
+    closing = newline + pad + ']'
+
+    def encode(value):
+        text = encoder(value)
+        return text.replace('\n', '\n' + pad) if indent is not None else text
+
+    f.write('{')
+    first_field = True
+    for key, value in fields:
+        f.write(('' if first_field else ',') + newline + pad + encoder(key) + key_sep)
+        first_field = False
+        if not hasattr(value, '__next__'):
+            f.write(encode(value))
+            continue
+
+        # 整批编码成一个数组再去掉外层括号，比逐个元素调用编码器快得多
+        empty = True
+        while True:
+            batch = list(itertools.islice(value, batch_size))
+            if not batch:
+                break
+            text = encode(batch)
+            f.write(('[' if empty else ',') + text[1:len(text) - len(closing)])
+            empty = False
+        f.write('[]' if empty else closing)
+    f.write('}' if first_field else newline + '}')
@@ -0,0 +1,131 @@
+# core/graph_journal.py
+import json
+import os
+import threading
+from pathlib import Path
+
+
+class GraphJournal:
+    """
+    追加式变更日志（write-ahead journal）
+
+    每次图变更以一行紧凑 JSON 记录追加到日志文件，记录带有单调递增的 seq。
+    检查点（完整图文件）中保存写入时的 journal_seq，加载时只重放 seq 更大的记录，
+    因此“检查点已写入但日志尚未截断”时崩溃也不会重复应用旧记录。
+    日志末尾因崩溃而写了一半的行会在重放时被丢弃并截断。
+    """
+
+    def __init__(self, path, fsync: bool = False):
+        """
+        :param path: 日志文件路径
+        :param fsync: 每次追加后是否调用 os.fsync（断电安全，但更慢）
+        """
+        self.path = Path(path)
+        self.fsync = fsync
+        self.last_seq = 0  # 已分配的最大序号
+        self.pending = 0  # 上次检查点之后追加的记录数
+        self._file = None
+        self._lock = threading.Lock()  # 后台检查点压缩日志时与追加互斥
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.path, 'ab')
+        return self._file
+
+    def replay(self, after_seq: int = 0):
+        """
+        依次返回 seq 大于 after_seq 的日志记录
+        遇到无法解析的行（崩溃时的残缺写入）即停止，并把文件截断到最后一条完整记录
+        """
+        self.last_seq = max(self.last_seq, after_seq)
+        if not self.path.exists():
+            return
+
+        good_offset = 0
+        torn = False
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    torn = True
+                    break
+                try:
+                    record = json.loads(line)
+                    seq = int(record["seq"])
+                except (ValueError, KeyError, TypeError):
+                    torn = True
+                    break
+                good_offset += len(line)
+                self.last_seq = max(self.last_seq, seq)
+                if seq > after_seq:
+                    self.pending += 1
+                    yield record
+
+        if torn:
+            print(f"日志 '{self.path}' 末尾存在不完整记录，已截断到 {good_offset} 字节")
+            with open(self.path, 'r+b') as f:
+                f.truncate(good_offset)
+
+    def append(self, record: dict) -> int:
+        """追加一条记录，返回分配的序号"""
+        return self.append_many([record])
+
+    def append_many(self, records) -> int:
+        """一次性追加多条记录（单次写入），返回最后一条的序号"""
+        lines = []
+        for record in records:
+            self.last_seq += 1
+            entry = {"seq": self.last_seq}
+            entry.update(record)
+            lines.append(json.dumps(entry, ensure_ascii=False, separators=(',', ':')))
+        if not lines:
+            return self.last_seq
+
+        with self._lock:
+            f = self._open()
+            f.write(('\n'.join(lines) + '\n').encode('utf-8'))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+            self.pending += len(lines)
+        return self.last_seq
+
+    def mark(self):
+        """返回当前日志位置 (seq, 字节偏移)，与同一时刻的图快照一起交给检查点"""
+        with self._lock:
+            offset = self._file.tell() if self._file is not None else (
+                self.path.stat().st_size if self.path.exists() else 0)
+            return self.last_seq, offset
+
+    def discard_through(self, mark):
+        """
+        检查点写入成功后丢弃 mark 之前的记录（序号继续递增）
+        mark 之后追加的记录会被保留，通常为空，此时直接截断文件
+        """
+        _, offset = mark
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if not self.path.exists():
+                self.pending = 0
+                return
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                tail = f.read()
+            if tail:
+                tmp_path = self.path.with_name(self.path.name + '.tmp')
+                with open(tmp_path, 'wb') as f:
+                    f.write(tail)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            else:
+                with open(self.path, 'r+b') as f:
+                    f.truncate(0)
+            self.pending = tail.count(b'\n')
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,155 @@
+# core/graphml_export.py
+"""
+流式 GraphML 导出：先遍历一次节点确定属性键及其类型，在文件头一次性声明全部 <key>，
+再逐个写出节点和边，不构造 ElementTree。路径以 .gz 结尾时输出 gzip 压缩文件。
+
+节点的 type、resources 以及 attributes 中的每个键各对应一个 GraphML 键，边的 relation_type、
+resources 各对应一个键。属性值为布尔、整数、浮点数时声明为 boolean/long/double，
+字符串和类型混杂的键声明为 string；列表和字典（包括 resources）写成 JSON 字符串。
+"""
+import gzip
+import io
+import json
+import re
+
+from .graph_io import atomic_write
+
+GRAPHML_HEADER = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                  '<graphml xmlns="http://graphml.graphdrawing.org/xmlns" '
+                  'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+                  'xsi:schemaLocation="http://graphml.graphdrawing.org/xmlns '
+                  'http://graphml.graphdrawing.org/xmlns/1.0/graphml.xsd">\n')
+RESERVED_NODE_KEYS = ("type", "resources")
+BATCH_SIZE = 4096  # 每累积这么多个节点或边的文本写一次文件
+
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+# 元素文本的转义表：XML 1.0 不允许出现的控制字符直接删除
+_TEXT_ESCAPES = dict.fromkeys(c for c in range(0x20) if c not in (0x09, 0x0a, 0x0d))
+_TEXT_ESCAPES.update({ord("&"): "&amp;", ord("<"): "&lt;", ord(">"): "&gt;", 0x0d: "&#13;"})  # 保留回车
+# 属性值还要转义引号和空白字符（属性值中的换行会被解析器规范化为空格）
+_ATTRIBUTE_ESCAPES = {**_TEXT_ESCAPES, ord('"'): "&quot;", 0x09: "&#9;", 0x0a: "&#10;", 0x0d: "&#13;"}
+_NEEDS_ESCAPE = re.compile('[&<>"\x00-\x1f]')
+
+
+def _value_type(value):
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        return "long"
+    if isinstance(value, float):
+        return "double"
+    return "string"
+
+
+def _merge_types(current, new):
+    if current is None or current == new:
+        return new
+    if {current, new} == {"long", "double"}:
+        return "double"
+    return "string"
+
+
+def attribute_key_types(graph):
+    """遍历一次节点，按首次出现的顺序收集属性键及其 GraphML 类型（None 值不参与推断）"""
+    types = {}
+    for _, attributes in graph.nodes(data="attributes"):
+        if attributes:
+            for key, value in attributes.items():
+                if value is not None:
+                    types[key] = _merge_types(types.get(key), _value_type(value))
+                elif key not in types:
+                    types[key] = None
+    return {key: value_type or "string" for key, value_type in types.items()}
+
+
+def _escape(text, table):
+    # 绝大多数名称和取值不含需要转义的字符，先用正则判断可以省去 translate 的复制
+    return text.translate(table) if _NEEDS_ESCAPE.search(text) else text
+
+
+def _text(value):
+    """把属性值转为 data 元素的文本"""
+    if isinstance(value, str):
+        return _escape(value, _TEXT_ESCAPES)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return _escape(_ENCODER.encode(value), _TEXT_ESCAPES)
+
+
+def _quote(name):
+    """带引号的 XML 属性值"""
+    return '"' + _escape(str(name), _ATTRIBUTE_ESCAPES) + '"'
+
+
+def _write_graphml(f, graph, key_types):
+    f.write(GRAPHML_HEADER)
+    f.write('<key id="type" for="node" attr.name="type" attr.type="string"/>\n'
+            '<key id="resources" for="node" attr.name="resources" attr.type="string"/>\n'
+            '<key id="relation_type" for="edge" attr.name="relation_type" attr.type="string"/>\n'
+            '<key id="edge_resources" for="edge" attr.name="resources" attr.type="string"/>\n')
+    key_ids = {}
+    for i, (key, value_type) in enumerate(key_types.items()):
+        key_ids[key] = f"a{i}"
+        # 与固定键同名的属性加上前缀，避免 Gephi 等工具中列名冲突
+        name = "attributes." + str(key) if key in RESERVED_NODE_KEYS else str(key)
+        f.write(f'<key id="a{i}" for="node" attr.name={_quote(name)} attr.type="{value_type}"/>\n')
+    f.write('<graph edgedefault="directed">\n')
+
+    parts = []
+    for count, (name, data) in enumerate(graph.nodes(data=True), 1):
+        parts.append(f'<node id={_quote(name)}><data key="type">{_text(data.get("type", ""))}</data>')
+        resources = data.get("resources")
+        if resources:
+            parts.append(f'<data key="resources">{_text(resources)}</data>')
+        attributes = data.get("attributes")
+        if attributes:
+            for key, value in attributes.items():
+                if value is not None:
+                    parts.append(f'<data key="{key_ids[key]}">{_text(value)}</data>')
+        parts.append("</node>\n")
+        if count % BATCH_SIZE == 0:
+            f.write("".join(parts))
+            parts.clear()
+    f.write("".join(parts))
+    parts.clear()
+
+    count = 0
+    for source, neighbours in graph.adjacency():
+        source_id = _quote(source)
+        for target, data in neighbours.items():
+            parts.append(f'<edge source={source_id} target={_quote(target)}>'
+                         f'<data key="relation_type">{_text(data.get("relation_type", ""))}</data>')
+            resources = data.get("resources")
+            if resources:
+                parts.append(f'<data key="edge_resources">{_text(resources)}</data>')
+            parts.append("</edge>\n")
+            count += 1
+            if count % BATCH_SIZE == 0:
+                f.write("".join(parts))
+                parts.clear()
+    f.write("".join(parts))
+    f.write("</graph>\n</graphml>\n")
+
+
+def write_graphml(graph, path, compress=None):
+    """
+    把图流式导出为 GraphML 文件（经临时文件写入，失败时不留下不完整的文件）
+    :param graph: networkx 有向图，节点属性含 type、attributes，边属性含 relation_type
+    :param compress: 是否 gzip 压缩；默认在路径以 .gz 结尾时压缩
+    """
+    if compress is None:
+        compress = path.lower().endswith(".gz")
+    key_types = attribute_key_types(graph)
+
+    def write(raw):
+        stream = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) if compress else raw
+        text = io.TextIOWrapper(stream, encoding="utf-8", newline="\n")
+        _write_graphml(text, graph, key_types)
+        text.flush()
+        text.detach()  # 底层文件由 atomic_write 关闭
+        if compress:
+            stream.close()  # 写出 gzip 尾部，不关闭 raw
+
+    atomic_write(path, write, binary=True)
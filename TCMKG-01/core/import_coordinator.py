@@ -0,0 +1,206 @@
+# core/import_coordinator.py
+import functools
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .arrow_io import read_table_columns, table_format
+from .csv_sniffer import read_csv
+from .data_importer import (
+    CHUNK_SIZE, NODE_COLUMNS, RELATIONSHIP_COLUMNS, DataImporter,
+    parse_node_columns, parse_node_frame, parse_relationship_columns, parse_relationship_frame
+)
+from .graph_data_manager import MERGE_OVERWRITE
+
+
+class ImportFormatError(ValueError):
+    """导入文件的格式不符合要求；key 为界面上对应提示文字的语言键"""
+
+    def __init__(self, key, message):
+        super().__init__(message)
+        self.key = key
+
+    def __reduce__(self):
+        # 异常要从工作进程传回主进程，按构造参数重建
+        return type(self), (self.key, str(self))
+
+
+class ParsedFile:
+    """
+    一个导入文件的解析结果，按列保存以便在进程间传递
+    nodes: (名称列表, 类型列表, 属性字典列表[, 资源列表])，文件中没有节点时为 None
+    relationships: (源节点列表, 目标节点列表, 关系类型列表[, 资源列表])，文件中没有关系时为 None
+    graph: JSON 图文件的 {"nodes": [...], "edges": [...]}，原样交给 merge_graph（保留 resources）
+    """
+    __slots__ = ("filepath", "nodes", "relationships", "graph")
+
+    def __init__(self, filepath, nodes=None, relationships=None, graph=None):
+        self.filepath = filepath
+        self.nodes = nodes
+        self.relationships = relationships
+        self.graph = graph
+
+
+def _parse_columns(columns, filepath, error_key):
+    """按列名判断节点表或关系表并解析（columns 为 {列名: 值列表}）"""
+    if all(column in columns for column in NODE_COLUMNS):
+        return ParsedFile(filepath, nodes=parse_node_columns(columns, filepath))
+    if all(column in columns for column in RELATIONSHIP_COLUMNS):
+        return ParsedFile(filepath, relationships=parse_relationship_columns(columns, filepath))
+    raise ImportFormatError(error_key, f"{filepath} 既不是节点表也不是关系表")
+
+
+def _parse_frame(data, filepath, error_key):
+    """按列名判断节点表或关系表并解析"""
+    columns = set(data.columns)
+    if columns.issuperset(NODE_COLUMNS):
+        return ParsedFile(filepath, nodes=parse_node_frame(data, filepath))
+    if columns.issuperset(RELATIONSHIP_COLUMNS):
+        return ParsedFile(filepath, relationships=parse_relationship_frame(data, filepath))
+    raise ImportFormatError(error_key, f"{filepath} 既不是节点表也不是关系表")
+
+
+def parse_import_file(filepath):
+    """
+    解析并校验一个导入文件（CSV、Parquet 或 Arrow 节点表/关系表，或含 nodes、edges 的 JSON），不涉及图
+    作为进程池的任务在工作进程中执行
+    :return: ParsedFile
+    :raises ImportFormatError: 文件格式不符合要求
+    """
+    extension = os.path.splitext(filepath)[1].lower()
+    if extension == ".csv":
+        return _parse_frame(read_csv(filepath, dtype=str, keep_default_na=False), filepath, "csv_column_error")
+
+    if table_format(filepath):
+        return _parse_columns(read_table_columns(filepath), filepath, "table_column_error")
+
+    if extension == ".json":
+        with open(filepath, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or "nodes" not in data or "edges" not in data:
+            raise ImportFormatError("json_format_error", f"{filepath} 缺少 nodes 或 edges")
+        nodes, edges = data["nodes"], data["edges"]
+        if not all(isinstance(node, dict) and "name" in node and "type" in node for node in nodes) or \
+                not all(isinstance(edge, dict) and "source" in edge and "target" in edge and "relation_type" in edge
+                        for edge in edges):
+            raise ImportFormatError("json_format_error", f"{filepath} 中有缺少必需字段的节点或关系")
+        return ParsedFile(filepath, graph={"nodes": nodes, "edges": edges})
+
+    raise ImportFormatError("unsupported_format", f"不支持的文件格式: {filepath}")
+
+
+class ImportCoordinator:
+    """
+    多文件导入：在进程池中并行解析和校验各文件，主进程在一个事务中合并结果
+    所有文件的节点先于关系合并，关系可以引用其他文件中的节点。
+    """
+
+    def __init__(self, graph_manager, max_workers=None):
+        """
+        :param max_workers: 解析进程数，默认为 CPU 核数
+        """
+        self.graph_manager = graph_manager
+        self.importer = DataImporter(graph_manager)
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def parse_files(self, filepaths, progress_callback=None):
+        """
+        并行解析文件；只有一个文件或一个进程时直接在当前进程解析，省去启动进程池的开销
+        :param progress_callback: 每解析完一个文件调用 progress_callback(已完成文件数, 文件总数)；
+                                  回调抛出的异常会中止解析（尚未开始的文件不再解析）并继续抛出
+        :return: (按输入顺序排列的 ParsedFile 列表, {文件路径: 异常})
+        """
+        parsed, errors = {}, {}
+        workers = min(self.max_workers, len(filepaths))
+        if workers <= 1:
+            for done, filepath in enumerate(filepaths, 1):
+                try:
+                    parsed[filepath] = parse_import_file(filepath)
+                except Exception as e:
+                    errors[filepath] = e
+                if progress_callback:
+                    progress_callback(done, len(filepaths))
+        else:
+            # 解析通常在导入任务的后台线程中发起；Qt 进程是多线程的，fork 出的子进程可能因继承的锁而死锁，
+            # 因此始终以 spawn 方式启动工作进程（与 Windows、macOS 的默认行为一致）
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                futures = {pool.submit(parse_import_file, filepath): filepath for filepath in filepaths}
+                try:
+                    for done, future in enumerate(as_completed(futures), 1):
+                        filepath = futures[future]
+                        try:
+                            parsed[filepath] = future.result()
+                        except Exception as e:
+                            errors[filepath] = e
+                        if progress_callback:
+                            progress_callback(done, len(futures))
+                except BaseException:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    raise
+        ordered = dict.fromkeys(filepaths)
+        return ([parsed[filepath] for filepath in ordered if filepath in parsed],
+                {filepath: errors[filepath] for filepath in ordered if filepath in errors})
+
+    @staticmethod
+    def _row_batches(filepath, import_rows, columns, batch_size):
+        for start in range(0, len(columns[0]), batch_size):
+            batch = [column[start:start + batch_size] for column in columns]
+            yield filepath, len(batch[0]), functools.partial(import_rows, *batch)
+
+    def _merge_graph(self, graph, policy):
+        return sum(self.graph_manager.merge_graph(graph, policy))
+
+    def plan_merge(self, parsed_files, batch_size=CHUNK_SIZE, policy=MERGE_OVERWRITE):
+        """
+        把解析结果拆成按顺序执行的写入步骤，本身不修改图
+        写入顺序为 CSV 节点表、JSON 图、CSV 关系表，任何文件中的关系都可以引用其他文件中的节点
+        :param batch_size: 每批写入的行数
+        :param policy: JSON 图中的节点或边已存在时的合并策略（见 graph_data_manager.MERGE_POLICIES）
+        :return: [(文件路径, 行数, 写入函数)]，写入函数返回写入的条数
+        """
+        steps = []
+        for parsed in parsed_files:
+            if parsed.nodes is not None:
+                steps.extend(self._row_batches(parsed.filepath, self.importer.import_node_rows,
+                                               parsed.nodes, batch_size))
+        for parsed in parsed_files:
+            if parsed.graph is not None:
+                rows = len(parsed.graph["nodes"]) + len(parsed.graph["edges"])
+                steps.append((parsed.filepath, rows, functools.partial(self._merge_graph, parsed.graph, policy)))
+        for parsed in parsed_files:
+            if parsed.relationships is not None:
+                steps.extend(self._row_batches(parsed.filepath, self.importer.import_relationship_rows,
+                                               parsed.relationships, batch_size))
+        return steps
+
+    def merge(self, parsed_files, progress_callback=None, batch_size=CHUNK_SIZE, policy=MERGE_OVERWRITE):
+        """
+        在一个事务中把解析结果写入图（一个撤销步骤、一次持久化），出错时整体回滚
+        :param progress_callback: 每写入一批行调用 progress_callback(已写入行数, 总行数)；
+                                  回调抛出异常（例如取消导入）时回滚已写入的部分并继续抛出
+        :param batch_size: 每批写入的行数
+        :param policy: JSON 图中的节点或边已存在时的合并策略（见 graph_data_manager.MERGE_POLICIES）
+        :return: {文件路径: 导入的节点数与关系数之和}
+        """
+        steps = self.plan_merge(parsed_files, batch_size, policy)
+        total = sum(rows for _, rows, _ in steps)
+        done = 0
+        counts = {}
+        with self.graph_manager.transaction():
+            for filepath, rows, write in steps:
+                counts[filepath] = counts.get(filepath, 0) + write()
+                done += rows
+                if progress_callback:
+                    progress_callback(done, total)
+        return counts
+
+    def import_files(self, filepaths, policy=MERGE_OVERWRITE):
+        """
+        解析并合并多个文件；格式有误的文件被跳过，不影响其余文件
+        :return: ({文件路径: 导入条数}, {文件路径: 异常})
+        """
+        parsed, errors = self.parse_files(filepaths)
+        counts = self.merge(parsed, policy=policy) if parsed else {}
+        return counts, errors
@@ -0,0 +1,110 @@
+# core/import_fingerprints.py
+import json
+import os
+
+import pandas as pd
+
+from .graph_io import atomic_write
+
+
+def row_fingerprints(data, columns):
+    """
+    整列向量化计算每行指定列的 64 位指纹（pandas 的 SipHash，密钥固定，跨进程稳定）
+    :return: 整数列表
+    """
+    return pd.util.hash_pandas_object(data[list(columns)], index=False).tolist()
+
+
+class FingerprintIndex:
+    """
+    导入来源文件的行指纹索引，保存为旁路 JSON 文件，按文件路径记录上次导入时每行的键和指纹：
+    节点表以 name 为键，关系表以 (source, target) 为键。
+    重新导入同一文件时与之比较，只需应用新增、修改和删除的行。
+
+    索引记录的是文件的内容，不是图的内容：图在导入之后可能被撤销或手动编辑过。
+    因此另在内存中记录每个文件最近一次确认与图一致时的图版本号，只有版本号仍然相同时
+    才能不读文件直接跳过（见 is_unchanged）。
+    """
+    VERSION = 1
+
+    def __init__(self, path):
+        self.path = path
+        self._files = None  # 延迟加载：{规范化路径: {"kind", "keys", "hashes"}}
+        self._dirty = False
+        self._synced = {}  # 规范化路径 -> 确认文件与图一致时的图版本号（不写盘）
+
+    @staticmethod
+    def _file_key(filepath):
+        return os.path.normcase(os.path.realpath(filepath))
+
+    @staticmethod
+    def _file_stat(filepath):
+        stat = os.stat(filepath)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _load(self):
+        if self._files is None:
+            self._files = {}
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    if data.get("version") == self.VERSION:
+                        self._files = data["files"]
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"指纹索引读取失败，将按首次导入处理: {e}")
+        return self._files
+
+    def get(self, filepath, kind):
+        """
+        :param kind: "nodes" 或 "relationships"
+        :return: {行键: 指纹}；没有记录或上次导入的表类型不同时返回 None
+        """
+        entry = self._load().get(self._file_key(filepath))
+        if entry is None or entry["kind"] != kind:
+            return None
+        keys = entry["keys"]
+        if kind == "relationships":
+            keys = map(tuple, keys)  # JSON 中以列表保存
+        return dict(zip(keys, entry["hashes"]))
+
+    def is_unchanged(self, filepath, graph_version):
+        """
+        文件自上次完整导入后大小和修改时间都没有变化，且图自那之后也没有被修改，无需读取即可跳过
+        :param graph_version: 图的当前版本号（graph_manager.version）
+        """
+        key = self._file_key(filepath)
+        if self._synced.get(key) != graph_version:
+            return False
+        entry = self._load().get(key)
+        return entry is not None and entry.get("stat") == self._file_stat(filepath)
+
+    def mark_synced(self, filepath, graph_version):
+        """记录文件的全部行在图的 graph_version 版本中都已生效"""
+        self._synced[self._file_key(filepath)] = graph_version
+
+    def put(self, filepath, kind, fingerprints, complete=True):
+        """
+        记录文件本次导入后的行指纹（只更新内存，由 save() 写盘）
+        :param complete: 文件的所有行都已应用；有行被跳过时不记录文件状态，下次仍会逐行比较
+        """
+        self._load()[self._file_key(filepath)] = {
+            "kind": kind,
+            "stat": self._file_stat(filepath) if complete else None,
+            "keys": list(fingerprints),
+            "hashes": list(fingerprints.values()),
+        }
+        self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        payload = {"version": self.VERSION, "files": self._files}
+        atomic_write(self.path, lambda f: json.dump(payload, f, ensure_ascii=False))
+        self._dirty = False
+
+    def reload(self):
+        """丢弃内存中尚未保存的修改（导入回滚时调用）"""
+        self._files = None
+        self._dirty = False
+        self._synced.clear()
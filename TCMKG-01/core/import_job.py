@@ -0,0 +1,218 @@
+# core/import_job.py
+import threading
+from collections import deque
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from .data_importer import DataImporter
+from .graph_data_manager import MERGE_OVERWRITE
+from .import_coordinator import ImportCoordinator
+
+MERGE_BATCH_SIZE = 10000  # UI 线程上每批写入的行数，批与批之间处理界面事件
+
+
+class ImportCancelled(Exception):
+    """导入任务被用户取消"""
+
+
+def _is_node_file(filepath):
+    try:
+        return DataImporter.csv_kind(filepath) == "nodes"
+    except Exception:
+        return False  # 无法读取的文件在导入时报告错误
+
+
+class ImportJobSignals(QObject):
+    """ImportJob 的信号（QRunnable 不是 QObject，信号放在单独的对象上）"""
+    progress = pyqtSignal(str, int, int)  # 阶段（"parsing"，按文件）, 已完成, 总数
+    parsed = pyqtSignal(object, object)  # [(文件路径, 行数, 写入函数)], {文件路径: 异常}
+    cancelled = pyqtSignal()
+    failed = pyqtSignal(str)
+
+
+class ImportJob(QRunnable):
+    """
+    导入任务的解析阶段，在 QThreadPool 工作线程中执行：用 ImportCoordinator 并行解析文件，
+    把结果拆成分批的写入步骤交给 ImportJobRunner 在 UI 线程上执行，本身不修改图。
+    每个文件解析完后检查取消请求，取消时抛出 ImportCancelled。
+
+    指定 fingerprint_index 时为增量重新导入：各 CSV 按行指纹只应用变化的行。
+    """
+
+    def __init__(self, coordinator, filepaths, fingerprint_index=None, policy=MERGE_OVERWRITE):
+        super().__init__()
+        self.coordinator = coordinator
+        self.filepaths = list(filepaths)
+        self.fingerprint_index = fingerprint_index
+        self.policy = policy
+        self.signals = ImportJobSignals()
+        self._cancel_requested = threading.Event()
+
+    def cancel(self):
+        """请求取消（可在任意线程调用），任务在下一个检查点停止"""
+        self._cancel_requested.set()
+
+    def cancel_requested(self):
+        return self._cancel_requested.is_set()
+
+    def _reporter(self, stage):
+        def report(done, total):
+            if self._cancel_requested.is_set():
+                raise ImportCancelled()
+            self.signals.progress.emit(stage, done, total)
+        return report
+
+    def run(self):
+        try:
+            if self.fingerprint_index is None:
+                parsed, errors = self.coordinator.parse_files(self.filepaths, self._reporter("parsing"))
+                steps = self.coordinator.plan_merge(parsed, MERGE_BATCH_SIZE, self.policy)
+            else:
+                steps, errors = self._plan_reimport(), {}
+        except ImportCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            print(f"导入任务失败: {e}")
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.parsed.emit(steps, errors)
+
+    def _plan_reimport(self):
+        """
+        按节点表先于关系表的顺序比较各文件与指纹索引，每个文件的差异是一个写入步骤
+        任何一个文件出错时整个任务中止，不会出现部分文件的修改已提交而指纹未记录的情况
+        """
+        importer = self.coordinator.importer
+        report = self._reporter("parsing")
+        filepaths = sorted(self.filepaths, key=lambda filepath: not _is_node_file(filepath))
+        steps = []
+        for done, filepath in enumerate(filepaths, 1):
+            rows, apply = importer.plan_reimport(filepath, self.fingerprint_index)
+            steps.append((filepath, rows, apply))
+            report(done, len(filepaths))
+        return steps
+
+
+class ImportJobRunner(QObject):
+    """
+    运行导入任务，一次只运行一个：文件在后台解析，解析结果在 UI 线程上分批写入图
+
+    图只在 UI 线程上被修改。各批在同一个事务中写入，批与批之间返回事件循环处理界面事件，
+    导航器、统计刷新等在 UI 线程上读取图的计时器因此不会与写入并发；取消或出错时整体回滚，
+    增量重新导入的指纹索引在提交后才保存。任务运行期间图的变更通知被暂存（hold_notifications），
+    提交后一次发出。调用方仍应阻止用户在任务期间修改图，例如用模态进度对话框。
+    """
+    progress = pyqtSignal(str, int, int)  # 阶段（"parsing" 按文件 / "merging" 按行）, 已完成, 总数
+    finished = pyqtSignal(object, object)
+    cancelled = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, graph_manager, thread_pool=None, parent=None):
+        super().__init__(parent)
+        self.graph_manager = graph_manager
+        self.coordinator = ImportCoordinator(graph_manager)
+        self.thread_pool = thread_pool or QThreadPool.globalInstance()
+        self._job = None
+        self._transaction = None  # 写入阶段中打开的事务
+        self._steps = None
+        self._errors = None
+        self._counts = None
+        self._done = 0
+        self._total = 0
+
+    def is_running(self):
+        return self._job is not None
+
+    def start(self, filepaths, fingerprint_index=None, policy=MERGE_OVERWRITE):
+        """
+        启动导入任务
+        :param fingerprint_index: 指定时按行指纹增量重新导入（见 DataImporter.reimport_csv）
+        :param policy: JSON 图中的节点或边已存在时的合并策略
+        :return: 是否已启动（已有任务在运行时返回 False）
+        """
+        if self._job is not None:
+            return False
+
+        # 先写完挂起的自动保存，暂存通知之后自动保存在任务期间不会再被触发
+        if self.graph_manager.autosave is not None:
+            self.graph_manager.autosave.flush()
+        self.graph_manager.hold_notifications()
+
+        job = ImportJob(self.coordinator, filepaths, fingerprint_index, policy)
+        job.signals.progress.connect(self.progress)
+        job.signals.parsed.connect(self._on_parsed)
+        job.signals.cancelled.connect(self._on_cancelled)
+        job.signals.failed.connect(self._on_failed)
+        self._job = job
+        self.thread_pool.start(job)
+        return True
+
+    def cancel(self):
+        if self._job is not None:
+            self._job.cancel()
+
+    def _on_parsed(self, steps, errors):
+        """解析完成（UI 线程）：打开事务，从下一轮事件循环开始逐批写入"""
+        self._steps = deque(steps)
+        self._errors = errors
+        self._counts = {}
+        self._done = 0
+        self._total = sum(rows for _, rows, _ in steps)
+        self._transaction = self.graph_manager.transaction()
+        self._transaction.__enter__()
+        QTimer.singleShot(0, self._apply_next_step)
+
+    def _apply_next_step(self):
+        if self._job.cancel_requested():
+            self._abort(ImportCancelled())
+            return
+        try:
+            if self._steps:
+                filepath, rows, write = self._steps.popleft()
+                self._counts[filepath] = self._counts.get(filepath, 0) + write()
+                self._done += rows
+                self.progress.emit("merging", self._done, self._total)
+                QTimer.singleShot(0, self._apply_next_step)
+                return
+            transaction, self._transaction = self._transaction, None
+            transaction.__exit__(None, None, None)
+            index = self._job.fingerprint_index
+            if index is not None:
+                for filepath in self._job.filepaths:
+                    index.mark_synced(filepath, self.graph_manager.version)
+                index.save()
+        except Exception as e:
+            print(f"导入任务失败: {e}")
+            self._abort(e)
+            return
+        counts, errors = self._counts, self._errors
+        self._release()
+        self.finished.emit(counts, errors)
+
+    def _abort(self, error):
+        """回滚已写入的批次，并按错误类型发出取消或失败信号"""
+        if self._transaction is not None:
+            transaction, self._transaction = self._transaction, None
+            transaction.__exit__(type(error), error, error.__traceback__)
+        if isinstance(error, ImportCancelled):
+            self._on_cancelled()
+        else:
+            self._on_failed(str(error))
+
+    def _release(self, discard_index=False):
+        """
+        :param discard_index: 是否丢弃指纹索引在本次任务中的修改（任务被取消或失败时）
+        """
+        if discard_index and self._job.fingerprint_index is not None:
+            self._job.fingerprint_index.reload()
+        self._job = None
+        self._steps = self._errors = self._counts = None
+        self.graph_manager.release_notifications()
+
+    def _on_cancelled(self):
+        self._release(discard_index=True)
+        self.cancelled.emit()
+
+    def _on_failed(self, error):
+        self._release(discard_index=True)
+        self.failed.emit(error)
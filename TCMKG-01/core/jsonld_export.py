@@ -0,0 +1,76 @@
+# core/jsonld_export.py
+"""
+流式 JSON-LD 导出：按图的邻接结构一次遍历，每个节点连同它的出边生成一个节点对象，内存占用与图的大小无关。
+
+两种输出：
+- JSON-LD 文档：{"@context": ..., "@graph": [节点对象, ...]}
+- NDJSON-LD：每行一个自带 @context 的节点文档，下游可以按行切分并行导入
+"""
+import itertools
+import json
+import os
+
+from .graph_io import atomic_write, write_json_stream
+
+# JSON-LD 上下文，可根据实际需要调整 URI
+JSONLD_CONTEXT = {
+    "name": "http://schema.org/name",
+    "type": "http://schema.org/additionalType",
+    "attributes": "http://schema.org/additionalProperty",
+    "relatedTo": {
+        "@id": "http://schema.org/relatedLink",
+        "@container": "@list"
+    }
+}
+NDJSON_EXTENSIONS = (".ndjsonld", ".ndjson", ".jsonl")
+BATCH_SIZE = 1024  # NDJSON-LD 每批序列化并写入的节点数
+
+
+def iter_jsonld_nodes(graph):
+    """逐个生成 JSON-LD 节点对象，出边作为 relatedTo 列表附在源节点上"""
+    nodes = graph.nodes
+    for node, neighbours in graph.adjacency():
+        data = nodes[node]
+        node_ld = {
+            "@id": node,
+            "name": node,
+            "type": data.get("type", ""),
+            "attributes": data.get("attributes", {})
+        }
+        if neighbours:
+            # 关系对象包含目标节点 id 和关系类型信息
+            node_ld["relatedTo"] = [{"@id": target, "relation_type": edge_data.get("relation_type", "")}
+                                    for target, edge_data in neighbours.items()]
+        yield node_ld
+
+
+def write_jsonld(f, graph, indent=None):
+    """把图作为一个 JSON-LD 文档流式写入已打开的文本文件"""
+    write_json_stream(f, [("@context", JSONLD_CONTEXT), ("@graph", iter_jsonld_nodes(graph))], indent=indent)
+
+
+def write_ndjsonld(f, graph, batch_size=BATCH_SIZE):
+    """把图写成 NDJSON-LD：每行一个节点文档，@context 内联在每一行中"""
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    # 上下文只编码一次，拼在每个节点对象的左括号之后
+    prefix = '{"@context":' + encode(JSONLD_CONTEXT) + ","
+    documents = iter_jsonld_nodes(graph)
+    while True:
+        batch = list(itertools.islice(documents, batch_size))
+        if not batch:
+            break
+        f.write("".join(prefix + encode(document)[1:] + "\n" for document in batch))
+
+
+def save_jsonld(graph, path, indent=4, ndjson=None):
+    """
+    把图导出为 JSON-LD 文件（经临时文件写入，失败时不留下不完整的文件）
+    :param indent: JSON-LD 文档的缩进；None 为紧凑格式（NDJSON-LD 总是紧凑的）
+    :param ndjson: 是否输出 NDJSON-LD；默认按扩展名（.ndjsonld/.ndjson/.jsonl）判断
+    """
+    if ndjson is None:
+        ndjson = os.path.splitext(path)[1].lower() in NDJSON_EXTENSIONS
+    if ndjson:
+        atomic_write(path, lambda f: write_ndjsonld(f, graph))
+    else:
+        atomic_write(path, lambda f: write_jsonld(f, graph, indent))
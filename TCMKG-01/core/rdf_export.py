@@ -0,0 +1,198 @@
+# core/rdf_export.py
+"""
+流式 RDF 导出：直接从图的邻接迭代器逐个节点写出三元组，不构造 rdflib.Graph
+支持 N-Triples、Turtle 和 RDF/XML，路径以 .gz 结尾时输出 gzip 压缩文件。
+
+每个节点写出 (节点, rdf:type, 节点类)、(节点, rdfs:label, 名称)、(节点, ex:type, 类型)，
+每条边写出 (源节点, ex:关系类型, 目标节点)；节点和关系类型的 IRI 为命名空间加上
+IRI 安全编码后的名称（中文等非 ASCII 字符原样保留，空格和保留字符按 UTF-8 百分号编码）。
+"""
+import gzip
+import io
+import os
+import re
+from xml.sax.saxutils import quoteattr
+
+from .graph_io import atomic_write
+
+GRAPH_NAMESPACE = "http://example.org/graph#"
+RDF_NAMESPACE = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+RDFS_NAMESPACE = "http://www.w3.org/2000/01/rdf-schema#"
+OWL_NAMESPACE = "http://www.w3.org/2002/07/owl#"
+RDFS_CLASS = RDFS_NAMESPACE + "Class"
+OWL_CLASS = OWL_NAMESPACE + "Class"
+
+PREFIXES = (("rdf", RDF_NAMESPACE), ("rdfs", RDFS_NAMESPACE), ("owl", OWL_NAMESPACE), ("ex", GRAPH_NAMESPACE))
+FORMATS = {".nt": "nt", ".ttl": "turtle", ".rdf": "xml", ".owl": "xml", ".xml": "xml"}
+BATCH_SIZE = 4096  # 每累积这么多个节点的文本写一次文件
+
+# IRI 中可以原样保留的字符之外的一切（含 %、#、空格和 ASCII 标点）都做百分号编码
+_IRI_UNSAFE = re.compile("[^A-Za-z0-9\\-._~\u00a0-\ud7ff\uf900-\ufdcf\ufdf0-\uffef\U00010000-\U000effff]")
+# Turtle 前缀名的局部部分（保守子集，其余情况写完整 IRI）
+_TURTLE_LOCAL = re.compile("(?:[A-Za-z0-9_\u3001-\ud7ff\uf900-\ufdcf\ufdf0-\ufffd]|%[0-9A-F]{2})"
+                           "(?:[A-Za-z0-9_\\-\u3001-\ud7ff\uf900-\ufdcf\ufdf0-\ufffd]|%[0-9A-F]{2})*")
+# XML 的 NCName，RDF/XML 的属性元素名必须是合法的 QName
+_NAME_START = ("A-Z_a-z\u00c0-\u00d6\u00d8-\u00f6\u00f8-\u02ff\u0370-\u037d\u037f-\u1fff\u200c-\u200d"
+               "\u2070-\u218f\u2c00-\u2fef\u3001-\ud7ff\uf900-\ufdcf\ufdf0-\ufffd\U00010000-\U000effff")
+_NCNAME = re.compile(f"[{_NAME_START}][{_NAME_START}\\-.0-9\u00b7\u0300-\u036f\u203f-\u2040]*")
+# RDF/XML 元素文本的转义表：XML 1.0 不允许出现的字符直接删除，回车写成字符引用（否则被解析器规范化为换行）
+_XML_TEXT_ESCAPES = dict.fromkeys([c for c in range(0x20) if c not in (0x09, 0x0a, 0x0d)] + [0xfffe, 0xffff])
+_XML_TEXT_ESCAPES.update({ord("&"): "&amp;", ord("<"): "&lt;", ord(">"): "&gt;", 0x0d: "&#13;"})
+_XML_NEEDS_ESCAPE = re.compile("[&<>\x00-\x08\x0b-\x1f\ufffe\uffff]")
+
+
+def iri_local(name):
+    """把节点名或关系类型编码为 IRI 的局部部分"""
+    name = str(name)
+    if _IRI_UNSAFE.search(name) is None:
+        return name
+    return _IRI_UNSAFE.sub(lambda m: "".join(f"%{byte:02X}" for byte in m.group().encode("utf-8")), name)
+
+
+def _literal(text):
+    """N-Triples / Turtle 的字符串字面量"""
+    text = str(text).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n").replace("\r", "\\r")
+    return '"' + text + '"'
+
+
+def _xml_text(value):
+    """RDF/XML 元素文本"""
+    text = str(value)
+    # 绝大多数名称不含需要转义的字符，先用正则判断可以省去 translate 的复制
+    return text.translate(_XML_TEXT_ESCAPES) if _XML_NEEDS_ESCAPE.search(text) else text
+
+
+def _write_nt(f, graph, node_class):
+    nodes = graph.nodes
+    rdf_type = f"<{RDF_NAMESPACE}type>"
+    label = f"<{RDFS_NAMESPACE}label>"
+    type_predicate = f"<{GRAPH_NAMESPACE}type>"
+    node_class = f"<{node_class}>"
+    predicates = {}  # 关系类型 -> 谓词
+    lines = []
+    for count, (name, successors) in enumerate(graph.adjacency(), 1):
+        data = nodes[name]
+        subject = f"<{GRAPH_NAMESPACE}{iri_local(name)}>"
+        lines.append(f"{subject} {rdf_type} {node_class} .\n{subject} {label} {_literal(name)} .\n")
+        if "type" in data:
+            lines.append(f"{subject} {type_predicate} {_literal(data['type'])} .\n")
+        for target, edge in successors.items():
+            relation_type = edge.get("relation_type", "")
+            predicate = predicates.get(relation_type)
+            if predicate is None:
+                predicate = predicates[relation_type] = f"<{GRAPH_NAMESPACE}{iri_local(relation_type)}>"
+            lines.append(f"{subject} {predicate} <{GRAPH_NAMESPACE}{iri_local(target)}> .\n")
+        if count % BATCH_SIZE == 0:
+            f.write("".join(lines))
+            lines.clear()
+    f.write("".join(lines))
+
+
+def _turtle_term(iri):
+    for prefix, namespace in PREFIXES:
+        if iri.startswith(namespace) and _TURTLE_LOCAL.fullmatch(iri[len(namespace):]):
+            return f"{prefix}:{iri[len(namespace):]}"
+    return f"<{iri}>"
+
+
+def _write_turtle(f, graph, node_class):
+    """每个节点一个主语块，出边作为该主语的谓词列表写在同一块中"""
+    nodes = graph.nodes
+    node_class = _turtle_term(node_class)
+    predicates = {}
+    f.write("".join(f"@prefix {prefix}: <{namespace}> .\n" for prefix, namespace in PREFIXES) + "\n")
+    lines = []
+    for count, (name, successors) in enumerate(graph.adjacency(), 1):
+        data = nodes[name]
+        lines.append(f"{_turtle_term(GRAPH_NAMESPACE + iri_local(name))} a {node_class} ;\n"
+                     f"    rdfs:label {_literal(name)}")
+        if "type" in data:
+            lines.append(f" ;\n    ex:type {_literal(data['type'])}")
+        for target, edge in successors.items():
+            relation_type = edge.get("relation_type", "")
+            predicate = predicates.get(relation_type)
+            if predicate is None:
+                predicate = predicates[relation_type] = _turtle_term(GRAPH_NAMESPACE + iri_local(relation_type))
+            lines.append(f" ;\n    {predicate} {_turtle_term(GRAPH_NAMESPACE + iri_local(target))}")
+        lines.append(" .\n\n")
+        if count % BATCH_SIZE == 0:
+            f.write("".join(lines))
+            lines.clear()
+    f.write("".join(lines))
+
+
+def _xml_property(relation_type):
+    """
+    关系类型对应的 RDF/XML 属性元素名，以及需要在该元素上声明的命名空间
+    局部名称不是合法的 NCName 时，把 IRI 中最长的合法 NCName 后缀作为局部名称，其余部分作为命名空间
+    """
+    local = iri_local(relation_type)
+    if _NCNAME.fullmatch(local):
+        return f"ex:{local}", ""
+    for start in range(1, len(local)):
+        if _NCNAME.fullmatch(local, start):
+            return f"ns1:{local[start:]}", f" xmlns:ns1={quoteattr(GRAPH_NAMESPACE + local[:start])}"
+    raise ValueError(f"关系类型 '{relation_type}' 无法表示为 RDF/XML 的属性名，请导出为 N-Triples 或 Turtle")
+
+
+def _write_xml(f, graph, node_class):
+    nodes = graph.nodes
+    node_class = quoteattr(node_class)
+    properties = {}  # 关系类型 -> (元素名, 命名空间声明)
+    namespaces = "".join(f"\n   xmlns:{prefix}={quoteattr(namespace)}" for prefix, namespace in PREFIXES)
+    f.write(f'<?xml version="1.0" encoding="utf-8"?>\n<rdf:RDF{namespaces}\n>\n')
+    lines = []
+    for count, (name, successors) in enumerate(graph.adjacency(), 1):
+        data = nodes[name]
+        lines.append(f"  <rdf:Description rdf:about={quoteattr(GRAPH_NAMESPACE + iri_local(name))}>\n"
+                     f"    <rdf:type rdf:resource={node_class}/>\n"
+                     f"    <rdfs:label>{_xml_text(name)}</rdfs:label>\n")
+        if "type" in data:
+            lines.append(f"    <ex:type>{_xml_text(data['type'])}</ex:type>\n")
+        for target, edge in successors.items():
+            relation_type = edge.get("relation_type", "")
+            prop = properties.get(relation_type)
+            if prop is None:
+                prop = properties[relation_type] = _xml_property(relation_type)
+            lines.append(f"    <{prop[0]}{prop[1]} rdf:resource="
+                         f"{quoteattr(GRAPH_NAMESPACE + iri_local(target))}/>\n")
+        lines.append("  </rdf:Description>\n")
+        if count % BATCH_SIZE == 0:
+            f.write("".join(lines))
+            lines.clear()
+    lines.append("</rdf:RDF>\n")
+    f.write("".join(lines))
+
+
+_WRITERS = {"nt": _write_nt, "turtle": _write_turtle, "xml": _write_xml}
+
+
+def write_rdf(graph, path, fmt=None, node_class=RDFS_CLASS, compress=None):
+    """
+    把图流式导出为 RDF 文件（经临时文件写入，失败时不留下不完整的文件）
+    :param graph: networkx 有向图，节点属性含 type，边属性含 relation_type
+    :param fmt: "nt"、"turtle" 或 "xml"（RDF/XML）；默认按扩展名（.nt/.ttl/.rdf/.owl，可再加 .gz）判断
+    :param node_class: 节点的 rdf:type，RDFS_CLASS 或 OWL_CLASS
+    :param compress: 是否 gzip 压缩；默认在路径以 .gz 结尾时压缩
+    """
+    base = path[:-3] if path.lower().endswith(".gz") else path
+    if compress is None:
+        compress = base != path
+    if fmt is None:
+        fmt = FORMATS.get(os.path.splitext(base)[1].lower())
+        if fmt is None:
+            raise ValueError(f"无法根据扩展名判断 RDF 格式: {path}")
+    writer = _WRITERS.get(fmt)
+    if writer is None:
+        raise ValueError(f"不支持的 RDF 格式: {fmt}")
+
+    def write(raw):
+        stream = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) if compress else raw
+        text = io.TextIOWrapper(stream, encoding="utf-8", newline="\n")
+        writer(text, graph, node_class)
+        text.flush()
+        text.detach()  # 底层文件由 atomic_write 关闭
+        if compress:
+            stream.close()  # 写出 gzip 尾部，不关闭 raw
+
+    atomic_write(path, write, binary=True)
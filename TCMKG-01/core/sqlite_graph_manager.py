@@ -0,0 +1,1030 @@
+# core/sqlite_graph_manager.py
+import contextlib
+import json
+import os
+import sqlite3
+from collections import deque
+from collections.abc import Mapping
+
+import networkx as nx
+
+from . import graph_events
+from .graph_data_manager import MERGE_OVERWRITE, MERGE_POLICIES, GraphDataManager, _GraphDelta, _resolve_conflict
+from .graph_events import GraphEvent
+from .graph_io import write_json_stream
+from .jsonld_export import JSONLD_CONTEXT, save_jsonld
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    name TEXT PRIMARY KEY,
+    type TEXT NOT NULL DEFAULT '',
+    attributes TEXT NOT NULL DEFAULT '{}',
+    resources TEXT NOT NULL DEFAULT '[]'
+);
+CREATE TABLE IF NOT EXISTS edges (
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    relation_type TEXT NOT NULL DEFAULT '',
+    resources TEXT NOT NULL DEFAULT '[]',
+    PRIMARY KEY (source, target)
+);
+CREATE INDEX IF NOT EXISTS idx_nodes_type ON nodes(type);
+CREATE INDEX IF NOT EXISTS idx_edges_target ON edges(target);
+CREATE INDEX IF NOT EXISTS idx_edges_relation_type ON edges(relation_type);
+"""
+
+# 属性是紧凑编码的 JSON，以 "{" 开头且不是 "{}" 时才有属性键
+_HAS_ATTRIBUTE_KEYS = "nodes.attributes != '{}' AND substr(nodes.attributes, 1, 1) = '{'"
+_NODES_WITH_ATTRIBUTE = (f"SELECT name FROM nodes WHERE {_HAS_ATTRIBUTE_KEYS} "
+                         "AND EXISTS (SELECT 1 FROM json_each(nodes.attributes) WHERE key = ?)")
+
+
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def _dumps(value):
+    return _ENCODER.encode(value)  # 复用编码器，json.dumps 带参数时每次都会新建一个
+
+
+def _node_data(row):
+    """把 nodes 表的 (type, attributes, resources) 行转换为与 networkx 图中相同的节点属性字典"""
+    return {"type": row[0], "attributes": json.loads(row[1]), "resources": json.loads(row[2])}
+
+
+def _edge_data(row):
+    """把 edges 表的 (relation_type, resources) 行转换为边属性字典"""
+    return {"relation_type": row[0], "resources": json.loads(row[1])}
+
+
+class _SQLBuckets(Mapping):
+    """
+    与 GraphIndex 中各索引相同的只读映射（键 -> {成员: None}），每次访问直接查询数据库中带索引的列
+    :param keys_sql: 查询全部键的语句
+    :param members_sql: 按键查询成员的语句（一个参数）；查询多列时成员为元组
+    """
+
+    def __init__(self, conn, keys_sql, members_sql):
+        self._conn = conn
+        self._keys_sql = keys_sql
+        self._members_sql = members_sql
+
+    def __getitem__(self, key):
+        members = dict.fromkeys(row[0] if len(row) == 1 else row
+                                for row in self._conn.execute(self._members_sql, (key,)))
+        if not members:
+            raise KeyError(key)
+        return members
+
+    def __iter__(self):
+        return (key for (key,) in self._conn.execute(self._keys_sql))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class _SQLiteIndex:
+    """
+    与 GraphIndex 接口相同的只读二级索引，类型和关系类型查询走 type、relation_type 列上的索引，
+    属性键没有单独建索引，由 SQLite 的 json_each 在库内扫描；都不需要加载 .graph 缓存，也不需要在修改后重建
+    """
+
+    def __init__(self, manager):
+        conn = manager.conn
+        self._manager = manager
+        self.nodes_by_type = _SQLBuckets(conn, "SELECT DISTINCT type FROM nodes",
+                                         "SELECT name FROM nodes WHERE type = ?")
+        self.edges_by_relation = _SQLBuckets(conn, "SELECT DISTINCT relation_type FROM edges",
+                                             "SELECT source, target FROM edges WHERE relation_type = ?")
+        self.nodes_by_attribute = _SQLBuckets(
+            conn, f"SELECT DISTINCT attribute.key FROM nodes, json_each(nodes.attributes) AS attribute "
+                  f"WHERE {_HAS_ATTRIBUTE_KEYS}",
+            _NODES_WITH_ATTRIBUTE)
+
+    @property
+    def version(self):
+        return self._manager.version
+
+    @property
+    def type_degree(self):
+        """类型 -> 该类型所有节点的度数之和"""
+        return {node_type: statistics["degree"]
+                for node_type, statistics in self._manager.get_type_statistics().items()}
+
+
+class SQLiteGraphDataManager:
+    """
+    以本地 SQLite 文件持久化的图数据管理器，与 GraphDataManager 接口一致
+
+    每次编辑只对受影响的行做 upsert/delete，不再整体重写文件；按名称、类型、关系类型
+    和边端点的查询都走索引。networkx 图只作为可选缓存，在首次访问 .graph 时才从数据库
+    加载（供分析类插件使用），之后随每次修改增量同步。
+
+    主窗口默认使用 GraphDataManager，设置环境变量 TCMKG_GRAPH_BACKEND=sqlite 时改用本类。
+    """
+    JSONLD_CONTEXT = JSONLD_CONTEXT
+    LARGE_CHANGE_THRESHOLD = GraphDataManager.LARGE_CHANGE_THRESHOLD  # 超过时订阅者收到 GRAPH_RESET
+
+    def __init__(self, db_path='generated_graph.db', json_path='generated_graph.json', autoload=True):
+        """
+        :param db_path: SQLite 数据库文件路径
+        :param json_path: JSON 导出路径；数据库为空且该文件存在时会先从中导入一次
+        :param autoload: 是否在构造时立即调用 load_graph_from_json
+        """
+        self.db_path = db_path
+        self.json_path = json_path
+        # 导入任务会在工作线程中读库（写入仍在 UI 线程上进行），因此不限制连接只能在创建线程使用
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA cache_size=-65536")  # 64MB 页缓存，批量写入时减少索引页换入换出
+        self.conn.executescript(_SCHEMA)
+        self.undo_stack = deque(maxlen=50)
+        self.redo_stack = deque(maxlen=50)
+        self._current_version = 0
+        self._transaction = None
+        self._change_listeners = []
+        self._event_subscribers = []
+        self._held_deltas = None  # hold_notifications() 期间暂存的提交
+        self.autosave = None
+        self._graph_cache = None
+        self._index = _SQLiteIndex(self)
+
+        if autoload:
+            self.load_graph_from_json()
+
+    # ------------------- 缓存 -------------------
+    @property
+    def graph(self):
+        """按需从数据库加载的 networkx 图缓存"""
+        if self._graph_cache is None:
+            graph = nx.DiGraph()
+            graph.add_nodes_from(
+                (row[0], _node_data(row[1:]))
+                for row in self.conn.execute("SELECT name, type, attributes, resources FROM nodes")
+            )
+            graph.add_edges_from(
+                (row[0], row[1], _edge_data(row[2:]))
+                for row in self.conn.execute("SELECT source, target, relation_type, resources FROM edges")
+            )
+            self._graph_cache = graph
+        return self._graph_cache
+
+    def sync_graph_cache(self):
+        """
+        把缓存图中被插件直接修改过的节点和边写回数据库
+        逐行比较缓存与数据库，只写入有差异的行，并作为一次普通提交（可撤销、发出变更事件）
+        :return: 写回的节点数和关系数之和
+        """
+        if self._graph_cache is None:
+            return 0
+        graph = self._graph_cache
+        nodes = {name: (data.get("type", ""), _dumps(data.get("attributes", {})), _dumps(data.get("resources", [])))
+                 for name, data in graph.nodes(data=True)}
+        edges = {(source, target): (data.get("relation_type", ""), _dumps(data.get("resources", [])))
+                 for source, target, data in graph.edges(data=True)}
+        delta = self._begin_change()
+        node_changes = {}
+        for name, *row in self.conn.execute("SELECT name, type, attributes, resources FROM nodes"):
+            row = tuple(row)
+            new_row = nodes.pop(name, None)
+            if new_row != row:
+                node_changes[name] = new_row
+                delta.nodes.setdefault(name, row)
+        for name, new_row in nodes.items():  # 缓存中新增的节点
+            node_changes[name] = new_row
+            delta.nodes.setdefault(name, None)
+        edge_changes = {}
+        for source, target, *row in self.conn.execute("SELECT source, target, relation_type, resources FROM edges"):
+            row = tuple(row)
+            new_row = edges.pop((source, target), None)
+            if new_row != row:
+                edge_changes[(source, target)] = new_row
+                delta.edges.setdefault((source, target), row)
+        for key, new_row in edges.items():
+            edge_changes[key] = new_row
+            delta.edges.setdefault(key, None)
+        if not node_changes and not edge_changes:
+            return 0
+
+        # 缓存已经是修改后的状态，这里只改数据库
+        self.conn.executemany("DELETE FROM edges WHERE source = ? AND target = ?",
+                              [key for key, row in edge_changes.items() if row is None])
+        self.conn.executemany("DELETE FROM nodes WHERE name = ?",
+                              [(name,) for name, row in node_changes.items() if row is None])
+        self.conn.executemany(
+            "INSERT INTO nodes(name, type, attributes, resources) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET type = excluded.type, attributes = excluded.attributes, "
+            "resources = excluded.resources",
+            [(name,) + row for name, row in node_changes.items() if row is not None])
+        self.conn.executemany(
+            "INSERT INTO edges(source, target, relation_type, resources) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(source, target) DO UPDATE SET relation_type = excluded.relation_type, "
+            "resources = excluded.resources",
+            [key + row for key, row in edge_changes.items() if row is not None])
+        print(f"写回缓存修改: 节点 {len(node_changes)} 个，关系 {len(edge_changes)} 条")
+        self._commit_change(delta)
+        return len(node_changes) + len(edge_changes)
+
+    # ------------------- 行级读写 -------------------
+    def _count(self, table):
+        return self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def _node_row(self, name):
+        return self.conn.execute(
+            "SELECT type, attributes, resources FROM nodes WHERE name = ?", (name,)).fetchone()
+
+    def _edge_row(self, source, target):
+        return self.conn.execute(
+            "SELECT relation_type, resources FROM edges WHERE source = ? AND target = ?", (source, target)).fetchone()
+
+    def _incident_edges(self, name):
+        return self.conn.execute(
+            "SELECT source, target FROM edges WHERE source = ? UNION SELECT source, target FROM edges WHERE target = ?",
+            (name, name)).fetchall()
+
+    def _put_node(self, name, row):
+        self.conn.execute(
+            "INSERT INTO nodes(name, type, attributes, resources) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET type = excluded.type, attributes = excluded.attributes, "
+            "resources = excluded.resources", (name,) + tuple(row))
+        if self._graph_cache is not None:
+            if self._graph_cache.has_node(name):
+                self._graph_cache.nodes[name].clear()
+            self._graph_cache.add_node(name, **_node_data(row))
+
+    def _drop_node(self, name):
+        self.conn.execute("DELETE FROM edges WHERE source = ? OR target = ?", (name, name))
+        self.conn.execute("DELETE FROM nodes WHERE name = ?", (name,))
+        if self._graph_cache is not None and self._graph_cache.has_node(name):
+            self._graph_cache.remove_node(name)
+
+    def _put_edge(self, source, target, row):
+        self.conn.execute(
+            "INSERT INTO edges(source, target, relation_type, resources) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(source, target) DO UPDATE SET relation_type = excluded.relation_type, "
+            "resources = excluded.resources", (source, target) + tuple(row))
+        if self._graph_cache is not None:
+            if self._graph_cache.has_edge(source, target):
+                self._graph_cache[source][target].clear()
+            self._graph_cache.add_edge(source, target, **_edge_data(row))
+
+    def _drop_edge(self, source, target):
+        self.conn.execute("DELETE FROM edges WHERE source = ? AND target = ?", (source, target))
+        if self._graph_cache is not None and self._graph_cache.has_edge(source, target):
+            self._graph_cache.remove_edge(source, target)
+
+    # ------------------- 撤销记录与事务 -------------------
+    def _touch_node(self, delta, name):
+        if name not in delta.nodes:
+            delta.nodes[name] = self._node_row(name)
+
+    def _touch_edge(self, delta, source, target):
+        if (source, target) not in delta.edges:
+            delta.edges[(source, target)] = self._edge_row(source, target)
+
+    def _touch_incident_edges(self, delta, name):
+        for source, target in self._incident_edges(name):
+            self._touch_edge(delta, source, target)
+
+    def _apply_delta(self, delta):
+        """把 delta 中记录的行写回数据库，返回反向 delta"""
+        inverse = _GraphDelta()
+        inverse.renames = {old: new for new, old in delta.renames.items()}
+        for name in delta.nodes:
+            self._touch_node(inverse, name)
+        for source, target in delta.edges:
+            self._touch_edge(inverse, source, target)
+        for name, row in delta.nodes.items():
+            if row is None:
+                self._touch_incident_edges(inverse, name)
+
+        for (source, target), row in delta.edges.items():
+            if row is None:
+                self._drop_edge(source, target)
+        for name, row in delta.nodes.items():
+            if row is None:
+                self._drop_node(name)
+        for name, row in delta.nodes.items():
+            if row is not None:
+                self._put_node(name, row)
+        for (source, target), row in delta.edges.items():
+            if row is not None:
+                self._put_edge(source, target, row)
+        return inverse
+
+    def add_change_listener(self, callback):
+        """注册图数据变更回调（每次提交的修改或事务调用一次）"""
+        if callback not in self._change_listeners:
+            self._change_listeners.append(callback)
+
+    def remove_change_listener(self, callback):
+        if callback in self._change_listeners:
+            self._change_listeners.remove(callback)
+
+    def subscribe(self, callback):
+        """订阅细粒度变更事件，语义与 GraphDataManager.subscribe 相同"""
+        if callback not in self._event_subscribers:
+            self._event_subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._event_subscribers:
+            self._event_subscribers.remove(callback)
+
+    @property
+    def version(self):
+        """图数据版本号，每次修改后递增"""
+        return self._current_version
+
+    def hold_notifications(self):
+        """暂存之后提交的变更通知，直到 release_notifications()（与 GraphDataManager 兼容）"""
+        if self._held_deltas is None:
+            self._held_deltas = []
+
+    def release_notifications(self):
+        """发出暂存期间的通知：只有一次提交时按其 delta 发出事件，多次提交合并为一次整体刷新"""
+        held, self._held_deltas = self._held_deltas, None
+        if held:
+            self._notify_changed(held[0] if len(held) == 1 else None)
+
+    def _notify_changed(self, delta=None):
+        if self._held_deltas is not None:
+            self._held_deltas.append(delta)
+            return
+        for callback in list(self._change_listeners):
+            try:
+                callback()
+            except Exception as e:
+                print(f"变更回调执行失败: {e}")
+        if self._event_subscribers:
+            if delta is None or len(delta.nodes) + len(delta.edges) > self.LARGE_CHANGE_THRESHOLD:
+                events = [GraphEvent(graph_events.GRAPH_RESET)]
+            else:
+                events = self._delta_events(delta)
+                events.append(GraphEvent(graph_events.BATCH_COMMITTED, data=len(events)))
+            self._emit(events)
+
+    def _emit(self, events):
+        for callback in list(self._event_subscribers):
+            for event in events:
+                try:
+                    callback(event)
+                except Exception as e:
+                    print(f"变更事件处理失败: {e}")
+
+    def _delta_events(self, delta):
+        """比较 delta 中记录的修改前的行与数据库中的当前行，生成与 GraphDataManager 相同顺序的变更事件"""
+        nodes = self._fetch_by_keys(
+            "SELECT name, type, attributes, resources FROM nodes WHERE name IN ({marks})", list(delta.nodes))
+        edges = self._fetch_edges(delta.edges)
+        renames = {new: old for new, old in delta.renames.items() if new in nodes and old not in nodes}
+        renamed_from = set(renames.values())
+        events = []
+        for key, before in delta.edges.items():
+            if before is not None and key not in edges:
+                events.append(GraphEvent(graph_events.EDGE_REMOVED, key, _edge_data(before)))
+        for name, before in delta.nodes.items():
+            if before is not None and name not in nodes and name not in renamed_from:
+                events.append(GraphEvent(graph_events.NODE_REMOVED, name, _node_data(before)))
+        for new, old in renames.items():
+            events.append(GraphEvent(graph_events.NODE_RENAMED, new, _node_data(nodes[new]), old_key=old))
+        for name, before in delta.nodes.items():
+            row = nodes.get(name)
+            if name in renames or row is None:
+                continue
+            if before is None:
+                events.append(GraphEvent(graph_events.NODE_ADDED, name, _node_data(row)))
+            elif tuple(before) != row:
+                events.append(GraphEvent(graph_events.NODE_UPDATED, name, _node_data(row)))
+        for key, before in delta.edges.items():
+            row = edges.get(key)
+            if row is None:
+                continue
+            if before is None:
+                events.append(GraphEvent(graph_events.EDGE_ADDED, key, _edge_data(row)))
+            elif tuple(before) != row:
+                events.append(GraphEvent(graph_events.EDGE_UPDATED, key, _edge_data(row)))
+        return events
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        批量修改上下文：块内所有修改在同一个 SQLite 事务中提交，并合并为一个撤销步骤；
+        抛出异常时回滚数据库事务并继续抛出。
+        """
+        if self._transaction is not None:
+            yield self
+            return
+
+        self._transaction = _GraphDelta()
+        try:
+            yield self
+        except BaseException:
+            self._transaction = None
+            self.conn.rollback()
+            self._graph_cache = None  # 缓存可能已被部分修改，下次访问时重新加载
+            print("事务已回滚")
+            raise
+        delta, self._transaction = self._transaction, None
+        self._commit_change(delta)
+
+    @contextlib.contextmanager
+    def defer_checkpoints(self):
+        """与 GraphDataManager 兼容；数据库每次提交只写受影响的行，无需推迟"""
+        yield self
+
+    def _begin_change(self):
+        if self._transaction is not None:
+            return self._transaction
+        return _GraphDelta()
+
+    def _commit_change(self, delta):
+        if delta is self._transaction:
+            return
+        self.conn.commit()
+        if not delta:
+            return
+        self._current_version += 1
+        self.undo_stack.append(delta)
+        self.redo_stack.clear()
+        self._notify_changed(delta)
+
+    # ------------------- 持久化与导入导出 -------------------
+    def checkpoint(self):
+        """把 WAL 日志合并回数据库文件"""
+        self.conn.commit()
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def request_save(self, changed=True):
+        """
+        直接修改过 .graph 缓存后调用，把有差异的行写回数据库
+        :param changed: 为 False 时调用方没有修改缓存，数据库每次修改已即时提交，无需写入
+        """
+        if changed:
+            self.sync_graph_cache()
+
+    def snapshot_view(self):
+        """与 GraphDataManager 兼容的自动保存接口；数据库每次修改已即时提交"""
+        return {"version": self._current_version}
+
+    def write_checkpoint(self, snapshot, fmt=None):
+        return True
+
+    def load_graph_from_json(self, progress_callback=None):
+        """
+        与 GraphDataManager 兼容的加载接口：数据库为空且 JSON 文件存在时从中导入一次；
+        否则数据已在数据库中，只丢弃 .graph 缓存，通知订阅者完整刷新
+        :param progress_callback: 为兼容而保留，不调用
+        """
+        if self.json_path and os.path.exists(self.json_path) and self._count("nodes") == 0:
+            self.import_json(self.json_path)
+            return
+        self._graph_cache = None
+        self._current_version += 1
+        self._emit([GraphEvent(graph_events.GRAPH_RESET)])
+
+    def import_json(self, json_path):
+        """从 JSON 图文件批量导入（单个事务）"""
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO nodes(name, type, attributes, resources) VALUES (?, ?, ?, ?)",
+                ((node["name"], node.get("type", ""), _dumps(node.get("attributes", {})),
+                  _dumps(node.get("resources", []))) for node in data.get("nodes", []))
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO edges(source, target, relation_type, resources) VALUES (?, ?, ?, ?)",
+                ((edge["source"], edge["target"], edge.get("relation_type", ""),
+                  _dumps(edge.get("resources", []))) for edge in data.get("edges", []))
+            )
+        self._graph_cache = None
+        self._current_version += 1
+        self._notify_changed()
+
+    def save_graph_to_json(self, filepath=None):
+        """
+        导出为 JSON 文件
+        插件直接修改 .graph 缓存后也会调用本方法保存，因此先把缓存中有差异的行写回数据库
+        """
+        self.sync_graph_cache()
+        filepath = filepath or self.json_path
+        if filepath:
+            self.export_json(filepath)
+
+    def export_json(self, filepath, indent=4):
+        """
+        把当前图数据流式导出为 JSON 文件（逐行从数据库读出并序列化，不构造完整的数据字典）
+        :param indent: 缩进；None 为紧凑格式
+        """
+        nodes = ({"name": row[0], **_node_data(row[1:])}
+                 for row in self.conn.execute("SELECT name, type, attributes, resources FROM nodes"))
+        edges = ({"source": row[0], "target": row[1], **_edge_data(row[2:])}
+                 for row in self.conn.execute("SELECT source, target, relation_type, resources FROM edges"))
+        with open(filepath, 'w', encoding='utf-8') as f:
+            write_json_stream(f, [("nodes", nodes), ("edges", edges)], indent=indent)
+
+    def save_graph_to_jsonld(self, filepath=None, indent=4, ndjson=None):
+        """
+        将当前图数据流式保存为 JSON-LD 格式文件（经 .graph 缓存遍历邻接结构）
+        :param ndjson: 是否每行输出一个节点文档（NDJSON-LD），默认按扩展名判断
+        """
+        if filepath is None:
+            filepath = "graph_data.jsonld"
+        save_jsonld(self.graph, filepath, indent=indent, ndjson=ndjson)
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    # ------------------- 节点与关系操作 -------------------
+    def add_node(self, name, node_type, attributes):
+        """添加或更新节点"""
+        old_row = self._node_row(name)
+        delta = self._begin_change()
+        self._touch_node(delta, name)
+        resources = old_row[2] if old_row is not None else '[]'
+        self._put_node(name, (node_type, _dumps(attributes), resources))
+        print(f"{'更新' if old_row is not None else '添加'}节点: {name}")
+        self._commit_change(delta)
+
+    def _fetch_by_keys(self, query, keys, key_width=1):
+        """按主键分块批量读取行，返回 主键 -> 其余列（分块以避开 SQLite 的参数个数上限）"""
+        mark = "?" if key_width == 1 else "(" + ",".join("?" * key_width) + ")"
+        step = 900 // key_width
+        rows = {}
+        for start in range(0, len(keys), step):
+            chunk = keys[start:start + step]
+            params = chunk if key_width == 1 else [value for key in chunk for value in key]
+            for row in self.conn.execute(query.format(marks=",".join([mark] * len(chunk))), params):
+                rows[row[0] if key_width == 1 else row[:key_width]] = row[key_width:]
+        return rows
+
+    def _fetch_edges(self, keys):
+        """
+        批量读取指定的边，返回 (source, target) -> (relation_type, resources)
+        按源节点分块查询（走主键前缀），比逐个匹配 (source, target) 行值快得多，再在内存中筛选
+        """
+        wanted = set(keys)
+        sources = list({source for source, _ in wanted})
+        rows = {}
+        for start in range(0, len(sources), 900):
+            chunk = sources[start:start + 900]
+            query = "SELECT source, target, relation_type, resources FROM edges WHERE source IN ({})".format(
+                ",".join("?" * len(chunk)))
+            for source, target, relation_type, resources in self.conn.execute(query, chunk):
+                if (source, target) in wanted:
+                    rows[(source, target)] = (relation_type, resources)
+        return rows
+
+    def add_nodes_from(self, nodes):
+        """
+        批量添加或更新节点（单个提交），行通过 executemany 一次写入
+        :param nodes: (name, node_type, attributes) 或 (name, node_type, attributes, resources) 元组的可迭代对象；
+                      resources 为空时保留已有节点的资源
+        :return: 处理的节点数
+        """
+        items = {name: (node_type, _dumps(attributes), _dumps(resources[0]) if resources and resources[0] else None)
+                 for name, node_type, attributes, *resources in nodes}
+        if not items:
+            return 0
+        names = list(items)
+        existing = self._fetch_by_keys(
+            "SELECT name, type, attributes, resources FROM nodes WHERE name IN ({marks})", names)
+
+        delta = self._begin_change()
+        for name in names:
+            if name not in delta.nodes:
+                delta.nodes[name] = existing.get(name)
+        self.conn.executemany(
+            "INSERT INTO nodes(name, type, attributes, resources) VALUES (?1, ?2, ?3, COALESCE(?4, '[]')) "
+            "ON CONFLICT(name) DO UPDATE SET type = excluded.type, attributes = excluded.attributes, "
+            "resources = COALESCE(?4, nodes.resources)",
+            ((name,) + items[name] for name in sorted(items)))  # 按主键顺序写入 B 树更快
+        self._graph_cache = None
+        print(f"批量添加节点: {len(items)} 个")
+        self._commit_change(delta)
+        return len(items)
+
+    def add_relationships_from(self, relationships):
+        """
+        批量添加关系（单个提交），端点不存在的关系被跳过
+        :param relationships: (source, target, relation_type) 或 (source, target, relation_type, resources)
+                              元组的可迭代对象；resources 为空时保留已有关系的资源
+        :return: 添加的关系数
+        """
+        items = {(source, target): (relation_type, _dumps(resources[0]) if resources and resources[0] else None)
+                 for source, target, relation_type, *resources in relationships}
+        endpoints = list({name for key in items for name in key})
+        known = self._fetch_by_keys("SELECT name FROM nodes WHERE name IN ({marks})", endpoints)
+        skipped = [key for key in items if key[0] not in known or key[1] not in known]
+        for key in skipped:
+            del items[key]
+        if skipped:
+            print(f"{len(skipped)} 条关系的端点不存在，已跳过")
+        if not items:
+            return 0
+        keys = list(items)
+        existing = self._fetch_edges(keys)
+
+        delta = self._begin_change()
+        for key in keys:
+            if key not in delta.edges:
+                delta.edges[key] = existing.get(key)
+        self.conn.executemany(
+            "INSERT INTO edges(source, target, relation_type, resources) VALUES (?1, ?2, ?3, COALESCE(?4, '[]')) "
+            "ON CONFLICT(source, target) DO UPDATE SET relation_type = excluded.relation_type, "
+            "resources = COALESCE(?4, edges.resources)",
+            (key + items[key] for key in sorted(keys)))  # 按主键顺序写入 B 树更快
+        self._graph_cache = None
+        print(f"批量添加关系: {len(items)} 条")
+        self._commit_change(delta)
+        return len(items)
+
+    def merge_graph(self, data, policy=MERGE_OVERWRITE):
+        """
+        把另一份图数据批量合并进数据库（单个提交），语义与 GraphDataManager.merge_graph 相同
+        已存在的行按主键分块批量读取，合并结果用 executemany 一次写入
+        :return: (写入的节点数, 写入的关系数)
+        """
+        if policy not in MERGE_POLICIES:
+            raise ValueError(f"未知的合并策略: {policy}")
+
+        # 先在导入数据内部按同样的策略合并重复的名称，再与库中已有的行合并
+        node_items = {}
+        for node in data.get("nodes", ()):
+            incoming = {"type": node["type"], "attributes": node.get("attributes", {}),
+                        "resources": node.get("resources") or []}
+            current = node_items.get(node["name"])
+            if current is not None:
+                incoming = _resolve_conflict(current, incoming, policy)
+                if incoming is None:
+                    continue
+            node_items[node["name"]] = incoming
+        existing_nodes = self._fetch_by_keys(
+            "SELECT name, type, attributes, resources FROM nodes WHERE name IN ({marks})", list(node_items))
+        node_rows = {}
+        for name, incoming in node_items.items():
+            row = existing_nodes.get(name)
+            if row is not None:
+                current = {"type": row[0], "attributes": json.loads(row[1]), "resources": json.loads(row[2])}
+                incoming = _resolve_conflict(current, incoming, policy)
+                if incoming is None:
+                    continue
+            node_rows[name] = (incoming["type"], _dumps(incoming.get("attributes", {})),
+                               _dumps(incoming.get("resources", [])))
+
+        edge_items = {}
+        for edge in data.get("edges", ()):
+            key = (edge["source"], edge["target"])
+            incoming = {"relation_type": edge["relation_type"], "resources": edge.get("resources") or []}
+            current = edge_items.get(key)
+            if current is not None:
+                incoming = _resolve_conflict(current, incoming, policy)
+                if incoming is None:
+                    continue
+            edge_items[key] = incoming
+        endpoints = list({name for key in edge_items for name in key if name not in node_items})
+        known = self._fetch_by_keys("SELECT name FROM nodes WHERE name IN ({marks})", endpoints)
+        skipped = [key for key in edge_items
+                   if not (key[0] in node_items or key[0] in known) or not (key[1] in node_items or key[1] in known)]
+        for key in skipped:
+            del edge_items[key]
+        if skipped:
+            print(f"{len(skipped)} 条关系的端点不存在，已跳过")
+        existing_edges = self._fetch_edges(edge_items)
+        edge_rows = {}
+        for key, incoming in edge_items.items():
+            row = existing_edges.get(key)
+            if row is not None:
+                incoming = _resolve_conflict({"relation_type": row[0], "resources": json.loads(row[1])},
+                                             incoming, policy)
+                if incoming is None:
+                    continue
+            edge_rows[key] = (incoming["relation_type"], _dumps(incoming.get("resources", [])))
+        if not node_rows and not edge_rows:
+            return 0, 0
+
+        delta = self._begin_change()
+        for name in node_rows:
+            if name not in delta.nodes:
+                delta.nodes[name] = existing_nodes.get(name)
+        for key in edge_rows:
+            if key not in delta.edges:
+                delta.edges[key] = existing_edges.get(key)
+        self.conn.executemany(
+            "INSERT INTO nodes(name, type, attributes, resources) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET type = excluded.type, attributes = excluded.attributes, "
+            "resources = excluded.resources",
+            ((name,) + node_rows[name] for name in sorted(node_rows)))
+        self.conn.executemany(
+            "INSERT INTO edges(source, target, relation_type, resources) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(source, target) DO UPDATE SET relation_type = excluded.relation_type, "
+            "resources = excluded.resources",
+            (key + edge_rows[key] for key in sorted(edge_rows)))
+        self._graph_cache = None
+        print(f"合并图数据: 节点 {len(node_rows)} 个，关系 {len(edge_rows)} 条（策略: {policy}）")
+        self._commit_change(delta)
+        return len(node_rows), len(edge_rows)
+
+    def delete_node(self, name):
+        """删除指定节点及其所有连接"""
+        if not self.has_node(name):
+            print(f"节点 '{name}' 不存在，无法删除")
+            return False
+
+        delta = self._begin_change()
+        self._touch_node(delta, name)
+        self._touch_incident_edges(delta, name)
+        self._drop_node(name)
+        print(f"删除节点 '{name}'")
+        self._commit_change(delta)
+        return True
+
+    def add_relationship(self, source, target, relation_type):
+        """添加一条关系"""
+        if not self.has_node(source):
+            print(f"源节点 '{source}' 不存在")
+            return False
+        if not self.has_node(target):
+            print(f"目标节点 '{target}' 不存在")
+            return False
+
+        delta = self._begin_change()
+        self._touch_edge(delta, source, target)
+        old_row = self._edge_row(source, target)
+        self._put_edge(source, target, (relation_type, old_row[1] if old_row is not None else '[]'))
+        print(f"添加关系: {source} -> {target} ({relation_type})")
+        self._commit_change(delta)
+        return True
+
+    def delete_relationship(self, source, target):
+        """删除指定关系"""
+        if not self.has_edge(source, target):
+            print(f"关系 '{source}' -> '{target}' 不存在，无法删除")
+            return False
+
+        delta = self._begin_change()
+        self._touch_edge(delta, source, target)
+        self._drop_edge(source, target)
+        print(f"删除关系: {source} -> {target}")
+        self._commit_change(delta)
+        return True
+
+    def edit_node(self, name, new_type, new_attributes):
+        """编辑已有节点的信息"""
+        row = self._node_row(name)
+        if row is None:
+            print(f"节点 '{name}' 不存在，无法编辑")
+            return False
+
+        delta = self._begin_change()
+        self._touch_node(delta, name)
+        self._put_node(name, (new_type, _dumps(new_attributes), row[2]))
+        print(f"编辑节点: {name}")
+        self._commit_change(delta)
+        return True
+
+    def edit_relationship(self, source, target, new_relation_type):
+        """编辑已有关系的信息"""
+        row = self._edge_row(source, target)
+        if row is None:
+            print(f"关系 '{source}' -> '{target}' 不存在，无法编辑")
+            return False
+
+        delta = self._begin_change()
+        self._touch_edge(delta, source, target)
+        self._put_edge(source, target, (new_relation_type, row[1]))
+        print(f"编辑关系: {source} -> {target} ({new_relation_type})")
+        self._commit_change(delta)
+        return True
+
+    def batch_edit_relationships(self, updates):
+        """批量编辑关系（支持 relation_type 与 resources 字段）"""
+        delta = self._begin_change()
+        for (source, target), new_data in updates.items():
+            row = self._edge_row(source, target)
+            if row is None:
+                print(f"关系 {source} -> {target} 不存在")
+                continue
+            self._touch_edge(delta, source, target)
+            relation_type = new_data.get("relation_type", row[0])
+            resources = _dumps(new_data["resources"]) if "resources" in new_data else row[1]
+            self._put_edge(source, target, (relation_type, resources))
+            print(f"批量编辑关系: {source} -> {target}")
+        self._commit_change(delta)
+
+    def rename_node(self, old_name, new_name, merge=False):
+        """
+        重命名节点，边直接在索引上改写端点
+        :param merge: 新名称已存在时是否合并到该节点，为 False 时不做修改并返回 False
+        """
+        row = self._node_row(old_name)
+        if row is None:
+            print(f"节点 '{old_name}' 不存在，无法重命名")
+            return False
+        if old_name == new_name:
+            return True
+        target_row = self._node_row(new_name)
+        target_exists = target_row is not None
+        if target_exists and not merge:
+            print(f"节点 '{new_name}' 已存在，无法重命名")
+            return False
+
+        delta = self._begin_change()
+        self._touch_node(delta, old_name)
+        self._touch_node(delta, new_name)
+        for source, target in self._incident_edges(old_name):
+            self._touch_edge(delta, source, target)
+            self._touch_edge(delta, new_name if source == old_name else source,
+                             new_name if target == old_name else target)
+
+        if not target_exists:
+            # 与 GraphDataManager 一致：合并到已有节点不是重命名，撤销时按普通的节点和边修改恢复
+            delta.add_rename(old_name, new_name)
+        elif row[2] == '[]':
+            # 同样与 GraphDataManager 一致：旧节点没有资源时保留目标节点的资源
+            row = (row[0], row[1], target_row[2])
+        self._put_node(new_name, row)
+        self.conn.execute("UPDATE OR REPLACE edges SET source = ? WHERE source = ?", (new_name, old_name))
+        self.conn.execute("UPDATE OR REPLACE edges SET target = ? WHERE target = ?", (new_name, old_name))
+        self.conn.execute("DELETE FROM nodes WHERE name = ?", (old_name,))
+        if self._graph_cache is not None:
+            nx.relabel_nodes(self._graph_cache, {old_name: new_name}, copy=False)
+        print(f"重命名节点: {old_name} -> {new_name}")
+        self._commit_change(delta)
+        return True
+
+    def rename_nodes(self, mapping, merge=False):
+        """批量重命名节点（单个事务），返回实际重命名的节点数"""
+        renamed = 0
+        with self.transaction():
+            for old_name, new_name in mapping.items():
+                if old_name != new_name and self.rename_node(old_name, new_name, merge=merge):
+                    renamed += 1
+        return renamed
+
+    def batch_update_nodes(self, old_name, new_name):
+        """重命名节点（用于自动标准化），新名称已存在时合并到该节点"""
+        return self.rename_node(old_name, new_name, merge=True)
+
+    def standardize_node_name(self, input_name):
+        """标准化单个节点名称"""
+        if hasattr(self, 'standardizer'):
+            return self.standardizer.standardize(input_name)
+        return input_name
+
+    def auto_standardize(self):
+        """自动标准化所有节点名称"""
+        if hasattr(self, 'standardizer'):
+            mapping = {}
+            for (node,) in self.conn.execute("SELECT name FROM nodes"):
+                standardized = self.standardizer.standardize(node)
+                if standardized and standardized != node:
+                    mapping[node] = standardized
+            return self.rename_nodes(mapping, merge=True)
+        return 0
+
+    def clear_graph(self):
+        """清空整个图"""
+        delta = self._begin_change()
+        for name, node_type, attributes, resources in self.conn.execute(
+                "SELECT name, type, attributes, resources FROM nodes"):
+            delta.nodes.setdefault(name, (node_type, attributes, resources))
+        for source, target, relation_type, resources in self.conn.execute(
+                "SELECT source, target, relation_type, resources FROM edges"):
+            delta.edges.setdefault((source, target), (relation_type, resources))
+        self.conn.execute("DELETE FROM edges")
+        self.conn.execute("DELETE FROM nodes")
+        if self._graph_cache is not None:
+            self._graph_cache.clear()
+        self._commit_change(delta)
+        print("图已清空")
+
+    def undo(self):
+        """撤销上一步操作"""
+        if len(self.undo_stack) > 0:
+            inverse = self._apply_delta(self.undo_stack.pop())
+            self.conn.commit()
+            self.redo_stack.append(inverse)
+            self._current_version += 1
+            self._notify_changed(inverse)
+            print("撤销操作成功")
+            return True
+        print("没有可撤销的操作")
+        return False
+
+    def redo(self):
+        """重做撤销的操作"""
+        if len(self.redo_stack) > 0:
+            inverse = self._apply_delta(self.redo_stack.pop())
+            self.conn.commit()
+            self.undo_stack.append(inverse)
+            self._current_version += 1
+            self._notify_changed(inverse)
+            print("重做操作成功")
+            return True
+        print("没有可重做的操作")
+        return False
+
+    # ------------------- 查询 -------------------
+    def get_all_nodes(self):
+        """返回所有节点数据"""
+        return [
+            {"name": name, "type": node_type, "attributes": json.loads(attributes), "resources": json.loads(resources)}
+            for name, node_type, attributes, resources in
+            self.conn.execute("SELECT name, type, attributes, resources FROM nodes")
+        ]
+
+    def get_all_relationships(self):
+        """返回所有关系数据"""
+        return [
+            {"source": source, "target": target, "relation_type": relation_type, "resources": json.loads(resources)}
+            for source, target, relation_type, resources in
+            self.conn.execute("SELECT source, target, relation_type, resources FROM edges")
+        ]
+
+    def get_graph_data(self):
+        """返回完整的图数据"""
+        return {
+            "nodes": self.get_all_nodes(),
+            "edges": self.get_all_relationships()
+        }
+
+    def get_nodes_by_type(self, node_type):
+        """按类型查询节点（走 type 索引）"""
+        return [
+            {"name": name, "type": node_type, "attributes": json.loads(attributes), "resources": json.loads(resources)}
+            for name, attributes, resources in self.conn.execute(
+                "SELECT name, attributes, resources FROM nodes WHERE type = ?", (node_type,))
+        ]
+
+    def get_relationships_by_type(self, relation_type):
+        """按关系类型查询边（走 relation_type 索引）"""
+        return [
+            {"source": source, "target": target, "relation_type": relation_type, "resources": json.loads(resources)}
+            for source, target, resources in self.conn.execute(
+                "SELECT source, target, resources FROM edges WHERE relation_type = ?", (relation_type,))
+        ]
+
+    @property
+    def index(self):
+        """二级索引（只读，接口同 GraphIndex），直接查询数据库，始终与当前数据一致"""
+        return self._index
+
+    def get_node_names_by_type(self, node_type):
+        """按类型查询节点名（走 type 索引）"""
+        return [name for (name,) in self.conn.execute("SELECT name FROM nodes WHERE type = ?", (node_type,))]
+
+    def get_nodes_with_attribute(self, key):
+        """查询具有指定属性键的节点名（在库内扫描属性，不加载 .graph 缓存）"""
+        return [name for (name,) in self.conn.execute(_NODES_WITH_ATTRIBUTE, (key,))]
+
+    def get_type_statistics(self):
+        """返回 {节点类型: {"count": 节点数, "degree": 度数之和}}，在数据库中分组统计"""
+        statistics = {node_type: {"count": count, "degree": 0} for node_type, count in self.conn.execute(
+            "SELECT type, COUNT(*) FROM nodes GROUP BY type")}
+        # 每条边给源节点和目标节点的类型各计一度
+        for column in ("source", "target"):
+            for node_type, degree in self.conn.execute(
+                    f"SELECT nodes.type, COUNT(*) FROM edges JOIN nodes ON nodes.name = edges.{column} "
+                    "GROUP BY nodes.type"):
+                statistics[node_type]["degree"] += degree
+        return statistics
+
+    def get_relation_type_counts(self):
+        """返回 {关系类型: 关系数}（走 relation_type 索引）"""
+        return dict(self.conn.execute("SELECT relation_type, COUNT(*) FROM edges GROUP BY relation_type"))
+
+    def has_node(self, node_name):
+        """检查节点是否存在"""
+        return self.conn.execute("SELECT 1 FROM nodes WHERE name = ?", (node_name,)).fetchone() is not None
+
+    def has_edge(self, source, target):
+        """检查边是否存在"""
+        return self._edge_row(source, target) is not None
+
+    def get_node_degree(self, node_name):
+        """获取节点的度数"""
+        if not self.has_node(node_name):
+            return None
+        in_degree = self.conn.execute("SELECT COUNT(*) FROM edges WHERE target = ?", (node_name,)).fetchone()[0]
+        out_degree = self.conn.execute("SELECT COUNT(*) FROM edges WHERE source = ?", (node_name,)).fetchone()[0]
+        return {
+            "in_degree": in_degree,
+            "out_degree": out_degree,
+            "total_degree": in_degree + out_degree
+        }
+
+    def get_connected_nodes(self, node_name):
+        """获取与指定节点连接的所有节点"""
+        if not self.has_node(node_name):
+            return None
+        predecessors = [row[0] for row in self.conn.execute(
+            "SELECT source FROM edges WHERE target = ?", (node_name,))]
+        successors = [row[0] for row in self.conn.execute(
+            "SELECT target FROM edges WHERE source = ?", (node_name,))]
+        return {
+            "predecessors": predecessors,
+            "successors": successors,
+            "neighbors": list(successors)
+        }
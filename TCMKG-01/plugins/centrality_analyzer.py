@@ -12,6 +12,7 @@ class CentralityPlugin(QObject):
     def __init__(self, graph_manager):
         super().__init__()
         self.name = "中心性分析插件"
+        self.graph_manager = graph_manager
         # 获取完整图数据并构建 NetworkX 图
         self.graph_data = graph_manager.get_graph_data()
         self._build_graph()
@@ -29,12 +30,18 @@ class CentralityPlugin(QObject):
             )
 
     def _degree_centrality(self):
-        dc = nx.degree_centrality(self.G)
+        # 只计算目标类别的节点：通过类型索引取出各类别的节点，而不是对全图计算后再分桶
+        # 归一化系数只算一次；与 nx.degree_centrality 一致，单节点图的得分记为 1
+        if len(self.G) > 1:
+            scale = 1.0 / (len(self.G) - 1)
+            score_of = lambda n: self.G.degree(n) * scale
+        else:
+            score_of = lambda n: 1.0
         categorized = {'方剂': [], '药材': [], '治法': [], '证型': []}
-        for n, score in dc.items():
-            t = self.G.nodes[n].get('type', '')
-            if t in categorized:
-                categorized[t].append((n, round(score, 4)))
+        for t, items in categorized.items():
+            for n in self.graph_manager.get_node_names_by_type(t):
+                if n in self.G:
+                    items.append((n, round(score_of(n), 4)))
         rows = []
         for t, items in categorized.items():
             for node, sc in sorted(items, key=lambda x: x[1], reverse=True)[:5]:
@@ -299,8 +299,9 @@ class DataCleaner:
                     name = re.sub(r['pattern'], r['replacement'], name)
             if name != u:
                 nx.relabel_nodes(G, {u: name}, copy=False)
-            # 属性替换
-            attrs = data.get('attributes', {})
+                data = G.nodes[name]
+            # 属性替换：构造新的字典整体替换，不原地修改（后台保存可能正在序列化原字典）
+            attrs = dict(data.get('attributes') or {})
             for r in rules:
                 fld = r['field']
                 if fld in attrs:
@@ -317,11 +318,11 @@ class DataCleaner:
                 # 名称映射
                 if field == 'name' and u in map_dict:
                     nx.relabel_nodes(G, {u: map_dict[u]}, copy=False)
-                # 属性映射
-                attrs = data.get('attributes', {})
+                    data = G.nodes[map_dict[u]]
+                # 属性映射：同样整体替换属性字典
+                attrs = data.get('attributes') or {}
                 if field in attrs and attrs[field] in map_dict:
-                    attrs[field] = map_dict[attrs[field]]
-                data['attributes'] = attrs
+                    data['attributes'] = {**attrs, field: map_dict[attrs[field]]}
 
 
 class Plugin(QObject):
@@ -337,7 +338,7 @@ class Plugin(QObject):
         if dialog.exec_() != QDialog.Accepted:
             return
         opts = dialog.get_selected_options()
-        G = self.graph_manager.get_graph()
+        G = self.graph_manager.graph
         # 执行内置清洗
         for op in opts['builtin']:
             getattr(DataCleaner, op)(G)
@@ -347,6 +348,6 @@ class Plugin(QObject):
         # 映射表处理
         if opts['mapping']:
             DataCleaner.apply_mapping_rules(G, opts['mapping'])
-        # 保存结果
-        self.graph_manager.save_graph_to_json()
+        # 保存结果（挂接了自动保存时在后台写入），并通知界面刷新
+        self.graph_manager.request_save()
         QMessageBox.information(None, "完成", "数据清洗已完成")
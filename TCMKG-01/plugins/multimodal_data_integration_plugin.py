@@ -169,13 +169,12 @@ class MultimodalDataDialog(QDialog):
         res = {"path": self._current_file, "type": self.cb_type.currentText()}
 
         if kind == "N":
-            self.graph_manager.graph.nodes[ident].setdefault("resources", []).append(res)
+            data = self.graph_manager.graph.nodes[ident]
         else:
             src, dst = ident.split("->", 1)
-            for u, v, data in self.graph_manager.graph.edges(data=True):
-                if u == src and v == dst:
-                    data.setdefault("resources", []).append(res)
-                    break
+            data = self.graph_manager.graph.edges[src, dst]
+        # 整体替换资源列表而不是原地追加（后台保存可能正在序列化原列表）
+        data["resources"] = data.get("resources", []) + [res]
 
         self._current_file = None
         self._load_resources()
@@ -201,7 +200,7 @@ class Plugin(QObject):
     def run(self):
         dlg = MultimodalDataDialog(self.graph_manager)
         if dlg.exec_():
-            self.graph_manager.save_graph_to_json()
+            self.graph_manager.request_save()
             QMessageBox.information(None, "多模态资源", "资源已关联并保存")
             return "多模态资源关联完成"
         return "已取消多模态资源关联"
@@ -45,6 +45,23 @@ class NavigatorWidget(QWidget):
         self.update_timer = QTimer()
         self.update_timer.timeout.connect(self.sync_with_main_view)
         self.update_timer.start(1000)  # 每秒同步一次
+
+        # 订阅图数据变更事件，按变化增量维护节点位置，而不是整体重新计算布局
+        if hasattr(graph_manager, "subscribe"):
+            graph_manager.subscribe(self.on_graph_event)
+
+    def on_graph_event(self, event):
+        """处理图数据变更事件：删除/重命名的节点同步调整位置表，新节点的位置在下次同步时获取"""
+        kind = getattr(event, "kind", None)
+        if kind == "node_removed":
+            self.node_positions.pop(event.key, None)
+        elif kind == "node_renamed":
+            if event.old_key in self.node_positions:
+                self.node_positions[event.key] = self.node_positions.pop(event.old_key)
+        elif kind == "batch_committed":
+            self.nav_display.update()
+        elif kind == "graph_reset":
+            self.force_refresh()
     
     def set_graph_view(self, graph_view):
         """设置图形视图引用（用于延迟初始化）"""
@@ -267,6 +267,10 @@ class SearchDialog(QDialog):
 
         # 搜索节点
         if search_type in [0, 1]:
+            # 类型和属性键的取值种类很少，先在索引的键上匹配一次，逐个节点时只需查集合
+            index = self.graph_manager.index
+            matched_types = {t for t in index.nodes_by_type if query_lower in str(t).lower()}
+            matched_keys = {k for k in index.nodes_by_attribute if query_lower in str(k).lower()}
             for node, data in self.graph_manager.graph.nodes(data=True):
                 score = 0
                 match_info = []
@@ -278,7 +282,7 @@ class SearchDialog(QDialog):
 
                 # 节点类型匹配
                 node_type = data.get('type', '')
-                if query_lower in node_type.lower():
+                if node_type in matched_types:
                     score += 5
                     match_info.append(f"类型: {node_type}")
 
@@ -288,7 +292,7 @@ class SearchDialog(QDialog):
                 # 确保 attributes 是字典类型
                 if isinstance(attributes, dict):
                     for key, value in attributes.items():
-                        if query_lower in str(key).lower() or query_lower in str(value).lower():
+                        if key in matched_keys or query_lower in str(value).lower():
                             score += 3
                             match_info.append(f"属性: {key}={value}")
                 else:
@@ -0,0 +1,74 @@
+# tests/conftest.py
+import os
+import sys
+
+import networkx as nx
+import pytest
+
+# 测试直接从源码目录导入 core 包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.graph_data_manager import GraphDataManager  # noqa: E402
+
+
+# 各种取值类型的节点属性，用于导出/导回测试
+EXPORT_ATTRIBUTES = {
+    "性味": "甘、微苦",
+    "用量": 9,
+    "比例": 0.5,
+    "道地": True,
+    "备注": None,
+    "归经": ["脾", "肺"],
+    "炮制": {"方法": "蒸", "次数": 3},
+    "编号": "0123",  # 形如 JSON 的字符串按字符串保留
+    "标记": "true",
+    "说明": "含逗号, \"引号\"\n和换行",
+    "空串": "",
+}
+
+
+def graph_state(graph):
+    """图的全部节点和边数据，用于比较两个时刻的图是否完全一致（与插入顺序无关）"""
+    return ({name: data for name, data in graph.nodes(data=True)},
+            {(source, target): data for source, target, data in graph.edges(data=True)})
+
+
+@pytest.fixture
+def json_path(tmp_path):
+    return str(tmp_path / "graph.json")
+
+
+@pytest.fixture
+def manager(json_path):
+    """启用变更日志、不自动写检查点的图管理器"""
+    graph_manager = GraphDataManager(json_path, checkpoint_interval=0)
+    yield graph_manager
+    if graph_manager.journal is not None:
+        graph_manager.journal.close()
+
+
+@pytest.fixture
+def sample_manager(manager):
+    """含几个中药、证候节点和关系的图"""
+    manager.add_nodes_from([
+        ("人参", "中药", {"性味": "甘、微苦", "归经": ["脾", "肺"], "用量": 9}, [{"title": "本草纲目"}]),
+        ("黄芪", "中药", {"性味": "甘", "用量": 15.5}),
+        ("气虚证", "证候", {}),
+    ])
+    manager.add_relationships_from([
+        ("人参", "气虚证", "治疗", [{"title": "伤寒论"}]),
+        ("黄芪", "气虚证", "治疗"),
+    ])
+    return manager
+
+
+@pytest.fixture
+def export_graph():
+    """直接构造的 networkx 图（不经过图管理器），节点属性覆盖 EXPORT_ATTRIBUTES 中的各种取值"""
+    graph = nx.DiGraph()
+    graph.add_node("人参", type="中药", attributes=dict(EXPORT_ATTRIBUTES), resources=[{"title": "本草纲目"}])
+    graph.add_node("黄芪", type="中药", attributes={"用量": 15})
+    graph.add_node("气虚证", type="证候", attributes={})
+    graph.add_edge("人参", "气虚证", relation_type="治疗", resources=[{"title": "伤寒论"}])
+    graph.add_edge("黄芪", "气虚证", relation_type="治疗")
+    return graph
@@ -0,0 +1,40 @@
+# tests/test_arrow_io.py
+import pytest
+
+from conftest import graph_state
+from core import arrow_io
+from core.arrow_io import read_table, read_table_columns, split_table_paths, write_tables
+from core.import_coordinator import ImportCoordinator, parse_import_file
+
+
+@pytest.fixture
+def pa():
+    return pytest.importorskip("pyarrow")
+
+
+@pytest.mark.parametrize("extension", [".parquet", ".arrow"])
+def test_round_trip(pa, export_graph, manager, tmp_path, monkeypatch, extension):
+    monkeypatch.setattr(arrow_io, "BATCH_SIZE", 2)  # 多个批次（行组）
+    nodes_path, edges_path = split_table_paths(str(tmp_path / f"graph{extension}"))
+    write_tables(export_graph, nodes_path, edges_path)
+
+    table = read_table(nodes_path)
+    assert table.column_names == ["name", "type", "attributes", "resources"]
+    assert pa.types.is_dictionary(table.schema.field("type").type)
+    columns = read_table_columns(edges_path)
+    assert columns["source"] == ["人参", "黄芪"]
+    assert columns["relation_type"] == ["治疗", "治疗"]
+    assert columns["resources"] == ['[{"title":"伤寒论"}]', None]
+    assert parse_import_file(nodes_path).nodes[0] == ["人参", "黄芪", "气虚证"]
+
+    counts, errors = ImportCoordinator(manager, max_workers=1).import_files([edges_path, nodes_path])
+    assert errors == {}
+    assert counts == {nodes_path: 3, edges_path: 2}
+    assert graph_state(manager.graph) == graph_state(export_graph)
+
+
+def test_unknown_extension(export_graph, tmp_path):
+    with pytest.raises(ValueError):
+        write_tables(export_graph, str(tmp_path / "nodes.csv"), str(tmp_path / "edges.csv"))
+    assert arrow_io.table_format("graph.FEATHER") == "arrow"
+    assert arrow_io.table_format("graph.csv") is None
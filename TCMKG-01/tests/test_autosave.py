@@ -0,0 +1,111 @@
+# tests/test_autosave.py
+import json
+import time
+
+import pytest
+from PyQt5.QtCore import QCoreApplication
+
+from conftest import graph_state
+from core import graph_events
+from core.autosave import AutosaveService
+from core.graph_data_manager import GraphDataManager
+from plugins.data_cleaning_plugin import DataCleaner
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def wait_until(qapp, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "等待超时"
+        qapp.processEvents()
+        time.sleep(0.005)
+
+
+def read_nodes(json_path):
+    with open(json_path, encoding="utf-8") as f:
+        return {node["name"] for node in json.load(f)["nodes"]}
+
+
+@pytest.fixture
+def autosave(qapp, manager):
+    service = AutosaveService(manager, delay_ms=20)
+    yield service
+    service.shutdown()
+
+
+def test_edits_are_coalesced_into_one_background_save(qapp, manager, autosave, json_path):
+    saved = []
+    autosave.saved.connect(saved.append)
+    for name in ("人参", "黄芪", "当归"):
+        manager.add_node(name, "中药", {})
+    assert autosave.dirty
+
+    wait_until(qapp, lambda: saved)
+    assert saved == [autosave.version]
+    assert read_nodes(json_path) == {"人参", "黄芪", "当归"}
+    # 检查点写入后日志被压缩
+    with open(json_path + ".journal", "rb") as f:
+        assert f.read() == b""
+
+
+def test_flush_writes_synchronously(manager, autosave, json_path):
+    manager.add_node("人参", "中药", {})
+    autosave.flush()
+    assert not autosave.dirty
+    assert read_nodes(json_path) == {"人参"}
+
+
+def test_request_save_defers_to_autosave(qapp, manager, autosave, json_path):
+    events = []
+    manager.subscribe(events.append)
+    manager.graph.add_node("人参", type="中药", attributes={})  # 插件直接修改图
+    manager.request_save()
+    assert autosave.dirty
+    assert [event.kind for event in events] == [graph_events.GRAPH_RESET]
+
+    wait_until(qapp, lambda: not autosave.dirty and autosave.saved_version == autosave.version)
+    assert read_nodes(json_path) == {"人参"}
+
+    events.clear()
+    manager.request_save(changed=False)
+    assert events == []
+
+
+def test_request_save_without_autosave_writes_immediately(manager, json_path):
+    manager.graph.add_node("人参", type="中药", attributes={})
+    manager.request_save()
+    assert read_nodes(json_path) == {"人参"}
+    reloaded = GraphDataManager(json_path, checkpoint_interval=0)
+    try:
+        assert graph_state(reloaded.graph) == graph_state(manager.graph)
+    finally:
+        reloaded.journal.close()
+
+
+def test_snapshot_is_not_affected_by_later_edits(sample_manager):
+    snapshot = sample_manager.snapshot_view()
+    nodes = {name: data for name, data in snapshot["nodes"]}
+    attributes = nodes["人参"]["attributes"]
+    sample_manager.edit_node("人参", "中药", {"性味": "苦"})
+    sample_manager.rename_node("黄芪", "北芪")
+    assert nodes["人参"]["attributes"] is attributes
+    assert attributes["性味"] == "甘、微苦"
+    assert "黄芪" in nodes
+
+
+def test_cleaning_rules_replace_attribute_dicts(sample_manager):
+    graph = sample_manager.graph
+    snapshot = {name: data for name, data in sample_manager.snapshot_view()["nodes"]}
+
+    DataCleaner.apply_regex_rules(graph, [{"field": "性味", "pattern": "甘", "replacement": "甜"},
+                                          {"field": "name", "pattern": "^黄芪$", "replacement": "北芪"}])
+    DataCleaner.apply_mapping_rules(graph, [{"field": "性味", "map": {"甜、微苦": "甜苦"}}])
+
+    assert graph.nodes["人参"]["attributes"]["性味"] == "甜苦"
+    assert graph.nodes["北芪"]["attributes"]["性味"] == "甜"
+    assert snapshot["人参"]["attributes"]["性味"] == "甘、微苦"
+    assert snapshot["黄芪"]["attributes"]["性味"] == "甘"
@@ -0,0 +1,62 @@
+# tests/test_binary_store.py
+import pytest
+
+from core.binary_store import BinaryGraphReader, BinaryStoreError, write_binary_graph
+
+NODES = [
+    ("人参", {"type": "中药", "attributes": {"性味": "甘", "用量": 9, "归经": ["脾", "肺"]},
+            "resources": [{"title": "本草纲目"}]}),
+    ("气虚证", {"type": "证候", "attributes": {}}),
+    ("", {"type": "", "attributes": {"空": None}}),
+]
+EDGES = [
+    ("人参", "气虚证", {"relation_type": "治疗", "resources": [{"title": "伤寒论"}]}),
+    ("气虚证", "", {"relation_type": "治疗"}),
+]
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "graph.kgb"
+    write_binary_graph(path, NODES, EDGES, journal_seq=42)
+
+    reader = BinaryGraphReader(path)
+    assert reader.journal_seq == 42
+    assert (reader.node_count, reader.edge_count) == (3, 2)
+    assert list(reader.iter_nodes()) == NODES
+    assert list(reader.iter_edges()) == EDGES
+    assert reader.node_payload(0) == {"attributes": NODES[0][1]["attributes"], "resources": NODES[0][1]["resources"]}
+    assert reader.node_payload(1) == {}
+    assert reader.edge_payload(1) == {}
+
+
+def test_iter_without_payload(tmp_path):
+    path = tmp_path / "graph.kgb"
+    write_binary_graph(path, NODES, EDGES)
+
+    reader = BinaryGraphReader(path)
+    assert list(reader.iter_nodes(with_payload=False)) == [(name, {"type": data["type"]}) for name, data in NODES]
+    assert list(reader.iter_edges(with_payload=False)) == [
+        (source, target, {"relation_type": data["relation_type"]}) for source, target, data in EDGES]
+
+
+def test_empty_graph(tmp_path):
+    path = tmp_path / "graph.kgb"
+    write_binary_graph(path, [], [])
+
+    reader = BinaryGraphReader(path)
+    assert list(reader.iter_nodes()) == []
+    assert list(reader.iter_edges()) == []
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "graph.kgb"
+    path.write_bytes(b'{"nodes": [], "edges": []}')
+    with pytest.raises(BinaryStoreError):
+        BinaryGraphReader(path)
+
+
+def test_rejects_non_string_names(tmp_path):
+    path = tmp_path / "graph.kgb"
+    with pytest.raises(BinaryStoreError):
+        write_binary_graph(path, [(1, {"type": "中药"})], [])
+    assert not path.exists()
@@ -0,0 +1,66 @@
+# tests/test_chunked_import.py
+import os
+
+import pytest
+
+from core import csv_sniffer
+from core.data_importer import DataImporter, iter_csv_chunks
+from conftest import graph_state
+
+
+def write_nodes(path, count, encoding="utf-8"):
+    lines = ["name,type,attributes"] + [f'药材{i},中药,"{{""编号"": {i}}}"' for i in range(count)]
+    path.write_bytes(("\n".join(lines) + "\n").encode(encoding))
+    return str(path)
+
+
+def test_iter_csv_chunks_reports_byte_progress(tmp_path):
+    filepath = write_nodes(tmp_path / "nodes.csv", 25)
+    chunks = list(iter_csv_chunks(filepath, chunk_size=10))
+    assert [len(frame) for frame, _, _ in chunks] == [10, 10, 5]
+    total = os.path.getsize(filepath)
+    assert all(chunk_total == total for _, _, chunk_total in chunks)
+    assert chunks[-1][1] == total
+    assert chunks[0][0]["name"].tolist()[:2] == ["药材0", "药材1"]
+
+
+def test_import_csv_chunked_commits_each_chunk(manager, tmp_path):
+    filepath = write_nodes(tmp_path / "nodes.csv", 25, "gbk")
+    progress = []
+    imported = DataImporter(manager).import_csv_chunked(
+        filepath, chunk_size=10, progress_callback=lambda done, total, count: progress.append(count))
+    assert imported == 25
+    assert progress == [10, 20, 25]
+    assert manager.graph.nodes["药材24"]["attributes"] == {"编号": 24}
+
+    manager.undo()  # 每块是一个撤销步骤
+    assert manager.graph.number_of_nodes() == 20
+
+
+def test_import_relationships_chunked(sample_manager, tmp_path):
+    path = tmp_path / "edges.csv"
+    path.write_text("source,target,relation_type\n人参,黄芪,配伍\n黄芪,人参,配伍\n人参,不存在,治疗\n", encoding="utf-8")
+    assert DataImporter(sample_manager).import_csv_chunked(str(path), node_file=False, chunk_size=2) == 2
+    _, edges = graph_state(sample_manager.graph)
+    assert edges[("人参", "黄芪")]["relation_type"] == "配伍"
+    assert ("人参", "不存在") not in edges
+
+
+def test_gbk_after_long_ascii_head(tmp_path, monkeypatch):
+    # 向后扫描到上限仍全是 ASCII 时，分块读取到后文的 GBK 中文才切换编码，不会中途报错
+    monkeypatch.setattr(csv_sniffer._detect_later_encoding, "__defaults__", (1024, 4096))
+    head = "name,type,attributes\n" + "".join(f"n{i},T,{{}}\n" for i in range(10000))
+    path = tmp_path / "late.csv"
+    path.write_bytes(head.encode("ascii") + "人参,中药,{}\n黄芪,中药,{}\n".encode("gbk"))
+    assert csv_sniffer.sniff_csv(str(path)).encoding == csv_sniffer.UTF8_OR_GB18030
+
+    names = [name for frame, _, _ in iter_csv_chunks(str(path), chunk_size=3000) for name in frame["name"]]
+    assert len(names) == 10002
+    assert names[-2:] == ["人参", "黄芪"]
+
+
+@pytest.mark.parametrize("text", ["人参,中药\n", "plain,ascii\n"])
+def test_fallback_codec_round_trip(text):
+    encoded = text.encode("utf-8")
+    assert encoded.decode(csv_sniffer.UTF8_OR_GB18030) == text
+    assert ("abc\n" + text).encode("gbk").decode(csv_sniffer.UTF8_OR_GB18030) == "abc\n" + text
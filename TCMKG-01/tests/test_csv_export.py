@@ -0,0 +1,51 @@
+# tests/test_csv_export.py
+import zipfile
+
+import pytest
+
+from conftest import graph_state
+from core.csv_export import ENCODING, decode_cell, encode_cell, split_csv_paths, write_csv, write_csv_zip
+from core.data_importer import DataImporter
+
+
+@pytest.mark.parametrize("value, text", [
+    ("甘", "甘"),
+    ("0123", '"0123"'),
+    ("true", '"true"'),
+    ("", '""'),
+    (9, "9"),
+    (None, "null"),
+    (["脾", "肺"], '["脾","肺"]'),
+    ({"方法": "蒸"}, '{"方法":"蒸"}'),
+])
+def test_cell_encoding(value, text):
+    assert encode_cell(value) == text
+    assert decode_cell(text) == value
+
+
+def test_csv_round_trip(export_graph, manager, tmp_path):
+    nodes_path, edges_path = str(tmp_path / "nodes.csv"), str(tmp_path / "edges.csv")
+    write_csv(export_graph, nodes_path, edges_path)
+
+    importer = DataImporter(manager)
+    assert importer.csv_kind(nodes_path) == "nodes"
+    assert importer.csv_kind(edges_path) == "relationships"
+    importer.import_nodes_from_csv(nodes_path)
+    importer.import_relationships_from_csv(edges_path)
+    assert graph_state(manager.graph) == graph_state(export_graph)
+
+
+def test_zip_matches_separate_files(export_graph, tmp_path):
+    nodes_path, edges_path = split_csv_paths(str(tmp_path / "graph.csv"))
+    assert (nodes_path, edges_path) == (str(tmp_path / "graph_nodes.csv"), str(tmp_path / "graph_edges.csv"))
+    write_csv(export_graph, nodes_path, edges_path)
+    write_csv_zip(export_graph, str(tmp_path / "graph.zip"))
+
+    with zipfile.ZipFile(tmp_path / "graph.zip") as archive:
+        assert archive.namelist() == ["nodes.csv", "edges.csv"]
+        for member, path in (("nodes.csv", nodes_path), ("edges.csv", edges_path)):
+            with open(path, "rb") as f:
+                assert archive.read(member) == f.read()
+    with open(nodes_path, encoding=ENCODING) as f:
+        header = f.readline()
+    assert header.startswith("name,type,resources,attributes.性味,")
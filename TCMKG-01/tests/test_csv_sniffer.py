@@ -0,0 +1,70 @@
+# tests/test_csv_sniffer.py
+import codecs
+
+import pytest
+
+from core import csv_sniffer
+from core.csv_sniffer import read_csv, sniff_csv
+
+
+@pytest.mark.parametrize("encoding, expected", [
+    ("utf-8", "utf-8"),
+    ("gbk", "gb18030"),
+    ("utf-8-sig", "utf-8-sig"),
+    ("utf-16", "utf-16"),
+])
+def test_detects_encoding(tmp_path, encoding, expected):
+    path = tmp_path / "nodes.csv"
+    path.write_bytes("name,type\n人参,中药\n".encode(encoding))
+    fmt = sniff_csv(str(path))
+    assert fmt.encoding == expected
+    assert fmt.columns == ["name", "type"]
+
+
+@pytest.mark.parametrize("delimiter", [",", "\t", ";", "|"])
+def test_detects_delimiter(tmp_path, delimiter):
+    path = tmp_path / "edges.csv"
+    rows = [["source", "target", "relation_type"], ["人参", "气虚证", "治疗"], ["黄芪", "气虚证", "治疗"]]
+    path.write_text("\n".join(delimiter.join(row) for row in rows) + "\n", encoding="utf-8")
+    fmt = sniff_csv(str(path))
+    assert fmt.delimiter == delimiter
+    assert fmt.columns == ["source", "target", "relation_type"]
+
+
+def test_header_only_and_padded_columns(tmp_path):
+    path = tmp_path / "nodes.csv"
+    path.write_text(" name ; type \n", encoding="utf-8")
+    fmt = sniff_csv(str(path))
+    assert fmt.delimiter == ";"
+    assert fmt.columns == ["name", "type"]
+
+
+def test_gbk_body_after_ascii_head(tmp_path):
+    # 样本全是 ASCII 时向后扫描，后文的 GBK 中文决定编码
+    path = tmp_path / "nodes.csv"
+    head = "name,type\n" + "".join(f"n{i},T\n" for i in range(20000))
+    path.write_bytes(head.encode("ascii") + "人参,中药\n".encode("gbk"))
+    assert sniff_csv(str(path)).encoding == "gb18030"
+    assert read_csv(str(path), dtype=str)["name"].iloc[-1] == "人参"
+
+
+def test_result_is_cached_by_fingerprint(tmp_path):
+    path = tmp_path / "nodes.csv"
+    path.write_text("name,type\n人参,中药\n", encoding="utf-8")
+    fmt = sniff_csv(str(path))
+    assert sniff_csv(str(path)) is fmt
+
+    path.write_bytes("name;type;attributes\n黄芪;中药;{}\n".encode("gbk"))
+    fmt = sniff_csv(str(path))
+    assert (fmt.encoding, fmt.delimiter) == ("gb18030", ";")
+
+
+def test_truncated_multibyte_sample(tmp_path):
+    # 样本截断在多字节字符中间时仍判为 UTF-8
+    path = tmp_path / "nodes.csv"
+    text = "name,type\n" + "人参,中药\n" * 100
+    path.write_text(text, encoding="utf-8")
+    sample_size = len(text.encode("utf-8")) - 2
+    csv_sniffer._cache.clear()
+    assert sniff_csv(str(path), sample_size=sample_size).encoding == "utf-8"
+    assert codecs.lookup(sniff_csv(str(path)).encoding).name == "utf-8"
@@ -0,0 +1,55 @@
+# tests/test_data_importer.py
+import pandas as pd
+import pytest
+
+from core.data_importer import DataImporter, parse_node_columns, parse_node_frame, parse_relationship_columns
+
+
+def test_parse_node_columns_merges_attribute_columns():
+    names, types, attributes, resources = parse_node_columns({
+        "name": ["人参", "黄芪", "当归"],
+        "type": ["中药", "中药", "中药"],
+        "attributes": ['{"性味":"甘"}', "", None],
+        "attributes.用量": ["9", "", 6],
+        "attributes.归经": ['["脾","肺"]', "肺", float("nan")],
+        "resources": ['[{"title":"本草纲目"}]', "", None],
+    })
+    assert names == ["人参", "黄芪", "当归"]
+    assert types == ["中药"] * 3
+    assert attributes == [{"性味": "甘", "用量": 9, "归经": ["脾", "肺"]}, {"归经": "肺"}, {"用量": 6}]
+    assert resources == [[{"title": "本草纲目"}], None, None]
+
+
+@pytest.mark.parametrize("cells, row_number", [
+    (['{"x":1},{"y":2}', '{"z":3}', ""], 2),  # 一个单元格中的多个对象不能使后面的行错位
+    (['{"x":1}', "[1,2]", ""], 3),
+    (['{"x":1}', "", "5"], 4),
+    (['{"x":1}', "", "{bad"], 4),
+])
+def test_parse_node_columns_reports_bad_attributes(cells, row_number):
+    with pytest.raises(ValueError, match=f"第 {row_number} 行的 attributes"):
+        parse_node_columns({"name": ["a", "b", "c"], "type": ["T"] * 3, "attributes": cells})
+
+
+def test_parse_relationship_columns_rejects_non_list_resources():
+    with pytest.raises(ValueError, match="第 3 行的 resources"):
+        parse_relationship_columns({"source": ["a", "b"], "target": ["b", "c"], "relation_type": ["R", "R"],
+                                    "resources": ["[]", '{"title":"伤寒论"}']})
+
+
+def test_parse_requires_columns():
+    with pytest.raises(ValueError, match="type"):
+        parse_node_frame(pd.DataFrame({"name": ["a"]}), "nodes.csv")
+
+
+def test_import_frames_skip_missing_endpoints(manager):
+    importer = DataImporter(manager)
+    assert importer.import_nodes_from_frame(pd.DataFrame({
+        "name": ["人参", "气虚证"], "type": ["中药", "证候"], "attributes": ['{"性味":"甘"}', ""]})) == 2
+    assert importer.import_relationships_from_frame(pd.DataFrame({
+        "source": ["人参", "黄芪"], "target": ["气虚证", "气虚证"], "relation_type": ["治疗", "治疗"]})) == 1
+    assert manager.graph.nodes["人参"] == {"type": "中药", "attributes": {"性味": "甘"}}
+    assert list(manager.graph.edges(data=True)) == [("人参", "气虚证", {"relation_type": "治疗"})]
+    # 一次导入是一个撤销步骤
+    assert manager.undo()
+    assert manager.graph.number_of_edges() == 0
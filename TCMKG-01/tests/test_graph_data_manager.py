@@ -0,0 +1,149 @@
+# tests/test_graph_data_manager.py
+import copy
+import os
+
+import pytest
+
+from conftest import graph_state
+from core.graph_data_manager import MERGE_ATTRIBUTES, MERGE_KEEP, MERGE_OVERWRITE, GraphDataManager
+
+
+def test_undo_redo_restore_exact_state(sample_manager):
+    manager = sample_manager
+    operations = [
+        lambda: manager.edit_node("人参", "中药", {"性味": "甘", "用量": [3, 9]}),
+        lambda: manager.add_node("当归", "中药", {"性味": "甘、辛"}),
+        lambda: manager.add_relationship("当归", "人参", "配伍"),
+        lambda: manager.rename_node("黄芪", "北芪"),
+        lambda: manager.rename_node("当归", "人参", merge=True),
+        lambda: manager.delete_node("气虚证"),
+        lambda: manager.merge_graph({"nodes": [{"name": "人参", "type": "药材", "attributes": {"产地": "吉林"}}],
+                                     "edges": [{"source": "北芪", "target": "人参", "relation_type": "配伍"}]},
+                                    policy=MERGE_ATTRIBUTES),
+    ]
+    states = [copy.deepcopy(graph_state(manager.graph))]
+    for operation in operations:
+        assert operation() is not False
+        states.append(copy.deepcopy(graph_state(manager.graph)))
+
+    for state in reversed(states[:-1]):
+        assert manager.undo()
+        assert graph_state(manager.graph) == state
+
+    for state in states[1:]:
+        assert manager.redo()
+        assert graph_state(manager.graph) == state
+    assert not manager.redo()
+
+
+def test_undo_is_journaled(sample_manager, json_path):
+    sample_manager.edit_node("黄芪", "中药", {"性味": "微温"})
+    sample_manager.undo()
+    expected = graph_state(sample_manager.graph)
+    sample_manager.journal.close()
+
+    reloaded = GraphDataManager(json_path, checkpoint_interval=0)
+    try:
+        assert graph_state(reloaded.graph) == expected
+    finally:
+        reloaded.journal.close()
+
+
+def test_transaction_is_one_undo_step(sample_manager):
+    manager = sample_manager
+    before = copy.deepcopy(graph_state(manager.graph))
+    with manager.transaction():
+        manager.add_node("当归", "中药", {})
+        with manager.transaction():  # 嵌套的事务并入外层
+            manager.add_relationship("当归", "气虚证", "治疗")
+        manager.delete_node("黄芪")
+
+    assert manager.undo()
+    assert graph_state(manager.graph) == before
+
+
+def test_transaction_rolls_back_on_error(sample_manager, json_path):
+    manager = sample_manager
+    before = copy.deepcopy(graph_state(manager.graph))
+    undo_depth = len(manager.undo_stack)
+    with pytest.raises(RuntimeError):
+        with manager.transaction():
+            manager.add_node("当归", "中药", {})
+            manager.rename_node("人参", "吉林参")
+            raise RuntimeError("中途失败")
+
+    assert graph_state(manager.graph) == before
+    assert len(manager.undo_stack) == undo_depth
+    manager.journal.close()
+    reloaded = GraphDataManager(json_path, checkpoint_interval=0)
+    try:
+        assert graph_state(reloaded.graph) == before
+    finally:
+        reloaded.journal.close()
+
+
+def test_binary_checkpoint_reload(tmp_path):
+    json_path = str(tmp_path / "graph.json")
+    manager = GraphDataManager(json_path, checkpoint_interval=0, binary_store=True)
+    manager.add_nodes_from([("人参", "中药", {"用量": 9}, [{"title": "本草纲目"}]), ("气虚证", "证候", {})])
+    manager.add_relationships_from([("人参", "气虚证", "治疗")])
+    manager.checkpoint()
+    manager.add_node("黄芪", "中药", {"性味": "甘"})  # 检查点之后的修改只在日志中
+    expected = graph_state(manager.graph)
+    manager.journal.close()
+    assert os.path.exists(manager.binary_path)
+
+    reloaded = GraphDataManager(json_path, checkpoint_interval=0, binary_store=True)
+    try:
+        assert graph_state(reloaded.graph) == expected
+    finally:
+        reloaded.journal.close()
+
+
+MERGE_DATA = {
+    "nodes": [
+        {"name": "人参", "type": "药材", "attributes": {"性味": "甘", "产地": "吉林"},
+         "resources": [{"title": "神农本草经"}]},
+        {"name": "当归", "type": "中药", "attributes": {}},
+    ],
+    "edges": [
+        {"source": "人参", "target": "气虚证", "relation_type": "主治", "resources": [{"title": "金匮要略"}]},
+        {"source": "当归", "target": "人参", "relation_type": "配伍"},
+        {"source": "当归", "target": "血虚证", "relation_type": "治疗"},  # 端点不存在，跳过
+    ],
+}
+
+
+@pytest.mark.parametrize("policy, node, edge", [
+    (MERGE_OVERWRITE,
+     {"type": "药材", "attributes": {"性味": "甘", "产地": "吉林"}, "resources": [{"title": "神农本草经"}]},
+     {"relation_type": "主治", "resources": [{"title": "金匮要略"}]}),
+    (MERGE_KEEP,
+     {"type": "中药", "attributes": {"性味": "甘、微苦", "归经": ["脾", "肺"], "用量": 9},
+      "resources": [{"title": "本草纲目"}]},
+     {"relation_type": "治疗", "resources": [{"title": "伤寒论"}]}),
+    (MERGE_ATTRIBUTES,
+     {"type": "药材", "attributes": {"性味": "甘", "归经": ["脾", "肺"], "用量": 9, "产地": "吉林"},
+      "resources": [{"title": "本草纲目"}, {"title": "神农本草经"}]},
+     {"relation_type": "主治", "resources": [{"title": "伤寒论"}, {"title": "金匮要略"}]}),
+])
+def test_merge_graph_policies(sample_manager, policy, node, edge):
+    manager = sample_manager
+    before = copy.deepcopy(graph_state(manager.graph))
+
+    manager.merge_graph(copy.deepcopy(MERGE_DATA), policy=policy)
+
+    graph = manager.graph
+    assert graph.nodes["人参"] == node
+    assert graph["人参"]["气虚证"] == edge
+    assert graph.nodes["当归"] == {"type": "中药", "attributes": {}}
+    assert graph["当归"]["人参"] == {"relation_type": "配伍"}
+    assert "血虚证" not in graph
+    # 合并前的状态没有被原地修改，一次撤销即可完整恢复
+    assert manager.undo()
+    assert graph_state(graph) == before
+
+
+def test_merge_graph_rejects_unknown_policy(sample_manager):
+    with pytest.raises(ValueError):
+        sample_manager.merge_graph(MERGE_DATA, policy="replace")
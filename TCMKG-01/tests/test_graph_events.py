@@ -0,0 +1,102 @@
+# tests/test_graph_events.py
+import pytest
+
+from core import graph_events
+
+
+@pytest.fixture
+def events(sample_manager):
+    received = []
+    sample_manager.subscribe(received.append)
+    return received
+
+
+def kinds(events):
+    return [(event.kind, event.key) for event in events]
+
+
+def test_single_edits(sample_manager, events):
+    sample_manager.add_node("当归", "中药", {})
+    assert kinds(events) == [(graph_events.NODE_ADDED, "当归"), (graph_events.BATCH_COMMITTED, None)]
+    assert events[0].data == {"type": "中药", "attributes": {}}
+
+    events.clear()
+    sample_manager.edit_relationship("人参", "气虚证", "主治")
+    assert kinds(events) == [(graph_events.EDGE_UPDATED, ("人参", "气虚证")), (graph_events.BATCH_COMMITTED, None)]
+
+
+def test_delete_removes_edges_before_node(sample_manager, events):
+    sample_manager.delete_node("气虚证")
+    assert kinds(events) == [
+        (graph_events.EDGE_REMOVED, ("人参", "气虚证")),
+        (graph_events.EDGE_REMOVED, ("黄芪", "气虚证")),
+        (graph_events.NODE_REMOVED, "气虚证"),
+        (graph_events.BATCH_COMMITTED, None),
+    ]
+    assert events[2].data["type"] == "证候"  # 删除事件带有删除前的属性
+
+    events.clear()
+    sample_manager.undo()
+    assert kinds(events)[0] == (graph_events.NODE_ADDED, "气虚证")
+    assert {key for _, key in kinds(events)[1:3]} == {("人参", "气虚证"), ("黄芪", "气虚证")}
+
+
+def test_rename_event(sample_manager, events):
+    sample_manager.rename_node("黄芪", "北芪")
+    renamed = [event for event in events if event.kind == graph_events.NODE_RENAMED]
+    assert [(event.old_key, event.key) for event in renamed] == [("黄芪", "北芪")]
+    assert (graph_events.EDGE_ADDED, ("北芪", "气虚证")) in kinds(events)
+    assert (graph_events.EDGE_REMOVED, ("黄芪", "气虚证")) in kinds(events)
+
+    events.clear()
+    sample_manager.undo()
+    renamed = [event for event in events if event.kind == graph_events.NODE_RENAMED]
+    assert [(event.old_key, event.key) for event in renamed] == [("北芪", "黄芪")]
+
+
+def test_transaction_commits_one_batch(sample_manager, events):
+    listener_calls = []
+    sample_manager.add_change_listener(lambda: listener_calls.append(1))
+    with sample_manager.transaction():
+        sample_manager.add_node("当归", "中药", {})
+        sample_manager.add_relationship("当归", "气虚证", "治疗")
+    assert [kind for kind, _ in kinds(events)].count(graph_events.BATCH_COMMITTED) == 1
+    assert events[-1].data == 2
+    assert listener_calls == [1]
+
+
+def test_unchanged_edit_emits_no_update(sample_manager, events):
+    sample_manager.edit_node("黄芪", "中药", {"性味": "甘", "用量": 15.5})
+    assert kinds(events) == [(graph_events.BATCH_COMMITTED, None)]
+
+
+def test_large_change_resets(sample_manager, events, monkeypatch):
+    monkeypatch.setattr(type(sample_manager), "LARGE_CHANGE_THRESHOLD", 2)
+    sample_manager.add_nodes_from([("当归", "中药", {}), ("川芎", "中药", {}), ("白芍", "中药", {})])
+    assert kinds(events) == [(graph_events.GRAPH_RESET, None)]
+
+
+def test_held_notifications(sample_manager, events):
+    sample_manager.hold_notifications()
+    sample_manager.add_node("当归", "中药", {})
+    assert events == []
+    sample_manager.release_notifications()
+    assert kinds(events) == [(graph_events.NODE_ADDED, "当归"), (graph_events.BATCH_COMMITTED, None)]
+
+    events.clear()
+    sample_manager.hold_notifications()
+    sample_manager.add_node("川芎", "中药", {})
+    sample_manager.add_node("白芍", "中药", {})
+    sample_manager.release_notifications()
+    assert kinds(events) == [(graph_events.GRAPH_RESET, None)]
+
+
+def test_failing_subscriber_does_not_block_others(sample_manager, events):
+    def broken(event):
+        raise RuntimeError("订阅者出错")
+
+    sample_manager.subscribe(broken)
+    later = []
+    sample_manager.subscribe(later.append)
+    sample_manager.add_node("当归", "中药", {})
+    assert len(later) == 2
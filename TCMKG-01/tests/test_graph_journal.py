@@ -0,0 +1,85 @@
+# tests/test_graph_journal.py
+from conftest import graph_state
+from core.graph_data_manager import GraphDataManager
+from core.graph_journal import GraphJournal
+
+
+def test_replay_truncates_torn_tail(tmp_path):
+    path = tmp_path / "graph.json.journal"
+    journal = GraphJournal(path)
+    journal.append_many([{"op": "node", "name": "人参"}, {"op": "node", "name": "黄芪"}])
+    journal.close()
+    intact = path.stat().st_size
+    with open(path, "ab") as f:
+        f.write(b'{"seq":3,"op":"no')  # 崩溃时写了一半的记录
+
+    replayed = GraphJournal(path)
+    assert [record["name"] for record in replayed.replay()] == ["人参", "黄芪"]
+    assert path.stat().st_size == intact
+    assert replayed.last_seq == 2
+    # 截断后继续追加，序号接着已有的记录递增
+    assert replayed.append({"op": "node", "name": "当归"}) == 3
+    replayed.close()
+    assert [record["seq"] for record in GraphJournal(path).replay()] == [1, 2, 3]
+
+
+def test_replay_stops_at_corrupt_line(tmp_path):
+    path = tmp_path / "graph.json.journal"
+    path.write_bytes(b'{"seq":1,"op":"node"}\n{"seq":\n{"seq":3,"op":"node"}\n')
+
+    journal = GraphJournal(path)
+    assert [record["seq"] for record in journal.replay()] == [1]
+    assert path.read_bytes() == b'{"seq":1,"op":"node"}\n'
+
+
+def test_replay_skips_records_in_checkpoint(tmp_path):
+    path = tmp_path / "graph.json.journal"
+    journal = GraphJournal(path)
+    journal.append_many([{"op": "node"}] * 3)
+    journal.close()
+
+    replayed = GraphJournal(path)
+    assert [record["seq"] for record in replayed.replay(after_seq=2)] == [3]
+    assert replayed.last_seq == 3
+
+
+def test_manager_recovers_from_torn_journal(sample_manager, json_path):
+    expected = graph_state(sample_manager.graph)
+    sample_manager.journal.close()
+    with open(json_path + ".journal", "ab") as f:
+        f.write('{"seq":99,"op":"node","name":"当'.encode("utf-8"))
+
+    recovered = GraphDataManager(json_path, checkpoint_interval=0)
+    try:
+        assert graph_state(recovered.graph) == expected
+    finally:
+        recovered.journal.close()
+
+
+def test_discard_through_keeps_later_records(tmp_path):
+    path = tmp_path / "graph.json.journal"
+    journal = GraphJournal(path)
+    journal.append_many([{"op": "node", "name": "人参"}, {"op": "node", "name": "黄芪"}])
+    mark = journal.mark()
+    journal.append({"op": "node", "name": "当归"})  # 检查点写入期间追加的记录
+
+    journal.discard_through(mark)
+    assert journal.pending == 1
+    assert [record["name"] for record in GraphJournal(path).replay()] == ["当归"]
+
+
+def test_checkpoint_interval_compacts_journal(json_path):
+    manager = GraphDataManager(json_path, checkpoint_interval=2)
+    manager.add_node("人参", "中药", {})
+    manager.add_node("黄芪", "中药", {})  # 第二条记录触发检查点
+    manager.add_node("当归", "中药", {})
+    expected = graph_state(manager.graph)
+    manager.journal.close()
+    with open(json_path + ".journal", encoding="utf-8") as f:
+        assert ['"当归"' in line for line in f] == [True]
+
+    reloaded = GraphDataManager(json_path, checkpoint_interval=2)
+    try:
+        assert graph_state(reloaded.graph) == expected
+    finally:
+        reloaded.journal.close()
@@ -0,0 +1,50 @@
+# tests/test_graphml_export.py
+import networkx as nx
+
+from conftest import EXPORT_ATTRIBUTES
+from core.graphml_export import attribute_key_types, write_graphml
+
+
+def test_graphml_round_trip(export_graph, tmp_path):
+    graph = export_graph
+    graph.nodes["黄芪"]["attributes"].update({"type": "草本", "控制符": "a\x01b\rc"})
+    path = str(tmp_path / "graph.graphml")
+    write_graphml(graph, path)
+
+    loaded = nx.read_graphml(path)
+    assert list(loaded.nodes) == list(graph.nodes)
+    assert list(loaded.edges) == list(graph.edges)
+    ginseng = loaded.nodes["人参"]
+    assert ginseng["type"] == "中药"
+    assert ginseng["resources"] == '[{"title":"本草纲目"}]'
+    assert (ginseng["性味"], ginseng["用量"], ginseng["比例"], ginseng["道地"]) == ("甘、微苦", 9, 0.5, True)
+    assert ginseng["归经"] == '["脾","肺"]'
+    assert ginseng["说明"] == EXPORT_ATTRIBUTES["说明"]
+    assert "备注" not in ginseng  # None 值不写出
+    astragalus = loaded.nodes["黄芪"]
+    assert astragalus["type"] == "中药"
+    assert astragalus["attributes.type"] == "草本"  # 与固定键同名的属性加前缀
+    assert astragalus["控制符"] == "ab\rc"  # 删除 XML 不允许的控制字符，保留回车
+    assert loaded["人参"]["气虚证"] == {"relation_type": "治疗", "resources": '[{"title":"伤寒论"}]'}
+    assert loaded["黄芪"]["气虚证"] == {"relation_type": "治疗"}
+
+
+def test_graphml_gzip(export_graph, tmp_path):
+    path = str(tmp_path / "graph.graphml.gz")
+    write_graphml(export_graph, path)
+
+    with open(path, "rb") as f:
+        assert f.read(2) == b"\x1f\x8b"
+    loaded = nx.read_graphml(path)
+    assert list(loaded.edges) == list(export_graph.edges)
+
+
+def test_attribute_types_are_merged_across_nodes(export_graph):
+    export_graph.nodes["黄芪"]["attributes"].update({"比例": 1, "道地": "是"})
+    export_graph.nodes["气虚证"]["attributes"]["新键"] = None
+    types = attribute_key_types(export_graph)
+    assert types["用量"] == "long"
+    assert types["比例"] == "double"  # 整数和小数合并为 double
+    assert types["道地"] == "string"  # 布尔值和字符串合并为 string
+    assert types["备注"] == types["新键"] == "string"  # 只有 None 值的键按字符串声明
+    assert list(types)[:3] == ["性味", "用量", "比例"]
@@ -0,0 +1,57 @@
+# tests/test_import_coordinator.py
+import json
+
+import pytest
+
+from core.import_coordinator import ImportCoordinator, ImportFormatError
+from conftest import graph_state
+
+
+@pytest.fixture
+def import_files(tmp_path):
+    nodes = tmp_path / "nodes.csv"
+    nodes.write_text('name,type,attributes\n人参,中药,"{""性味"": ""甘""}"\n气虚证,证候,\n', encoding="gbk")
+    edges = tmp_path / "edges.csv"
+    edges.write_text("source,target,relation_type\n人参,气虚证,治疗\n黄芪,气虚证,治疗\n", encoding="utf-8")
+    graph = tmp_path / "graph.json"
+    graph.write_text(json.dumps({"nodes": [{"name": "黄芪", "type": "中药", "attributes": {}}], "edges": []},
+                                ensure_ascii=False), encoding="utf-8")
+    bad = tmp_path / "bad.csv"
+    bad.write_text("a,b\n1,2\n", encoding="utf-8")
+    return [str(edges), str(bad), str(nodes), str(graph)]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_parse_files_keeps_input_order(manager, import_files, max_workers):
+    progress = []
+    parsed, errors = ImportCoordinator(manager, max_workers).parse_files(
+        import_files, lambda done, total: progress.append((done, total)))
+    assert [item.filepath for item in parsed] == [import_files[0], import_files[2], import_files[3]]
+    assert list(errors) == [import_files[1]]
+    assert isinstance(errors[import_files[1]], ImportFormatError)
+    assert errors[import_files[1]].key == "csv_column_error"
+    assert progress[-1] == (4, 4)
+
+
+def test_import_files_merges_in_one_step(manager, import_files):
+    counts, errors = ImportCoordinator(manager, max_workers=2).import_files(import_files)
+    assert counts == {import_files[0]: 2, import_files[2]: 2, import_files[3]: 1}
+    assert list(errors) == [import_files[1]]
+    nodes, edges = graph_state(manager.graph)
+    assert nodes["人参"]["attributes"] == {"性味": "甘"}
+    assert set(edges) == {("人参", "气虚证"), ("黄芪", "气虚证")}  # 关系可以引用其他文件中的节点
+
+    manager.undo()
+    assert manager.graph.number_of_nodes() == 0
+
+
+def test_merge_rolls_back_when_cancelled(manager, import_files):
+    coordinator = ImportCoordinator(manager, max_workers=1)
+    parsed, _ = coordinator.parse_files(import_files)
+
+    def cancel(done, total):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        coordinator.merge(parsed, progress_callback=cancel)
+    assert manager.graph.number_of_nodes() == 0
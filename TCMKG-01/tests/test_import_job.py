@@ -0,0 +1,87 @@
+# tests/test_import_job.py
+import time
+
+import pytest
+from PyQt5.QtCore import QCoreApplication, QThreadPool
+
+from core import import_job
+from core.import_job import ImportJobRunner
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def wait_until(qapp, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "等待超时"
+        qapp.processEvents()
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def runner(qapp, manager):
+    pool = QThreadPool()
+    runner = ImportJobRunner(manager, thread_pool=pool)
+    runner.coordinator.max_workers = 1
+    outcome = []
+    runner.finished.connect(lambda counts, errors: outcome.append(("finished", counts, errors)))
+    runner.cancelled.connect(lambda: outcome.append(("cancelled",)))
+    runner.failed.connect(lambda error: outcome.append(("failed", error)))
+    runner.outcome = outcome
+    yield runner
+    pool.waitForDone()
+
+
+@pytest.fixture
+def node_file(tmp_path):
+    path = tmp_path / "nodes.csv"
+    path.write_text("name,type\n" + "".join(f"药材{i},中药\n" for i in range(50)), encoding="utf-8")
+    return str(path)
+
+
+def test_job_merges_in_one_undo_step(qapp, manager, runner, node_file):
+    events = []
+    manager.subscribe(events.append)
+    assert runner.start([node_file])
+    assert not runner.start([node_file])  # 一次只运行一个任务
+    wait_until(qapp, lambda: runner.outcome)
+
+    assert runner.outcome == [("finished", {node_file: 50}, {})]
+    assert not runner.is_running()
+    assert manager.graph.number_of_nodes() == 50
+    assert events  # 暂存的通知在提交后发出
+    manager.undo()
+    assert manager.graph.number_of_nodes() == 0
+
+
+def test_cancel_during_merge_rolls_back(qapp, manager, runner, node_file, monkeypatch):
+    monkeypatch.setattr(import_job, "MERGE_BATCH_SIZE", 10)
+    merged = []
+
+    def on_progress(stage, done, total):
+        if stage == "merging":
+            merged.append(done)
+            runner.cancel()
+
+    runner.progress.connect(on_progress)
+    runner.start([node_file])
+    wait_until(qapp, lambda: runner.outcome)
+
+    assert runner.outcome == [("cancelled",)]
+    assert merged == [10]
+    assert manager.graph.number_of_nodes() == 0
+
+
+def test_format_errors_are_reported_per_file(qapp, manager, runner, node_file, tmp_path):
+    bad = tmp_path / "bad.csv"
+    bad.write_text("a,b\n1,2\n", encoding="utf-8")
+    runner.start([str(bad), node_file])
+    wait_until(qapp, lambda: runner.outcome)
+
+    (kind, counts, errors), = runner.outcome
+    assert kind == "finished"
+    assert counts == {node_file: 50}
+    assert list(errors) == [str(bad)]
@@ -0,0 +1,61 @@
+# tests/test_jsonld_export.py
+import io
+import json
+
+import networkx as nx
+import pytest
+
+from core.jsonld_export import JSONLD_CONTEXT, save_jsonld, write_jsonld, write_ndjsonld
+
+EXPECTED_GRAPH = [
+    {"@id": "人参", "name": "人参", "type": "中药", "attributes": {"性味": "甘"},
+     "relatedTo": [{"@id": "气虚证", "relation_type": "治疗"}, {"@id": "黄芪", "relation_type": "配伍"}]},
+    {"@id": "气虚证", "name": "气虚证", "type": "证候", "attributes": {}},
+    {"@id": "黄芪", "name": "黄芪", "type": "", "attributes": {}},
+]
+
+
+@pytest.fixture
+def graph():
+    graph = nx.DiGraph()
+    graph.add_node("人参", type="中药", attributes={"性味": "甘"})
+    graph.add_node("气虚证", type="证候", attributes={})
+    graph.add_node("黄芪")  # 没有 type 和 attributes 的节点
+    graph.add_edge("人参", "气虚证", relation_type="治疗")
+    graph.add_edge("人参", "黄芪", relation_type="配伍")
+    return graph
+
+
+@pytest.mark.parametrize("indent", [None, 4])
+def test_write_jsonld(graph, indent):
+    f = io.StringIO()
+    write_jsonld(f, graph, indent=indent)
+    assert json.loads(f.getvalue()) == {"@context": JSONLD_CONTEXT, "@graph": EXPECTED_GRAPH}
+
+
+def test_write_jsonld_empty_graph():
+    f = io.StringIO()
+    write_jsonld(f, nx.DiGraph())
+    assert json.loads(f.getvalue()) == {"@context": JSONLD_CONTEXT, "@graph": []}
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 1024])
+def test_write_ndjsonld(graph, batch_size):
+    f = io.StringIO()
+    write_ndjsonld(f, graph, batch_size=batch_size)
+    lines = f.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == [{"@context": JSONLD_CONTEXT, **node} for node in EXPECTED_GRAPH]
+
+
+@pytest.mark.parametrize("filename, ndjson", [("graph.jsonld", False), ("graph.ndjsonld", True), ("graph.JSONL", True)])
+def test_save_jsonld_by_extension(graph, tmp_path, filename, ndjson):
+    path = str(tmp_path / filename)
+    save_jsonld(graph, path)
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    if ndjson:
+        assert len(text.splitlines()) == len(EXPECTED_GRAPH)
+    else:
+        assert json.loads(text)["@graph"] == EXPECTED_GRAPH
+        assert "\n    " in text  # 默认缩进 4
+    assert "人参" in text  # 中文不转义
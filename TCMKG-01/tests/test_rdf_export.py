@@ -0,0 +1,88 @@
+# tests/test_rdf_export.py
+import gzip
+import xml.etree.ElementTree as ET
+
+import networkx as nx
+import pytest
+
+from core.rdf_export import GRAPH_NAMESPACE, OWL_CLASS, RDF_NAMESPACE, RDFS_CLASS, RDFS_NAMESPACE, iri_local, write_rdf
+
+
+@pytest.fixture
+def graph():
+    graph = nx.DiGraph()
+    graph.add_node("人参", type="中药")
+    graph.add_node("黄 芪", type="中药")
+    graph.add_node('带"引号"\n的名称')  # 没有 type 的节点
+    graph.add_edge("人参", "黄 芪", relation_type="配伍")
+    graph.add_edge("黄 芪", '带"引号"\n的名称', relation_type="1类 关系")  # 不是合法的 XML 名称
+    return graph
+
+
+def expected_triples(graph, node_class=RDFS_CLASS):
+    def iri(name):
+        return GRAPH_NAMESPACE + iri_local(name)
+
+    triples = set()
+    for name, data in graph.nodes(data=True):
+        triples.add((iri(name), RDF_NAMESPACE + "type", ("iri", node_class)))
+        triples.add((iri(name), RDFS_NAMESPACE + "label", ("literal", name)))
+        if "type" in data:
+            triples.add((iri(name), GRAPH_NAMESPACE + "type", ("literal", data["type"])))
+    for source, target, data in graph.edges(data=True):
+        triples.add((iri(source), iri(data["relation_type"]), ("iri", iri(target))))
+    return triples
+
+
+def test_iri_local_encodes_unsafe_characters():
+    assert iri_local("人参") == "人参"
+    assert iri_local("黄 芪#1") == "黄%20芪%231"
+    assert iri_local("100%") == "100%25"
+
+
+@pytest.mark.parametrize("filename", ["graph.nt", "graph.ttl", "graph.rdf", "graph.nt.gz"])
+def test_round_trip_with_rdflib(graph, tmp_path, filename):
+    rdflib = pytest.importorskip("rdflib")
+    path = str(tmp_path / filename)
+    write_rdf(graph, path)
+
+    fmt = {"nt": "nt", "ttl": "turtle", "rdf": "xml"}[filename.split(".")[1]]
+    if path.endswith(".gz"):
+        with gzip.open(path, "rb") as f:
+            parsed = rdflib.Graph().parse(data=f.read(), format=fmt)
+    else:
+        parsed = rdflib.Graph().parse(path, format=fmt)
+    triples = {(str(s), str(p), ("literal" if isinstance(o, rdflib.Literal) else "iri", str(o)))
+               for s, p, o in parsed}
+    assert triples == expected_triples(graph)
+
+
+def test_rdf_xml_is_well_formed(graph, tmp_path):
+    path = str(tmp_path / "graph.owl")
+    write_rdf(graph, path, node_class=OWL_CLASS)
+    root = ET.parse(path).getroot()
+    descriptions = root.findall(f"{{{RDF_NAMESPACE}}}Description")
+    assert [d.findtext(f"{{{RDFS_NAMESPACE}}}label") for d in descriptions] == list(graph)
+    assert {d.find(f"{{{RDF_NAMESPACE}}}type").get(f"{{{RDF_NAMESPACE}}}resource") for d in descriptions} == {OWL_CLASS}
+    # 不是合法 NCName 的关系类型拆成命名空间和局部名称，展开后仍是同一个 IRI
+    relation, = [child for child in descriptions[1] if child.tag.endswith("关系")]
+    namespace, local = relation.tag[1:].split("}")
+    assert namespace + local == GRAPH_NAMESPACE + iri_local("1类 关系")
+
+
+def test_ntriples_escapes_literals(graph, tmp_path):
+    path = str(tmp_path / "graph.nt")
+    write_rdf(graph, path)
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert all(line.endswith(" .") for line in lines)
+    assert f'<{RDFS_NAMESPACE}label> "带\\"引号\\"\\n的名称" .' in "\n".join(lines)
+    assert len(lines) == len(expected_triples(graph))
+
+
+def test_rejects_unknown_format(graph, tmp_path):
+    with pytest.raises(ValueError):
+        write_rdf(graph, str(tmp_path / "graph.json"))
+    with pytest.raises(ValueError):
+        write_rdf(graph, str(tmp_path / "graph.nt"), fmt="jsonld")
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,50 @@
+# tests/test_read_views.py
+def fresh_views(manager):
+    """丢弃缓存后重新生成的读视图，作为增量修补结果的对照"""
+    manager._views = None
+    return manager.get_all_nodes(), manager.get_all_relationships()
+
+
+def test_views_are_cached_per_version(sample_manager):
+    nodes = sample_manager.get_all_nodes()
+    relationships = sample_manager.get_all_relationships()
+    assert sample_manager.get_all_nodes() is nodes
+    assert sample_manager.get_all_relationships() is relationships
+
+    sample_manager.add_node("当归", "中药", {})
+    assert sample_manager.get_all_nodes() is not nodes
+    assert "当归" in {node["name"] for node in sample_manager.get_all_nodes()}
+
+
+def test_patched_views_match_rebuilt_views(sample_manager):
+    manager = sample_manager
+    manager.get_all_nodes()
+    manager.get_all_relationships()
+    manager.edit_node("人参", "中药", {"性味": "甘"})
+    manager.rename_node("黄芪", "北芪")
+    manager.add_relationship("北芪", "人参", "配伍")
+    manager.delete_node("气虚证")
+    manager.undo()
+
+    patched = manager.get_all_nodes(), manager.get_all_relationships()
+    assert manager._views.version == manager.version
+    rebuilt = fresh_views(manager)
+    key = lambda item: repr(sorted(item.items()))  # noqa: E731
+    assert sorted(patched[0], key=key) == sorted(rebuilt[0], key=key)
+    assert sorted(patched[1], key=key) == sorted(rebuilt[1], key=key)
+
+
+def test_direct_graph_edits_rebuild_views(sample_manager):
+    manager = sample_manager
+    manager.get_all_nodes()
+    manager.graph.add_node("当归", type="中药", attributes={})
+    manager.request_save()
+    assert "当归" in {node["name"] for node in manager.get_all_nodes()}
+
+
+def test_typed_queries(sample_manager):
+    nodes = sample_manager.get_nodes_by_type("中药")
+    assert [node["name"] for node in nodes] == ["人参", "黄芪"]
+    relationships = sample_manager.get_relationships_by_type("治疗")
+    assert {(edge["source"], edge["target"]) for edge in relationships} == {("人参", "气虚证"), ("黄芪", "气虚证")}
+    assert sample_manager.get_nodes_by_type("方剂") == []
@@ -0,0 +1,77 @@
+# tests/test_reimport.py
+import pytest
+
+from conftest import graph_state
+from core.data_importer import DataImporter
+from core.import_fingerprints import FingerprintIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    return FingerprintIndex(str(tmp_path / "fingerprints.json"))
+
+
+def write(path, rows):
+    path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_only_changed_rows_are_applied(manager, tmp_path, index):
+    importer = DataImporter(manager)
+    filepath = write(tmp_path / "nodes.csv", ["name,type", "人参,中药", "黄芪,中药", "当归,中药"])
+    assert importer.reimport_csv(filepath, index) == 3
+
+    write(tmp_path / "nodes.csv", ["name,type", "人参,中药", "黄芪,补气药", "白芍,中药"])
+    rows, apply = importer.plan_reimport(filepath, index)
+    assert rows == 3  # 修改黄芪、新增白芍、删除当归
+    assert manager.graph.has_node("当归")  # 比较阶段不修改图
+    assert apply() == 3
+    nodes, _ = graph_state(manager.graph)
+    assert set(nodes) == {"人参", "黄芪", "白芍"}
+    assert nodes["黄芪"]["type"] == "补气药"
+
+    manager.undo()  # 一次重新导入是一个撤销步骤
+    assert set(graph_state(manager.graph)[0]) == {"人参", "黄芪", "当归"}
+
+
+def test_unchanged_file_and_graph_is_skipped(manager, tmp_path, index):
+    importer = DataImporter(manager)
+    filepath = write(tmp_path / "nodes.csv", ["name,type", "人参,中药"])
+    importer.reimport_csv(filepath, index)
+    assert importer.plan_reimport(filepath, index)[0] == 0
+
+
+def test_rows_edited_in_the_graph_are_restored(manager, tmp_path, index):
+    importer = DataImporter(manager)
+    filepath = write(tmp_path / "nodes.csv", ["name,type", "人参,中药", "黄芪,中药"])
+    importer.reimport_csv(filepath, index)
+    manager.edit_node("人参", "其他", {})
+    manager.delete_node("黄芪")
+
+    assert importer.reimport_csv(filepath, index) == 2
+    nodes, _ = graph_state(manager.graph)
+    assert nodes["人参"]["type"] == "中药"
+    assert "黄芪" in nodes
+
+
+def test_skipped_relationships_are_retried(manager, tmp_path, index):
+    importer = DataImporter(manager)
+    filepath = write(tmp_path / "edges.csv", ["source,target,relation_type", "人参,气虚证,治疗"])
+    assert importer.reimport_csv(filepath, index) == 1
+    assert not manager.graph.has_edge("人参", "气虚证")  # 端点不存在，关系被跳过
+
+    manager.add_node("人参", "中药", {})
+    manager.add_node("气虚证", "证候", {})
+    importer.reimport_csv(filepath, index)
+    assert manager.graph.edges["人参", "气虚证"]["relation_type"] == "治疗"
+
+
+def test_index_persists(manager, tmp_path, index):
+    importer = DataImporter(manager)
+    filepath = write(tmp_path / "nodes.csv", ["name,type", "人参,中药"])
+    importer.reimport_csv(filepath, index)
+    index.save()
+
+    write(tmp_path / "nodes.csv", ["name,type", "人参,中药", "黄芪,中药"])
+    reloaded = FingerprintIndex(index.path)
+    assert importer.plan_reimport(filepath, reloaded)[0] == 1
@@ -0,0 +1,141 @@
+# tests/test_sqlite_graph_manager.py
+import pytest
+
+from core.graph_data_manager import MERGE_ATTRIBUTES
+from core.sqlite_graph_manager import SQLiteGraphDataManager
+
+
+@pytest.fixture
+def sqlite_manager(tmp_path):
+    graph_manager = SQLiteGraphDataManager(str(tmp_path / "graph.db"), json_path=None)
+    yield graph_manager
+    graph_manager.close()
+
+
+def state(manager):
+    """两种后端都支持的 get_all_nodes / get_all_relationships 表示的图数据"""
+    return ({node["name"]: (node["type"], node["attributes"], node.get("resources") or [])
+             for node in manager.get_all_nodes()},
+            {(edge["source"], edge["target"]): (edge["relation_type"], edge.get("resources") or [])
+             for edge in manager.get_all_relationships()})
+
+
+def populate(manager):
+    manager.add_nodes_from([
+        ("人参", "中药", {"性味": "甘、微苦", "用量": 9}, [{"title": "本草纲目"}]),
+        ("黄芪", "中药", {"性味": "甘"}),
+        ("气虚证", "证候", {}),
+    ])
+    manager.add_relationships_from([("人参", "气虚证", "治疗"), ("黄芪", "气虚证", "治疗")])
+
+
+OPERATIONS = [
+    lambda m: m.edit_node("人参", "中药", {"性味": "甘", "归经": ["脾", "肺"]}),
+    lambda m: m.add_node("当归", "中药", {"性味": "甘、辛"}),
+    lambda m: m.add_relationship("当归", "人参", "配伍"),
+    lambda m: m.edit_relationship("黄芪", "气虚证", "主治"),
+    lambda m: m.rename_node("黄芪", "北芪"),
+    lambda m: m.rename_node("当归", "人参", merge=True),
+    lambda m: m.merge_graph({"nodes": [{"name": "人参", "type": "药材", "attributes": {"产地": "吉林"}}],
+                             "edges": [{"source": "北芪", "target": "人参", "relation_type": "配伍"}]},
+                            policy=MERGE_ATTRIBUTES),
+    lambda m: m.delete_relationship("人参", "气虚证"),
+    lambda m: m.delete_node("气虚证"),
+]
+
+
+def test_matches_in_memory_manager(manager, sqlite_manager):
+    populate(manager)
+    populate(sqlite_manager)
+    states = [state(manager)]
+    assert state(sqlite_manager) == states[0]
+    for operation in OPERATIONS:
+        assert operation(sqlite_manager) == operation(manager)
+        states.append(state(manager))
+        assert state(sqlite_manager) == states[-1]
+
+    for expected in reversed(states[:-1]):
+        assert sqlite_manager.undo()
+        assert state(sqlite_manager) == expected
+    for expected in states[1:]:
+        assert sqlite_manager.redo()
+        assert state(sqlite_manager) == expected
+
+
+@pytest.mark.parametrize("merge", [False, True])
+def test_rename_events_match_in_memory_manager(manager, sqlite_manager, merge):
+    events = {}
+    for graph_manager in (manager, sqlite_manager):
+        populate(graph_manager)
+        if merge:
+            graph_manager.add_node("北芪", "中药", {"产地": "内蒙古"})
+        received = events[graph_manager] = []
+        graph_manager.subscribe(lambda event, received=received: received.append(
+            (event.kind, event.key, event.old_key)))
+        assert graph_manager.rename_node("黄芪", "北芪", merge=merge)
+        graph_manager.undo()
+
+    assert sorted(events[sqlite_manager], key=repr) == sorted(events[manager], key=repr)
+    assert state(sqlite_manager) == state(manager)
+
+
+def test_index_queries_do_not_load_graph(manager, sqlite_manager):
+    for graph_manager in (manager, sqlite_manager):
+        populate(graph_manager)
+        graph_manager.add_relationship("人参", "黄芪", "配伍")
+    index, expected = sqlite_manager.index, manager.index
+
+    assert {key: set(bucket) for key, bucket in index.nodes_by_type.items()} == \
+        {key: set(bucket) for key, bucket in expected.nodes_by_type.items()}
+    assert {key: set(bucket) for key, bucket in index.edges_by_relation.items()} == \
+        {key: set(bucket) for key, bucket in expected.edges_by_relation.items()}
+    assert {key: set(bucket) for key, bucket in index.nodes_by_attribute.items()} == \
+        {key: set(bucket) for key, bucket in expected.nodes_by_attribute.items()}
+    assert index.nodes_by_type.get("方剂", ()) == ()
+    assert index.type_degree == dict(expected.type_degree)
+    assert set(sqlite_manager.get_node_names_by_type("中药")) == {"人参", "黄芪"}
+    assert set(sqlite_manager.get_nodes_with_attribute("性味")) == {"人参", "黄芪"}
+    assert sqlite_manager.get_type_statistics() == manager.get_type_statistics()
+    assert sqlite_manager.get_relation_type_counts() == manager.get_relation_type_counts()
+
+    # 索引随修改即时更新，不需要重建
+    sqlite_manager.edit_node("黄芪", "药材", {})
+    assert set(index.nodes_by_type["中药"]) == {"人参"}
+    assert set(index.nodes_by_attribute["性味"]) == {"人参"}
+    assert sqlite_manager._graph_cache is None
+
+
+def test_imports_json_once_and_persists(manager, json_path, tmp_path):
+    populate(manager)
+    manager.save_graph_to_json()
+    db_path = str(tmp_path / "graph.db")
+
+    first = SQLiteGraphDataManager(db_path, json_path=json_path)
+    assert state(first) == state(manager)
+    first.add_node("当归", "中药", {})
+    first.close()
+
+    reopened = SQLiteGraphDataManager(db_path, json_path=json_path)
+    try:
+        assert "当归" in state(reopened)[0]
+        assert set(state(reopened)[0]) == set(state(manager)[0]) | {"当归"}
+    finally:
+        reopened.close()
+
+
+def test_direct_cache_edits_are_written_back(sqlite_manager, tmp_path):
+    populate(sqlite_manager)
+    before = state(sqlite_manager)
+    graph = sqlite_manager.graph
+    graph.nodes["人参"]["attributes"] = {"性味": "苦"}
+    graph.add_node("当归", type="中药", attributes={})
+    graph.remove_edge("黄芪", "气虚证")
+
+    sqlite_manager.request_save()
+    nodes, edges = state(sqlite_manager)
+    assert nodes["人参"][1] == {"性味": "苦"}
+    assert "当归" in nodes
+    assert ("黄芪", "气虚证") not in edges
+
+    assert sqlite_manager.undo()
+    assert state(sqlite_manager) == before
@@ -38,6 +38,7 @@ class LanguageManager:
                 # 菜单项
                 "file_menu": "📁 文件",
                 "import_data": "📁 导入数据",
+                "reimport_data": "🔄 增量重新导入",
                 "save_data": "💾 保存数据",
                 "export_data": "📤 导出数据",
                 "save_jsonld": "🔗 保存 JSON-LD",
@@ -113,12 +114,24 @@ class LanguageManager:
                 "name_type_required": "节点名称和类型不能为空",
                 "invalid_json": "属性必须是有效的JSON格式",
                 "csv_column_error": "CSV文件列名不符合要求",
+                "table_column_error": "Parquet/Arrow 文件列名不符合要求",
                 "json_format_error": "JSON文件格式不正确",
                 "unsupported_format": "不支持的文件格式",
                 "import_success": "文件 '{filename}' 导入成功！",
                 "import_error": "文件 '{filename}' 导入失败：{error}",
+                "import_parsing": "正在解析文件... {done}/{total}",
+                "import_merging": "正在合并数据... {percent}%",
+                "import_cancelled": "导入已取消，已撤回本次导入的全部修改",
+                "import_cancelling_for_close": "正在取消导入，撤回完成后窗口将自动关闭",
+                "merge_policy_title": "节点冲突处理",
+                "merge_policy_prompt": "导入的节点或关系已存在时：",
+                "merge_overwrite": "覆盖现有数据",
+                "merge_keep": "保留现有数据",
+                "merge_attributes": "合并属性和资源",
                 "save_success": "数据保存成功",
                 "save_error": "保存失败: {error}",
+                "graph_loading": "正在加载图数据... {percent}%",
+                "graph_loaded": "已加载 {nodes} 个节点，{edges} 条关系",
                 "export_success": "导出成功",
                 "export_error": "导出失败: {error}",
                 
@@ -160,6 +173,7 @@ class LanguageManager:
                 # 菜单项
                 "file_menu": "📁 File",
                 "import_data": "📁 Import Data",
+                "reimport_data": "🔄 Incremental Re-import",
                 "save_data": "💾 Save Data",
                 "export_data": "📤 Export Data",
                 "save_jsonld": "🔗 Save JSON-LD",
@@ -235,12 +249,24 @@ class LanguageManager:
                 "name_type_required": "Node name and type cannot be empty",
                 "invalid_json": "Attributes must be in valid JSON format",
                 "csv_column_error": "CSV file column names do not meet requirements",
+                "table_column_error": "Parquet/Arrow file column names do not meet requirements",
                 "json_format_error": "JSON file format is incorrect",
                 "unsupported_format": "Unsupported file format",
                 "import_success": "File '{filename}' imported successfully!",
                 "import_error": "File '{filename}' import failed: {error}",
+                "import_parsing": "Parsing files... {done}/{total}",
+                "import_merging": "Merging data... {percent}%",
+                "import_cancelled": "Import cancelled, all changes from this import were rolled back",
+                "import_cancelling_for_close": "Cancelling the import; the window will close once its changes are rolled back",
+                "merge_policy_title": "Conflict Handling",
+                "merge_policy_prompt": "When an imported node or relationship already exists:",
+                "merge_overwrite": "Overwrite existing data",
+                "merge_keep": "Keep existing data",
+                "merge_attributes": "Merge attributes and resources",
                 "save_success": "Data saved successfully",
                 "save_error": "Save failed: {error}",
+                "graph_loading": "Loading graph data... {percent}%",
+                "graph_loaded": "Loaded {nodes} nodes and {edges} relationships",
                 "export_success": "Export successful",
                 "export_error": "Export failed: {error}",
                 
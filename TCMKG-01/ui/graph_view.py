@@ -4,6 +4,40 @@ from PyQt5.QtWebEngineWidgets import QWebEngineView
 from PyQt5.QtCore import QUrl, QTimer
 from PyQt5.QtWebChannel import QWebChannel
 from PyQt5.QtCore import QObject, pyqtSlot
+from PyQt5.QtWidgets import QMessageBox
+
+from core import graph_events
+from core.graph_events import GraphEvent
+
+
+def _node_color(node_type):
+    """按节点类型返回背景色"""
+    return {
+        "方剂": "#FFA07A",
+        "药理": "#ADD8E6",
+        "药材": "#98FB98",
+        "疾病": "#D3D3D3",
+    }.get(node_type, "#97C2FC")
+
+
+def _vis_node(name, data):
+    """把图中的节点转换为 vis.js 节点"""
+    return {
+        "id": name,
+        "label": name,
+        "type": data.get("type", ""),
+        "resources": data.get("resources", []),
+        "color": {
+            "background": _node_color(data.get("type", "")),
+            "border": "#2B7CE9",
+            "highlight": {"background": "#D2E5FF", "border": "#2B7CE9"},
+        }
+    }
+
+
+def _edge_id(source, target):
+    """vis.js 中边的固定 id，使按端点删除/更新无需遍历全部边"""
+    return json.dumps([source, target], ensure_ascii=False)
 
 
 # 桥接类Bridge 处理前端回调和删除操作
@@ -33,10 +67,7 @@ class Bridge(QObject):
                 node_type = node["type"]
                 attributes = node.get("attributes", {})
                 self.graph_manager.add_node(name, node_type, attributes)
-                
-                # 使用增量更新而不是完全重新渲染
-                if hasattr(self, 'web_view') and self.web_view:
-                    self.web_view.add_node_incrementally(node)
+                # 图视图通过订阅的变更事件增量更新
                 
                 print(f"创建节点成功: {name}")
             else:
@@ -54,10 +85,7 @@ class Bridge(QObject):
                 target = edge["to"]
                 relation_type = edge["label"]
                 self.graph_manager.add_relationship(source, target, relation_type)
-                
-                # 使用增量更新而不是完全重新渲染
-                if hasattr(self, 'web_view') and self.web_view:
-                    self.web_view.add_edge_incrementally(edge)
+                # 图视图通过订阅的变更事件增量更新
                 
                 print(f"创建关系成功: {source} -> {target} ({relation_type})")
             else:
@@ -71,10 +99,7 @@ class Bridge(QObject):
         try:
             if self.graph_manager.has_node(node_name):
                 self.graph_manager.delete_node(node_name)
-                
-                # 使用增量更新
-                if hasattr(self, 'web_view') and self.web_view:
-                    self.web_view.remove_node_incrementally(node_name)
+                # 图视图通过订阅的变更事件增量更新
                 
                 print(f"删除节点成功: {node_name}")
             else:
@@ -91,10 +116,7 @@ class Bridge(QObject):
                 source = edge["source"]
                 target = edge["target"]
                 self.graph_manager.delete_relationship(source, target)
-                
-                # 使用增量更新
-                if hasattr(self, 'web_view') and self.web_view:
-                    self.web_view.remove_edge_incrementally(source, target)
+                # 图视图通过订阅的变更事件增量更新
                 
                 print(f"删除关系成功: {source} -> {target}")
             else:
@@ -115,50 +137,20 @@ class Bridge(QObject):
                 
                 # 如果名称发生变化，需要重命名节点
                 if old_name != new_name:
-                    if self.graph_manager.has_node(old_name):
-                        # 先获取旧节点的所有连接信息
-                        old_data = self.graph_manager.graph.nodes[old_name]
-                        predecessors = list(self.graph_manager.graph.predecessors(old_name))
-                        successors = list(self.graph_manager.graph.successors(old_name))
-                        
-                        # 收集边的信息
-                        in_edges = []
-                        out_edges = []
-                        for pred in predecessors:
-                            edge_data = self.graph_manager.graph[pred][old_name]
-                            in_edges.append((pred, edge_data))
-                        for succ in successors:
-                            edge_data = self.graph_manager.graph[old_name][succ]
-                            out_edges.append((succ, edge_data))
-                        
-                        # 删除旧节点
-                        self.graph_manager.graph.remove_node(old_name)
-                        
-                        # 添加新节点
-                        self.graph_manager.add_node(new_name, node_type, attributes)
-                        
-                        # 重新创建边
-                        for pred, edge_data in in_edges:
-                            self.graph_manager.graph.add_edge(pred, new_name, **edge_data)
-                        for succ, edge_data in out_edges:
-                            self.graph_manager.graph.add_edge(new_name, succ, **edge_data)
-                        
-                        self.graph_manager.save_graph_to_json()
-                        
-                        # 使用增量更新
-                        if hasattr(self, 'web_view') and self.web_view:
-                            self.web_view.update_node_incrementally(old_name, node)
-                        
+                    # 重命名和属性修改在同一个事务中提交：一个撤销步骤、一次保存
+                    with self.graph_manager.transaction():
+                        renamed = self.graph_manager.rename_node(old_name, new_name)
+                        if renamed:
+                            self.graph_manager.edit_node(new_name, node_type, attributes)
+                    # 图视图通过订阅的变更事件增量更新
+                    if renamed:
                         print(f"节点重命名成功: {old_name} -> {new_name}")
                     else:
-                        print(f"节点不存在: {old_name}")
+                        self._reject_rename(old_name, new_name)
                 else:
                     # 只更新节点属性
                     self.graph_manager.edit_node(old_name, node_type, attributes)
-                    
-                    # 使用增量更新
-                    if hasattr(self, 'web_view') and self.web_view:
-                        self.web_view.update_node_incrementally(old_name, node)
+                    # 图视图通过订阅的变更事件增量更新
                     
                     print(f"节点编辑成功: {old_name}")
             else:
@@ -166,6 +158,19 @@ class Bridge(QObject):
         except Exception as e:
             print(f"编辑节点错误: {str(e)}")
 
+    def _reject_rename(self, old_name, new_name):
+        """重命名未执行时提示用户，并把前端已改掉的标签恢复为图中的实际状态"""
+        if self.graph_manager.has_node(old_name):
+            reason = f"节点 '{new_name}' 已存在，请换一个名称"
+        else:
+            reason = f"节点 '{old_name}' 不存在"
+        QMessageBox.warning(None, "重命名失败", f"{reason}，本次修改未保存。")
+        web_view = getattr(self, 'web_view', None)
+        if web_view is not None and self.graph_manager.has_node(old_name):
+            web_view.apply_graph_changes([
+                GraphEvent(graph_events.NODE_UPDATED, old_name, self.graph_manager.graph.nodes[old_name])
+            ])
+
     @pyqtSlot(str)
     def edit_edge(self, edge_json):
         """编辑边"""
@@ -176,10 +181,7 @@ class Bridge(QObject):
                 target = edge["target"]
                 new_relation_type = edge["new_relation_type"]
                 self.graph_manager.edit_relationship(source, target, new_relation_type)
-                
-                # 使用增量更新
-                if hasattr(self, 'web_view') and self.web_view:
-                    self.web_view.update_edge_incrementally(source, target, new_relation_type)
+                # 图视图通过订阅的变更事件增量更新
                 
                 print(f"关系编辑成功: {source} -> {target} ({new_relation_type})")
             else:
@@ -237,7 +239,6 @@ class Bridge(QObject):
         """接收前端返回的多边形区域内节点统计结果"""
         try:
             result = json.loads(result_json)
-            from PyQt5.QtWidgets import QMessageBox
             QMessageBox.information(None, "区域统计结果", f"区域内节点数量: {result.get('count', 0)}")
         except Exception as e:
             print(f"统计区域节点数量错误: {str(e)}")
@@ -263,6 +264,8 @@ class GraphView(QWebEngineView):
             self.node_detail_widget = node_detail_widget
             self.update_callback = update_callback
             self.is_initialized = False  # 标记是否已初始化
+            self.synced_version = None  # 前端数据对应的图版本
+            self._pending_events = []
 
             # WebChannel + Bridge
             self.channel = QWebChannel(self.page())
@@ -279,6 +282,59 @@ class GraphView(QWebEngineView):
             
             # 页面加载完成后的延迟加载布局
             self.loadFinished.connect(self._on_load_finished)
+            graph_manager.subscribe(self.on_graph_event)
+
+    # 单次提交的变更数超过该值时整体刷新，比逐条发送更快
+    FULL_REFRESH_THRESHOLD = 5000
+
+    def on_graph_event(self, event):
+        """按提交批次收集变更事件，在 BATCH_COMMITTED 时一次性发送到前端"""
+        if event.kind == graph_events.GRAPH_RESET:
+            self._pending_events.clear()
+            self.update_all_data()
+            return
+        if event.kind != graph_events.BATCH_COMMITTED:
+            self._pending_events.append(event)
+            return
+
+        events, self._pending_events = self._pending_events, []
+        if not self.is_initialized:
+            return  # 页面加载完成后 render 会发送完整数据
+        if len(events) > self.FULL_REFRESH_THRESHOLD:
+            self.update_all_data()
+            return
+        self.apply_graph_changes(events)
+
+    def apply_graph_changes(self, events):
+        """把一批变更事件转换为 vis.js 数据集操作，只发送变化的节点和边"""
+        changes = {
+            "removeEdges": [], "removeNodes": [], "renameNodes": [],
+            "addNodes": [], "updateNodes": [], "addEdges": [], "updateEdges": [],
+        }
+        for event in events:
+            kind = event.kind
+            if kind == graph_events.EDGE_REMOVED:
+                changes["removeEdges"].append(_edge_id(*event.key))
+            elif kind == graph_events.NODE_REMOVED:
+                changes["removeNodes"].append(event.key)
+            elif kind == graph_events.NODE_RENAMED:
+                changes["renameNodes"].append({"old": event.old_key, "node": _vis_node(event.key, event.data)})
+            elif kind in (graph_events.NODE_ADDED, graph_events.NODE_UPDATED):
+                key = "addNodes" if kind == graph_events.NODE_ADDED else "updateNodes"
+                changes[key].append(_vis_node(event.key, event.data))
+            elif kind in (graph_events.EDGE_ADDED, graph_events.EDGE_UPDATED):
+                source, target = event.key
+                key = "addEdges" if kind == graph_events.EDGE_ADDED else "updateEdges"
+                changes[key].append({"id": _edge_id(source, target), "from": source, "to": target,
+                                     "label": event.data.get("relation_type", "")})
+
+        script = f"""
+        if (typeof applyGraphChanges === 'function') {{
+            applyGraphChanges({json.dumps(changes)});
+        }}
+        """
+        self.page().runJavaScript(script)
+        self.synced_version = self.graph_manager.version
 
     def _on_load_finished(self, success):
         """页面加载完成后的回调"""
@@ -290,8 +346,9 @@ class GraphView(QWebEngineView):
     def render(self):
         """渲染图谱数据 - 只在初始化时使用"""
         if self.is_initialized:
-            # 如果已经初始化，使用增量更新
-            self.update_all_data()
+            # 已由变更事件同步到当前版本时无需重新发送
+            if self.synced_version != self.graph_manager.version:
+                self.update_all_data()
             return
             
         data = self.graph_manager.get_graph_data()
@@ -319,7 +376,8 @@ class GraphView(QWebEngineView):
                 }
             })
         edges = [
-            {"from": e["source"], "to": e["target"], "label": e["relation_type"]}
+            {"id": _edge_id(e["source"], e["target"]), "from": e["source"], "to": e["target"],
+             "label": e["relation_type"]}
             for e in data["edges"]
         ]
 
@@ -328,6 +386,7 @@ class GraphView(QWebEngineView):
             edges_js=json.dumps(edges),
         )
         self.setHtml(html, QUrl("about:blank"))
+        self.synced_version = self.graph_manager.version
 
     def update_all_data(self):
         """更新所有数据但保持布局"""
@@ -358,7 +417,8 @@ class GraphView(QWebEngineView):
                 }
             })
         edges = [
-            {"from": e["source"], "to": e["target"], "label": e["relation_type"]}
+            {"id": _edge_id(e["source"], e["target"]), "from": e["source"], "to": e["target"],
+             "label": e["relation_type"]}
             for e in data["edges"]
         ]
 
@@ -369,6 +429,7 @@ class GraphView(QWebEngineView):
         }}
         """
         self.page().runJavaScript(script)
+        self.synced_version = self.graph_manager.version
 
     def add_node_incrementally(self, node_data):
         """增量添加单个节点"""
@@ -412,6 +473,7 @@ class GraphView(QWebEngineView):
             return
             
         vis_edge = {
+            "id": _edge_id(edge_data["from"], edge_data["to"]),
             "from": edge_data["from"],
             "to": edge_data["to"],
             "label": edge_data["label"]
@@ -1,12 +1,9 @@
 import sys
 import os
-import csv
 import json
 from pathlib import Path
 
 import pandas as pd
-import chardet
-import networkx as nx
 
 # WebEngine 环境修复 - 必须在PyQt导入前
 os.environ['QTWEBENGINE_DISABLE_SANDBOX'] = '1'
@@ -17,15 +14,25 @@ from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
     QFileDialog, QMessageBox, QListWidget, QMenu, QStatusBar,
     QSplitter, QDialog, QFormLayout, QLineEdit, QTextEdit,
-    QLabel, QTextBrowser, QStackedWidget, QApplication  # 添加了QLabel, QTextBrowser, QStackedWidget
+    QLabel, QTextBrowser, QStackedWidget, QApplication, QProgressDialog, QInputDialog  # 添加了QLabel, QTextBrowser, QStackedWidget
 )
-from PyQt5.QtCore import QTimer, Qt, QUrl
+from PyQt5.QtCore import QTimer, Qt, QUrl, QEventLoop
 
 # 其余导入保持不变
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
-from core.graph_data_manager import GraphDataManager
+from core.graph_data_manager import GraphDataManager, MERGE_ATTRIBUTES, MERGE_KEEP, MERGE_OVERWRITE
+from core.sqlite_graph_manager import SQLiteGraphDataManager
+from core.graphml_export import write_graphml
+from core.jsonld_export import save_jsonld
+from core import graph_events
+from core.arrow_io import split_table_paths, write_tables
+from core.autosave import AutosaveService
+from core.csv_export import split_csv_paths, write_csv, write_csv_zip
 from core.data_importer import DataImporter
+from core.import_coordinator import ImportFormatError
+from core.import_fingerprints import FingerprintIndex
+from core.import_job import ImportJobRunner
 from core.plugin_manager import PluginManager, PluginLoadError
 from dialogs.node_dialog import NodeEditDialog
 from dialogs.plugin_dialog import PluginManageDialog
@@ -33,8 +40,7 @@ from dialogs.node_detail_widget import NodeDetailWidget
 from dialogs.relationship_dialog import RelationEditDialog
 from ui.graph_view import GraphView
 from LanguageManager import LanguageManager
-import rdflib
-from rdflib.namespace import RDF, RDFS, OWL
+from core.rdf_export import OWL_CLASS, RDFS_CLASS, write_rdf
 
 
 def clean_data(data):
@@ -55,11 +61,33 @@ class MainWindow(QMainWindow):
         # 初始化语言管理器
         self.lang_manager = LanguageManager()
 
-        # 初始化核心组件
-        self.graph_manager = GraphDataManager()
+        # 初始化核心组件（图数据在窗口显示后再加载，以便在状态栏显示进度）
+        # 默认以 JSON 文件加变更日志保存图数据；环境变量 TCMKG_GRAPH_BACKEND=sqlite 时改用 SQLite 数据库
+        if os.environ.get("TCMKG_GRAPH_BACKEND") == "sqlite":
+            self.graph_manager = SQLiteGraphDataManager(autoload=False)
+        else:
+            self.graph_manager = GraphDataManager(autoload=False)
+        self._graph_loading = False
+        self.autosave = AutosaveService(self.graph_manager, parent=self)
         self.data_importer = DataImporter(self.graph_manager)
+        self.import_runner = ImportJobRunner(self.graph_manager, parent=self)
+        self.import_runner.progress.connect(self.on_import_progress)
+        self.import_runner.finished.connect(self.on_import_finished)
+        self.import_runner.cancelled.connect(self.on_import_cancelled)
+        self.import_runner.failed.connect(self.on_import_failed)
+        self._import_progress = None
+        self._import_filepaths = []
+        self._close_after_import = False  # 关闭窗口时取消了导入，任务结束后再关闭
+        # 增量重新导入的行指纹索引，保存在图数据文件旁
+        self.fingerprint_index = FingerprintIndex(self.graph_manager.json_path + ".imports.json")
         self.plugin_manager = PluginManager(self.graph_manager)
 
+        # 统计信息和数据模式在一批变更提交后合并刷新一次
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.timeout.connect(self.refresh_after_changes)
+        self.graph_manager.subscribe(self.on_graph_event)
+
         project_root = Path(__file__).parent.parent
         self.plugin_manager.plugin_dir = project_root / "plugins"
         self.plugin_manager.scan_plugin_dir()
@@ -70,6 +98,38 @@ class MainWindow(QMainWindow):
 
         self.populate_plugins()
         self.update_window_title()
+        QTimer.singleShot(0, self.load_graph_data)
+
+    def load_graph_data(self):
+        """流式加载图数据，并在状态栏显示读取进度"""
+        self._graph_loading = True
+        try:
+            self.graph_manager.load_graph_from_json(progress_callback=self.show_load_progress)
+        finally:
+            self._graph_loading = False
+        self.status_bar.showMessage(self.lang_manager.get_text(
+            "graph_loaded",
+            nodes=self.graph_manager.graph.number_of_nodes(),
+            edges=self.graph_manager.graph.number_of_edges()), 3000)
+        self.safe_update()
+
+    def show_load_progress(self, bytes_read, total_bytes):
+        percent = int(bytes_read * 100 / total_bytes) if total_bytes else 100
+        self.status_bar.showMessage(self.lang_manager.get_text("graph_loading", percent=percent))
+        # 只处理绘制等非输入事件，加载过程中不响应用户操作
+        QApplication.processEvents(QEventLoop.ExcludeUserInputEvents)
+
+    def on_graph_event(self, event):
+        """图数据变更事件：图视图和导航器自行增量更新，这里只安排统计信息和数据模式的刷新"""
+        if event.kind in (graph_events.BATCH_COMMITTED, graph_events.GRAPH_RESET):
+            self._refresh_timer.start(200)
+
+    def refresh_after_changes(self):
+        if hasattr(self, 'data_stats_label'):
+            self.update_toolbar_stats()
+        # 数据模式是整页 HTML，只在可见时重新生成；切换到数据模式时会重新渲染
+        if getattr(self, 'current_mode', None) == "data":
+            self.render_data_mode()
 
     def update_window_title(self):
         """更新窗口标题"""
@@ -109,6 +169,8 @@ class MainWindow(QMainWindow):
         self.init_toolbar()
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
+        self.autosave.save_failed.connect(
+            lambda error: self.status_bar.showMessage(self.lang_manager.get_text("save_error", error=error), 5000))
 
     def init_toolbar(self):
         """增强版工具栏 - 包含显示模式控制和语言切换"""
@@ -147,6 +209,7 @@ class MainWindow(QMainWindow):
         # 文件菜单
         self.file_menu = QMenu()
         self.file_menu.addAction(self.lang_manager.get_text("import_data"), self.import_data)
+        self.file_menu.addAction(self.lang_manager.get_text("reimport_data"), self.reimport_data)
         self.file_menu.addAction(self.lang_manager.get_text("save_data"), self.save_data)
         self.file_menu.addAction(self.lang_manager.get_text("export_data"), self.export_data)
         self.file_menu.addAction(self.lang_manager.get_text("save_jsonld"), self.save_data_as_jsonld)
@@ -339,6 +402,7 @@ class MainWindow(QMainWindow):
         # 清空并重新添加菜单项以应用新语言
         self.file_menu.clear()
         self.file_menu.addAction(self.lang_manager.get_text("import_data"), self.import_data)
+        self.file_menu.addAction(self.lang_manager.get_text("reimport_data"), self.reimport_data)
         self.file_menu.addAction(self.lang_manager.get_text("save_data"), self.save_data)
         self.file_menu.addAction(self.lang_manager.get_text("export_data"), self.export_data)
         self.file_menu.addAction(self.lang_manager.get_text("save_jsonld"), self.save_data_as_jsonld)
@@ -415,13 +479,11 @@ class MainWindow(QMainWindow):
     def update_toolbar_stats(self):
         """更新工具栏统计信息"""
         try:
-            data = self.graph_manager.get_graph_data()
-            nodes_count = len(data.get('nodes', []))
-            edges_count = len(data.get('edges', []))
+            nodes_count = self.graph_manager.graph.number_of_nodes()
+            edges_count = self.graph_manager.graph.number_of_edges()
 
-            # 计算节点类型数量
-            types = set(node.get('type', '未知') for node in data.get('nodes', []))
-            types_count = len(types)
+            # 节点类型数量直接取自类型索引
+            types_count = len(self.graph_manager.get_type_statistics())
 
             stats_text = self.lang_manager.get_text("statistics",
                                                     nodes=nodes_count,
@@ -429,9 +491,6 @@ class MainWindow(QMainWindow):
                                                     types=types_count)
             self.data_stats_label.setText(stats_text)
 
-            # 定时更新（每30秒）
-            QTimer.singleShot(30000, self.update_toolbar_stats)
-
         except Exception as e:
             print(f"❌ 工具栏统计更新失败: {e}")
             self.data_stats_label.setText(self.lang_manager.get_text("stats_unavailable"))
@@ -468,6 +527,11 @@ class MainWindow(QMainWindow):
     def safe_update(self):
         """安全更新 - 增强版"""
         try:
+            # 通过 GraphDataManager 的修改已由变更事件增量同步到各视图；
+            # 只有图被直接修改过（前端数据落后于图版本）时才需要整体刷新
+            if hasattr(self, 'graph_view') and self.graph_view.synced_version == self.graph_manager.version:
+                return
+
             # 更新所有显示模式
             if hasattr(self, 'update_all_modes'):
                 QTimer.singleShot(0, self.update_all_modes)
@@ -492,7 +556,9 @@ class MainWindow(QMainWindow):
         if dialog.exec_():  # 如果用户点击了"确定"
             edited_data = dialog.get_data()  # 获取用户编辑的数据
 
-            for node in edited_data:
+            # 先解析全部属性，提示框不在事务打开期间弹出
+            rows = []
+            for row_number, node in enumerate(edited_data, 1):
                 try:
                     # 使用 try-except 处理 JSON 格式错误
                     attributes = json.loads(node["attributes"]) if node["attributes"] else {}
@@ -500,15 +566,19 @@ class MainWindow(QMainWindow):
                     # 如果格式错误，使用默认值 {}，避免程序崩溃
                     attributes = {}
                     QMessageBox.critical(self, self.lang_manager.get_text("error"),
-                                         f"第{edited_data.index(node) + 1}行属性不是有效的JSON格式，已使用默认值")
+                                         f"第{row_number}行属性不是有效的JSON格式，已使用默认值")
+                rows.append((node["name"], node["type"], attributes))
 
-                try:
-                    # 逐个调用 edit_node，传递正确的参数
-                    self.graph_manager.edit_node(node["name"], node["type"], attributes)
-                except ValueError as e:
-                    # 如果节点不存在，捕获异常并显示错误
-                    QMessageBox.critical(self, self.lang_manager.get_text("error"), f"节点编辑失败: {str(e)}")
-                    return
+            try:
+                # 整批编辑作为一个事务：一次撤销步骤、一次保存；任一节点失败时异常离开事务，整批回滚
+                with self.graph_manager.transaction():
+                    for name, node_type, attributes in rows:
+                        if not self.graph_manager.edit_node(name, node_type, attributes):
+                            raise ValueError(f"节点 '{name}' 不存在")
+            except ValueError as e:
+                # 如果节点不存在，捕获异常并显示错误
+                QMessageBox.critical(self, self.lang_manager.get_text("error"), f"节点编辑失败: {str(e)}")
+                return
 
             self.safe_update()  # 强制刷新图谱界面
 
@@ -545,19 +615,19 @@ class MainWindow(QMainWindow):
                 QMessageBox.critical(self, self.lang_manager.get_text("error"), f"关系更新失败: {str(e)}")
 
     def save_data_as_jsonld(self):
-        """保存图数据为 JSON-LD 格式文件"""
+        """保存图数据为 JSON-LD 格式文件（.ndjsonld 时每行一个节点文档），从图流式写出"""
         options = QFileDialog.Options()
         filepath, _ = QFileDialog.getSaveFileName(
             self,
             "保存 JSON-LD 文件",
             "",
-            "JSON-LD Files (*.jsonld)",
+            "JSON-LD Files (*.jsonld);;NDJSON-LD Files (*.ndjsonld)",
             options=options,
         )
         if not filepath:
             return
         try:
-            self.graph_manager.save_graph_to_jsonld(filepath)
+            save_jsonld(self.graph_manager.graph, filepath)
             self.status_bar.showMessage(self.lang_manager.get_text("save_success"), 3000)
         except Exception as e:
             QMessageBox.critical(self,
@@ -1046,19 +1116,10 @@ class MainWindow(QMainWindow):
             nodes = data.get('nodes', [])
             edges = data.get('edges', [])
 
-            # 统计信息
-            type_stats = {}
-            for node in nodes:
-                node_type = node.get('type',
-                                     '未分类' if self.lang_manager.current_language == 'zh' else 'Uncategorized')
-                type_stats[node_type] = type_stats.get(node_type, 0) + 1
-
-            # 关系类型统计
-            relation_stats = {}
-            for edge in edges:
-                relation_type = edge.get('relation_type',
-                                         '未知关系' if self.lang_manager.current_language == 'zh' else 'Unknown Relation')
-                relation_stats[relation_type] = relation_stats.get(relation_type, 0) + 1
+            # 统计信息（直接读取类型索引，无需遍历节点和关系）
+            type_stats = {node_type: stats["count"]
+                          for node_type, stats in self.graph_manager.get_type_statistics().items()}
+            relation_stats = self.graph_manager.get_relation_type_counts()
 
             # 更新统计标签
             stats_text = self.lang_manager.get_text("statistics",
@@ -1132,7 +1193,7 @@ class MainWindow(QMainWindow):
         html += f'<div class="section"><h3>{self.lang_manager.get_text("node_type_distribution")}</h3>'
         for node_type, count in sorted(type_stats.items(), key=lambda x: x[1], reverse=True):
             percentage = (count / len(nodes)) * 100 if nodes else 0
-            type_nodes = [n['name'] for n in nodes if n.get('type') == node_type]
+            type_nodes = self.graph_manager.get_node_names_by_type(node_type)
 
             html += f"""
             <div class="type-item">
@@ -1239,15 +1300,9 @@ class MainWindow(QMainWindow):
                 nodes = data.get('nodes', [])
                 edges = data.get('edges', [])
 
-                type_stats = {}
-                for node in nodes:
-                    node_type = node.get('type', '未分类')
-                    type_stats[node_type] = type_stats.get(node_type, 0) + 1
-
-                relation_stats = {}
-                for edge in edges:
-                    relation_type = edge.get('relation_type', '未知关系')
-                    relation_stats[relation_type] = relation_stats.get(relation_type, 0) + 1
+                type_stats = {node_type: stats["count"]
+                              for node_type, stats in self.graph_manager.get_type_statistics().items()}
+                relation_stats = self.graph_manager.get_relation_type_counts()
 
                 # 生成完整HTML
                 html = self.generate_detailed_html(nodes, edges, type_stats, relation_stats)
@@ -1331,74 +1386,125 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, self.lang_manager.get_text("error"), str(e))
 
     def import_data(self):
-        """导入 CSV 或 JSON 数据文件"""
+        """导入 CSV、JSON、Parquet 或 Arrow 数据文件"""
         options = QFileDialog.Options()
         filepaths, _ = QFileDialog.getOpenFileNames(
             self,
             "选择文件",
             "",
-            "CSV Files (*.csv);;JSON Files (*.json)",
+            "CSV Files (*.csv);;JSON Files (*.json);;Parquet Files (*.parquet);;Arrow Files (*.arrow *.feather)",
             options=options,
         )
         if not filepaths:
             return
 
-        for filepath in filepaths:
-            try:
-                if filepath.endswith(".csv"):
-                    encoding = self.detect_encoding(filepath) or "utf-8"
-                    data = pd.read_csv(filepath, encoding=encoding)
-                    if {"name", "type"}.issubset(data.columns):
-                        self.data_importer.import_nodes_from_csv(filepath)
-                    elif {"source", "target", "relation_type"}.issubset(data.columns):
-                        self.data_importer.import_relationships_from_csv(filepath)
-                    else:
-                        QMessageBox.warning(self,
-                                            self.lang_manager.get_text("warning"),
-                                            self.lang_manager.get_text("csv_column_error"))
-                        continue
-                elif filepath.endswith(".json"):
-                    with open(filepath, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                        if "nodes" in data and "edges" in data:
-                            for node in data["nodes"]:
-                                self.graph_manager.add_node(
-                                    node["name"],
-                                    node["type"],
-                                    node.get("attributes", {})
-                                )
-                            for edge in data["edges"]:
-                                self.graph_manager.add_relationship(
-                                    edge["source"],
-                                    edge["target"],
-                                    edge["relation_type"]
-                                )
-                        else:
-                            QMessageBox.warning(self,
-                                                self.lang_manager.get_text("warning"),
-                                                self.lang_manager.get_text("json_format_error"))
-                            continue
-                else:
-                    QMessageBox.warning(self,
-                                        self.lang_manager.get_text("warning"),
-                                        self.lang_manager.get_text("unsupported_format"))
-                    continue
+        policy = MERGE_OVERWRITE
+        if any(filepath.lower().endswith(".json") for filepath in filepaths) and \
+                self.graph_manager.graph.number_of_nodes():
+            # JSON 图中的节点可能与现有节点重名，由用户选择合并策略
+            policies = {
+                self.lang_manager.get_text("merge_overwrite"): MERGE_OVERWRITE,
+                self.lang_manager.get_text("merge_keep"): MERGE_KEEP,
+                self.lang_manager.get_text("merge_attributes"): MERGE_ATTRIBUTES,
+            }
+            choice, ok = QInputDialog.getItem(self, self.lang_manager.get_text("merge_policy_title"),
+                                              self.lang_manager.get_text("merge_policy_prompt"),
+                                              list(policies), 0, False)
+            if not ok:
+                return
+            policy = policies[choice]
+        self._start_import(filepaths, policy=policy)
+
+    def reimport_data(self):
+        """增量重新导入 CSV：只应用与上次导入相比新增、修改和删除的行"""
+        filepaths, _ = QFileDialog.getOpenFileNames(self, "选择文件", "", "CSV Files (*.csv)")
+        if not filepaths:
+            return
+        self._start_import(filepaths, self.fingerprint_index)
 
-                self.safe_update()
-                QMessageBox.information(self,
-                                        self.lang_manager.get_text("success"),
-                                        self.lang_manager.get_text("import_success",
-                                                                   filename=os.path.basename(filepath)))
-            except Exception as e:
+    def _start_import(self, filepaths, fingerprint_index=None, policy=MERGE_OVERWRITE):
+        if not self.import_runner.start(filepaths, fingerprint_index, policy):
+            return
+
+        # 解析在工作线程中进行，合并在 UI 线程上分批进行；模态进度对话框在任务期间阻止对图的操作，界面仍保持响应
+        self._import_filepaths = filepaths
+        self._import_progress = QProgressDialog(self.lang_manager.get_text("import_parsing", done=0,
+                                                                           total=len(filepaths)),
+                                                self.lang_manager.get_text("cancel"), 0, len(filepaths), self)
+        self._import_progress.setWindowModality(Qt.WindowModal)
+        self._import_progress.setMinimumDuration(0)
+        self._import_progress.setAutoClose(False)
+        self._import_progress.setAutoReset(False)
+        self._import_progress.canceled.connect(self.import_runner.cancel)
+        self._import_progress.show()
+
+    def on_import_progress(self, stage, done, total):
+        if stage == "parsing":
+            text = self.lang_manager.get_text("import_parsing", done=done, total=total)
+        else:
+            text = self.lang_manager.get_text("import_merging", percent=int(done * 100 / total) if total else 100)
+        self._import_progress.setLabelText(text)
+        self._import_progress.setMaximum(max(total, 1))
+        self._import_progress.setValue(done)
+
+    def _close_import_progress(self):
+        if self._import_progress is not None:
+            self._import_progress.canceled.disconnect(self.import_runner.cancel)
+            self._import_progress.close()
+            self._import_progress = None
+
+    def _finish_import(self):
+        """
+        导入任务结束（完成、取消或失败）时关闭进度框；若关闭窗口正在等待该任务，则继续关闭窗口
+        :return: 是否将关闭窗口（此时不再弹出结果提示）
+        """
+        self._close_import_progress()
+        if not self._close_after_import:
+            return False
+        self._close_after_import = False
+        QTimer.singleShot(0, self.close)
+        return True
+
+    def on_import_finished(self, counts, errors):
+        if self._finish_import():
+            return
+        for filepath, error in errors.items():
+            if isinstance(error, ImportFormatError):
+                QMessageBox.warning(self,
+                                    self.lang_manager.get_text("warning"),
+                                    self.lang_manager.get_text(error.key))
+            else:
                 QMessageBox.critical(self,
                                      self.lang_manager.get_text("error"),
                                      self.lang_manager.get_text("import_error", filename=os.path.basename(filepath),
-                                                                error=str(e)))
+                                                                error=str(error)))
+
+        if counts:
+            self.safe_update()
+            QMessageBox.information(self,
+                                    self.lang_manager.get_text("success"),
+                                    self.lang_manager.get_text("import_success",
+                                                               filename=", ".join(map(os.path.basename, counts))))
+
+    def on_import_cancelled(self):
+        if self._finish_import():
+            return
+        self.status_bar.showMessage(self.lang_manager.get_text("import_cancelled"), 3000)
+
+    def on_import_failed(self, error):
+        if self._finish_import():
+            return
+        QMessageBox.critical(self,
+                             self.lang_manager.get_text("error"),
+                             self.lang_manager.get_text("import_error",
+                                                        filename=", ".join(map(os.path.basename,
+                                                                               self._import_filepaths)),
+                                                        error=error))
 
     def save_data(self):
-        """保存当前图数据到 JSON 文件"""
+        """保存当前图数据到 JSON 文件（挂接了自动保存时交给后台写入）"""
         try:
-            self.graph_manager.save_graph_to_json()
+            self.graph_manager.request_save(changed=False)
             self.status_bar.showMessage(self.lang_manager.get_text("save_success"), 3000)
         except Exception as e:
             QMessageBox.critical(self,
@@ -1406,28 +1512,32 @@ class MainWindow(QMainWindow):
                                  self.lang_manager.get_text("save_error", error=str(e)))
 
     def export_data(self):
-        """导出知识图谱数据（支持JSON、CSV、GraphML、RDF、OWL格式）"""
+        """导出知识图谱数据（支持JSON、CSV、Parquet、Arrow、GraphML、RDF、OWL、N-Triples、Turtle格式）"""
         options = QFileDialog.Options()
         file, _ = QFileDialog.getSaveFileName(self, "保存文件", "",
-                                              "JSON Files (*.json);;CSV Files (*.csv);;GraphML Files (*.graphml);;RDF Files (*.rdf);;OWL Files (*.owl)",
+                                              "JSON Files (*.json);;CSV Files (*.csv);;CSV Archive (*.zip);;"
+                                              "Parquet Files (*.parquet);;Arrow Files (*.arrow *.feather);;"
+                                              "GraphML Files (*.graphml *.graphml.gz);;"
+                                              "RDF Files (*.rdf *.rdf.gz);;OWL Files (*.owl *.owl.gz);;"
+                                              "N-Triples Files (*.nt *.nt.gz);;Turtle Files (*.ttl *.ttl.gz)",
                                               options=options)
 
         if file:
-            data = self.graph_manager.get_graph_data()  # 获取当前的图数据
-
             # 根据文件后缀判断导出的文件格式
             try:
                 if file.endswith(".json"):
-                    with open(file, 'w', encoding='utf-8') as f:
-                        json.dump(data, f, ensure_ascii=False, indent=4)
-                elif file.endswith(".csv"):
-                    self.export_to_csv(file, data)
-                elif file.endswith(".graphml"):
-                    self.export_to_graphml(file, data)
-                elif file.endswith(".rdf"):
-                    self.export_to_rdf(file, data)
-                elif file.endswith(".owl"):
-                    self.export_to_owl(file, data)
+                    # 直接从图流式写出，不构造完整的数据字典
+                    self.graph_manager.export_json(file)
+                elif file.endswith((".csv", ".zip")):
+                    self.export_to_csv(file)
+                elif file.endswith((".parquet", ".arrow", ".feather")):
+                    self.export_to_tables(file)
+                elif file.endswith((".graphml", ".graphml.gz")):
+                    self.export_to_graphml(file)
+                elif file.endswith((".rdf", ".rdf.gz", ".nt", ".nt.gz", ".ttl", ".ttl.gz")):
+                    self.export_to_rdf(file)
+                elif file.endswith((".owl", ".owl.gz")):
+                    self.export_to_owl(file)
                 else:
                     QMessageBox.warning(self,
                                         self.lang_manager.get_text("error"),
@@ -1437,26 +1547,16 @@ class MainWindow(QMainWindow):
                                      self.lang_manager.get_text("error"),
                                      self.lang_manager.get_text("export_error", error=str(e)))
 
-    def export_to_csv(self, file, data):
-        """导出为 CSV 格式（包括节点和关系）"""
-        nodes_data = data["nodes"]
-        edges_data = data["edges"]
-
+    def export_to_csv(self, file):
+        """
+        导出为 CSV 格式：选择 .csv 时写出 <名称>_nodes.csv 和 <名称>_edges.csv 两个文件，
+        选择 .zip 时把两张表打包；属性按键展开为列，导出的文件可以直接再导入
+        """
         try:
-            with open(file, 'w', encoding='utf-8', newline='') as f:
-                # 写入节点数据
-                node_writer = csv.DictWriter(f, fieldnames=nodes_data[0].keys())
-                node_writer.writeheader()
-                node_writer.writerows(nodes_data)
-
-                # 在节点数据后加一个分隔行（可选）
-                f.write("\n")
-
-                # 写入关系数据
-                edge_writer = csv.DictWriter(f, fieldnames=edges_data[0].keys())
-                edge_writer.writeheader()
-                edge_writer.writerows(edges_data)
-
+            if file.endswith(".zip"):
+                write_csv_zip(self.graph_manager.graph, file)
+            else:
+                write_csv(self.graph_manager.graph, *split_csv_paths(file))
             QMessageBox.information(self,
                                     self.lang_manager.get_text("success"),
                                     self.lang_manager.get_text("export_csv_success"))
@@ -1465,43 +1565,37 @@ class MainWindow(QMainWindow):
                                  self.lang_manager.get_text("error"),
                                  self.lang_manager.get_text("export_error", error=str(e)))
 
-    def export_to_graphml(self, file, data):
+    def export_to_tables(self, file):
+        """
+        导出为 Parquet 或 Arrow 格式：写出 <名称>_nodes 和 <名称>_edges 两个表，
+        可直接用 pandas、DuckDB 读取，也可以再导入
+        """
         try:
-            # GraphDataManager 内部保存了 actual networkx 图对象为 .graph
-            nx.write_graphml(self.graph_manager.graph, file)
+            write_tables(self.graph_manager.graph, *split_table_paths(file))
             QMessageBox.information(self,
                                     self.lang_manager.get_text("success"),
-                                    self.lang_manager.get_text("export_graphml_success"))
+                                    self.lang_manager.get_text("export_success"))
         except Exception as e:
             QMessageBox.critical(self,
                                  self.lang_manager.get_text("error"),
                                  self.lang_manager.get_text("export_error", error=str(e)))
 
-    def export_to_rdf(self, file, data):
-        """导出为 RDF 格式"""
-        g = rdflib.Graph()
-
-        # 添加命名空间
-        namespace = rdflib.Namespace("http://example.org/graph#")
-        g.bind("ex", namespace)
-
-        # 将节点和关系转换为 RDF 数据
-        for node in data["nodes"]:
-            node_uri = namespace[node["name"]]
-            g.add((node_uri, RDF.type, RDFS.Class))
-            g.add((node_uri, RDFS.label, rdflib.Literal(node["name"])))
-            if "type" in node:
-                g.add((node_uri, namespace["type"], rdflib.Literal(node["type"])))
-
-        for edge in data["edges"]:
-            source_uri = namespace[edge["source"]]
-            target_uri = namespace[edge["target"]]
-            relation_uri = namespace[edge["relation_type"]]
-
-            g.add((source_uri, relation_uri, target_uri))
+    def export_to_graphml(self, file):
+        """导出为 GraphML 格式（.gz 结尾时压缩），从图流式写出，嵌套的属性值写成 JSON"""
+        try:
+            write_graphml(self.graph_manager.graph, file)
+            QMessageBox.information(self,
+                                    self.lang_manager.get_text("success"),
+                                    self.lang_manager.get_text("export_graphml_success"))
+        except Exception as e:
+            QMessageBox.critical(self,
+                                 self.lang_manager.get_text("error"),
+                                 self.lang_manager.get_text("export_error", error=str(e)))
 
+    def export_to_rdf(self, file):
+        """导出为 RDF 格式（按扩展名选择 RDF/XML、N-Triples 或 Turtle，.gz 结尾时压缩），从图流式写出"""
         try:
-            g.serialize(destination=file, format="rdfxml")  # 导出为 RDF/XML 格式
+            write_rdf(self.graph_manager.graph, file, node_class=RDFS_CLASS)
             QMessageBox.information(self,
                                     self.lang_manager.get_text("success"),
                                     self.lang_manager.get_text("export_rdf_success"))
@@ -1510,31 +1604,10 @@ class MainWindow(QMainWindow):
                                  self.lang_manager.get_text("error"),
                                  self.lang_manager.get_text("export_error", error=str(e)))
 
-    def export_to_owl(self, file, data):
-        """导出为 OWL 格式"""
-        g = rdflib.Graph()
-
-        # 添加命名空间
-        namespace = rdflib.Namespace("http://example.org/graph#")
-        g.bind("ex", namespace)
-
-        # 创建 OWL 本体（添加类和实例）
-        for node in data["nodes"]:
-            node_uri = namespace[node["name"]]
-            g.add((node_uri, RDF.type, OWL.Class))
-            g.add((node_uri, RDFS.label, rdflib.Literal(node["name"])))
-            if "type" in node:
-                g.add((node_uri, namespace["type"], rdflib.Literal(node["type"])))
-
-        for edge in data["edges"]:
-            source_uri = namespace[edge["source"]]
-            target_uri = namespace[edge["target"]]
-            relation_uri = namespace[edge["relation_type"]]
-
-            g.add((source_uri, relation_uri, target_uri))
-
+    def export_to_owl(self, file):
+        """导出为 OWL 格式：节点声明为 owl:Class，其余三元组与 RDF 导出相同"""
         try:
-            g.serialize(destination=file, format="xml")  # 导出为 OWL 格式
+            write_rdf(self.graph_manager.graph, file, node_class=OWL_CLASS)
             QMessageBox.information(self,
                                     self.lang_manager.get_text("success"),
                                     self.lang_manager.get_text("export_owl_success"))
@@ -1548,13 +1621,6 @@ class MainWindow(QMainWindow):
         self.main_splitter.setSizes([1000, 400])
         self.right_splitter.setSizes([400, 200])
 
-    def detect_encoding(self, filepath):
-        """检测文件编码"""
-        with open(filepath, "rb") as f:
-            raw = f.read(10000)
-        result = chardet.detect(raw)
-        return result.get("encoding", None)
-
     def run_plugin(self, item):
         """当在插件列表中双击插件时运行该插件"""
         plugin_name = item.text()
@@ -1565,8 +1631,20 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         """退出时保存图数据"""
+        if self._graph_loading:
+            # 图尚未加载完整，此时写检查点会覆盖原数据
+            event.ignore()
+            return
+        if self.import_runner.is_running():
+            # 导入任务仍在写图，先取消（回滚），任务发出结束信号后由 _finish_import 再次关闭窗口
+            self._close_after_import = True
+            self.import_runner.cancel()
+            self.status_bar.showMessage(self.lang_manager.get_text("import_cancelling_for_close"))
+            event.ignore()
+            return
         try:
-            self.graph_manager.save_graph_to_json()
+            # 等待后台保存完成并写入最终检查点
+            self.autosave.flush(force=True)
         except Exception as e:
             QMessageBox.critical(self,
                                  self.lang_manager.get_text("error"),